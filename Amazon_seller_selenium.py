@@ -1,29 +1,128 @@
-import os
 import time
+_MODULE_LOAD_START = time.perf_counter()
+
+import os
+import re
+import argparse
 import pickle
 import json
-import tkinter as tk
-from tkinter import messagebox, filedialog, ttk
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
 from datetime import datetime, timedelta
+from collections import OrderedDict
 import zipfile
-import cairosvg
-from PIL import Image
 import base64
-from lxml import etree
+import copy
+import io
+import hashlib
+import sqlite3
 import shutil
 import sys
 import threading
+import atexit
+import subprocess
+
+# === Verzögert geladene Module ===
+# Selenium, webdriver_manager, cairosvg (cairocffi + native cairo), PIL und lxml
+# werden erst bei Bedarf bzw. im Hintergrund nach dem Öffnen der GUI geladen,
+# tkinter erst von der GUI bzw. dem ersten echten Dialog (nicht von CLI-Befehlen).
+tk = messagebox = None
+webdriver = Options = Service = ChromiumRemoteConnection = ChromeDriverManager = None
+WebDriverWait = EC = By = None
+cairosvg = Image = etree = None
+_import_lock = threading.Lock()
+IMPORT_TIMINGS = {}
+
+def load_tk():
+    """Lädt tkinter beim ersten Gebrauch"""
+    global tk, messagebox
+    with _import_lock:
+        if tk is not None:
+            return
+        start = time.perf_counter()
+        import tkinter as _tk
+        from tkinter import messagebox as _messagebox
+        IMPORT_TIMINGS["tkinter"] = time.perf_counter() - start
+        messagebox = _messagebox
+        tk = _tk
+
+def load_selenium():
+    """Lädt Selenium und webdriver_manager beim ersten Gebrauch"""
+    global webdriver, Options, Service, ChromiumRemoteConnection, ChromeDriverManager, WebDriverWait, EC, By
+    with _import_lock:
+        if webdriver is not None:
+            return
+        start = time.perf_counter()
+        from selenium import webdriver as _webdriver
+        from selenium.webdriver.chrome.options import Options as _Options
+        from selenium.webdriver.chrome.service import Service as _Service
+        from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection as _ChromiumRemoteConnection
+        from selenium.webdriver.support.ui import WebDriverWait as _WebDriverWait
+        from selenium.webdriver.support import expected_conditions as _EC
+        from selenium.webdriver.common.by import By as _By
+        IMPORT_TIMINGS["selenium"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from webdriver_manager.chrome import ChromeDriverManager as _ChromeDriverManager
+        IMPORT_TIMINGS["webdriver_manager"] = time.perf_counter() - start
+
+        Options, Service, ChromiumRemoteConnection = _Options, _Service, _ChromiumRemoteConnection
+        WebDriverWait, EC, By, ChromeDriverManager = _WebDriverWait, _EC, _By, _ChromeDriverManager
+        webdriver = _webdriver
+
+def load_render_libs():
+    """Lädt cairosvg, PIL und lxml beim ersten Gebrauch"""
+    global cairosvg, Image, etree
+    with _import_lock:
+        if cairosvg is not None:
+            return
+        start = time.perf_counter()
+        from PIL import Image as _Image
+        IMPORT_TIMINGS["PIL"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from lxml import etree as _etree
+        IMPORT_TIMINGS["lxml"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        import cairosvg as _cairosvg
+        IMPORT_TIMINGS["cairosvg"] = time.perf_counter() - start
+
+        Image, etree = _Image, _etree
+        cairosvg = _cairosvg
+
+def warm_up_heavy_modules():
+    """Lädt Konfiguration und schwere Module im Hintergrund vor"""
+    start = time.perf_counter()
+    try:
+        load_config()
+        os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+        load_selenium()
+        load_render_libs()
+        print(f"Hintergrund-Vorladen abgeschlossen in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        print(f"Fehler beim Vorladen: {e}")
+
+# Ohne GUI (Server-/Kommandozeilenmodi) werden Meldungen nur protokolliert
+_headless = {"enabled": False}
+
+# Threads mit quiet=True (spekulatives Rendern) zeigen keine Meldungen an
+_dialog_state = threading.local()
 
-# Thread-sichere Messagebox Wrapper
-def safe_messagebox(func, *args, **kwargs):
-    import tkinter as tk
+# Optionale Regel, die Rückfragen ohne Bediener beantwortet (Batch-Modus)
+_confirmation = {"handler": None}
+
+def set_headless_mode(enabled=True):
+    """Schaltet Dialoge ab: Meldungen werden nur ausgegeben, Rückfragen verneint"""
+    _headless["enabled"] = enabled
+
+# Thread-sichere Messagebox Wrapper (kind = Name der messagebox-Funktion, z.B. "showerror")
+def safe_messagebox(kind, *args, **kwargs):
+    if _headless["enabled"] or getattr(_dialog_state, "quiet", False):
+        title = args[0] if args else kwargs.get("title", "")
+        message = args[1] if len(args) > 1 else kwargs.get("message", "")
+        print(f"[{kind}] {title}: {message}")
+        return
+    load_tk()
+    func = getattr(messagebox, kind)
     root = tk._default_root
     if root:
         root.after(0, lambda: func(*args, **kwargs))
@@ -48,10 +147,6 @@ USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTM
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DOWNLOAD_DIR = os.path.join(BASE_DIR, "amazon_order_downloads")
 
-# === Verzeichnis erstellen ===
-if not os.path.exists(DOWNLOAD_DIR):
-    os.makedirs(DOWNLOAD_DIR)
-
 # === NEUE FUNKTIONEN: Heizungstyp-Erkennung ===
 
 def create_default_config():
@@ -97,7 +192,114 @@ def create_default_config():
         "quality_settings": {
             "min_dpi": 150,
             "tiff_compression": "tiff_lzw",
-            "max_ratio_deviation": 0.05
+            "max_ratio_deviation": 0.05,
+            "preflight_action": "ask",
+            "target_dpi": 200
+        },
+        "preview": {
+            "enabled": True,
+            "max_size": 320
+        },
+        "selector_registry": {
+            "timeout": 5,
+            "probe_timeout": 1.0
+        },
+        "navigation": {
+            "mode": "direct",
+            "order_detail_url": "https://sellercentral.amazon.de/orders-v3/order/{order_number}",
+            "direct_timeout": 10,
+            # Kopfbereich, den jede Bestellseite hat (auch ohne Anpassung/Expander)
+            "order_header_selector": "[data-test-id='order-id-value']"
+        },
+        "session_probe": {
+            "url": "https://sellercentral.amazon.de/home",
+            "timeout": 5,
+            "ttl_seconds": 60,
+            "background_interval_seconds": 120
+        },
+        "keepalive": {
+            "enabled": True,
+            "interval_minutes": 20
+        },
+        "result_cache": {
+            "enabled": True,
+            "max_size_mb": 2048
+        },
+        "template_cache": {
+            "max_entries": 32
+        },
+        "auto_confirm": {
+            "enabled": False,
+            "max_deviation_fraction": 0.5,
+            "max_positions": 2
+        },
+        "hot_folder": {
+            "inbox": "hot_folder",
+            "workers": 2,
+            "settle_seconds": 2.0,
+            "failed_subdir": "fehler"
+        },
+        "delivery": {
+            "enabled": False,
+            "destinations": [],
+            "workers": 2,
+            "retries": 3,
+            "retry_delay": 5.0,
+            "chunk_mb": 8
+        },
+        "imposition": {
+            "enabled": False,
+            "panel_types": ["130W Standard", "300W Standard"],
+            "ratio_tolerance": 0.03,
+            "sheet_width_mm": 1600,
+            "max_sheet_length_mm": 3000,
+            "max_sheet_mb": 400,
+            "margin_mm": 10,
+            "spacing_mm": 10,
+            "bleed_mm": 3,
+            "cut_mark_mm": 4,
+            "dpi": 150,
+            "window_minutes": 30,
+            "max_age_hours": 24
+        },
+        "render_service": {
+            "url": "",
+            "timeout": 600,
+            "host": "127.0.0.1",
+            "port": 8766,
+            "workers": 0,
+            "max_queue": 20,
+            "result_ttl_minutes": 60,
+            "shared_output_dir": "",
+            "token": "",
+            "max_upload_mb": 200
+        },
+        "broker": {
+            "url": "",
+            "lease_kind": "cookies",
+            "host": "127.0.0.1",
+            "port": 8765,
+            "token": "",
+            "lease_seconds": 900,
+            "webdriver_url": "",
+            "remote_download_dir": "",
+            # Derselbe Ordner (Freigabe) aus Sicht dieser Station, leer = gleicher Pfad
+            "local_download_dir": "",
+            "max_webdriver_leases": 2
+        },
+        "browser": {
+            "profile_mode": "cookies",
+            "profile_dir": "chrome_profile",
+            "max_profile_clones": 4,
+            "performance_profile": "standard",
+            "headless": False,
+            "blocked_url_patterns": [
+                "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+                "*.woff", "*.woff2", "*.ttf", "*.otf",
+                "*.mp4", "*.webm", "*.mp3",
+                "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                "*amazon-adsystem.com*", "*fls-eu.amazon.*", "*unagi.amazon.*"
+            ]
         }
     }
     return config
@@ -112,7 +314,7 @@ def load_config():
                 return json.load(f)
         except Exception as e:
             print(f"Fehler beim Laden der Config: {e}")
-            safe_messagebox(messagebox.showwarning, "Config-Fehler", 
+            safe_messagebox("showwarning", "Config-Fehler", 
                 "Fehler beim Laden der Konfiguration. Verwende Standard-Einstellungen.")
     
     # Erstelle Standard-Config
@@ -130,8 +332,66 @@ def save_config(config):
     except Exception as e:
         print(f"Fehler beim Speichern der Config: {e}")
 
-def ask_yes_no_safe(title, message):
+def get_config_section(section):
+    """
+    Liefert einen Konfigurationsabschnitt, ergänzt um fehlende Standardwerte.
+    Ältere heating_config.json Dateien kennen neue Abschnitte noch nicht.
+    """
+    defaults = create_default_config().get(section, {})
+    values = dict(defaults)
+    values.update(load_config().get(section, {}) or {})
+    return values
+
+def atomic_write_json(path, data):
+    """Schreibt JSON atomar (temporäre Datei + os.replace)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def atomic_write_pickle(path, data):
+    """Schreibt ein Pickle atomar (temporäre Datei + os.replace)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(data, f)
+    os.replace(tmp_path, path)
+
+# === Performance-Messungen ===
+PERFORMANCE_LOG = os.path.join(BASE_DIR, "performance_log.jsonl")
+_performance_lock = threading.Lock()
+
+def record_timing(metric, seconds, **details):
+    """Hängt eine Zeitmessung an performance_log.jsonl an (eine JSON-Zeile pro Messung)"""
+    entry = {"timestamp": datetime.now().isoformat(), "metric": metric, "seconds": round(seconds, 4)}
+    entry.update(details)
+    print(f"⏱ {metric}: {seconds:.3f}s {details if details else ''}")
+    try:
+        with _performance_lock:
+            with open(PERFORMANCE_LOG, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print(f"Fehler beim Schreiben der Performance-Messung: {e}")
+
+def set_confirmation_handler(handler):
+    """
+    Setzt eine Regel für Rückfragen: handler(title, message, context) liefert
+    True/False oder None (= Bediener fragen). None entfernt die Regel.
+    """
+    _confirmation["handler"] = handler
+
+def ask_yes_no_safe(title, message, context=None):
     """Thread-sicheres askyesno mit Rückgabe"""
+    handler = _confirmation["handler"]
+    if handler is not None:
+        decision = handler(title, message, context or {})
+        if decision is not None:
+            return decision
+
+    if _headless["enabled"]:
+        print(f"[askyesno] {title}: ohne GUI nicht bestätigt")
+        return False
+    load_tk()
+
     result = {"value": False}
     done = tk.BooleanVar()  # Synchronisations-Flag
 
@@ -204,7 +464,7 @@ def detect_heating_type(dimensions):
         print(f"Fehler bei Heizungstyp-Erkennung: {e}")
         return "Fehler", None
 
-def validate_heating_match(heating_type, specs, dimensions, show_dialog=True):
+def validate_heating_match(heating_type, specs, dimensions, show_dialog=True, memo_mismatch=None):
     """
     Validiert die Heizungstyp-Erkennung und zeigt Bestätigung
     
@@ -213,13 +473,14 @@ def validate_heating_match(heating_type, specs, dimensions, show_dialog=True):
         specs (dict): Spezifikationen des Heizungstyps
         dimensions (dict): Bild-Dimensionen
         show_dialog (bool): Ob Bestätigungsdialog gezeigt werden soll
+        memo_mismatch (str): Abweichung vom Produkt-Memo (wird in der Rückfrage angezeigt)
     
     Returns:
         bool: True wenn Benutzer bestätigt oder kein Dialog
     """
     if heating_type == "Unbekannt":
         if show_dialog:
-            safe_messagebox(messagebox.showwarning, 
+            safe_messagebox("showwarning", 
                 "Heizungstyp unbekannt",
                 f"Bildverhältnis: {dimensions['ratio']:.4f}\n\n"
                 "Kein passender Heizungstyp gefunden!\n"
@@ -229,7 +490,7 @@ def validate_heating_match(heating_type, specs, dimensions, show_dialog=True):
     
     if heating_type == "Fehler":
         if show_dialog:
-            safe_messagebox(messagebox.showerror, "Fehler", "Fehler bei der Heizungstyp-Erkennung!")
+            safe_messagebox("showerror", "Fehler", "Fehler bei der Heizungstyp-Erkennung!")
         return False
     
     # Zeige Bestätigung
@@ -247,9 +508,14 @@ def validate_heating_match(heating_type, specs, dimensions, show_dialog=True):
         message += f"Ziel-Verhältnis: {target_ratio:.4f}\n"
         message += f"Abweichung: {deviation:.4f}\n"
         message += f"Toleranz: {specs['tolerance']:.4f}\n\n"
+        if memo_mismatch:
+            message += f"⚠️ PRODUKT-MEMO WEICHT AB: {memo_mismatch}\n\n"
         message += "Soll die Verarbeitung fortgesetzt werden?"
         
-        result = ask_yes_no_safe("Heizungstyp bestätigen", message)
+        result = ask_yes_no_safe("Heizungstyp bestätigen", message, context={
+            "kind": "heating_type", "heating_type": heating_type,
+            "deviation": deviation, "tolerance": specs["tolerance"],
+            "memo_mismatch": memo_mismatch})
         return result
     
     return True
@@ -335,55 +601,576 @@ def edit_heating_config():
                   "und starte das Programm neu um Änderungen zu übernehmen.", 
              font=("Arial", 9)).pack(pady=10)
 
+def show_review_queue():
+    """Öffnet die Prüfliste (von auto_confirm eskalierte Bestellungen/Positionen)"""
+    review_window = tk.Toplevel()
+    review_window.title("Prüfliste")
+    review_window.geometry("600x350")
+
+    tk.Label(review_window, 
+             text="ZUR PRÜFUNG:", 
+             font=("Arial", 12, "bold")).pack(pady=(20, 10))
+
+    frame = tk.Frame(review_window)
+    frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+    scrollbar = tk.Scrollbar(frame)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    listbox = tk.Listbox(frame, yscrollcommand=scrollbar.set, font=("Courier", 9))
+    listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    scrollbar.config(command=listbox.yview)
+
+    jobs = []
+
+    def refresh():
+        jobs[:] = journal_review_jobs()
+        listbox.delete(0, tk.END)
+        for job in jobs:
+            listbox.insert(tk.END, f"{job['job_key']:<28} {job['error'] or ''}")
+
+    def review_selected():
+        selection = listbox.curselection()
+        if not selection:
+            return
+        job = jobs[selection[0]]
+        def run():
+            resolve_review_job(job)
+            review_window.after(0, refresh)
+        threading.Thread(target=run, daemon=True).start()
+
+    tk.Button(review_window, 
+              text="Ausgewählten Eintrag prüfen", 
+              command=review_selected,
+              font=("Arial", 10)).pack(pady=10)
+    listbox.bind("<Double-Button-1>", lambda event: review_selected())
+    refresh()
+
+# === Selektor-Registry (gelernte Fallback-Reihenfolge) ===
+
+SELECTOR_STATS_FILE = os.path.join(BASE_DIR, "selector_stats.json")
+_selector_stats = None
+_selector_stats_dirty = False
+_selector_lock = threading.Lock()
+
+def _get_selector_stats():
+    """Lädt die Treffer-Statistik einmalig aus der Datei"""
+    global _selector_stats
+    if _selector_stats is None:
+        _selector_stats = {}
+        if os.path.exists(SELECTOR_STATS_FILE):
+            try:
+                with open(SELECTOR_STATS_FILE, 'r', encoding='utf-8') as f:
+                    _selector_stats = json.load(f)
+            except Exception as e:
+                print(f"Fehler beim Laden der Selektor-Statistik: {e}")
+    return _selector_stats
+
+def flush_selector_stats():
+    """Speichert geänderte Selektor-Statistiken"""
+    global _selector_stats_dirty
+    with _selector_lock:
+        if not _selector_stats_dirty:
+            return
+        try:
+            atomic_write_json(SELECTOR_STATS_FILE, _get_selector_stats())
+            _selector_stats_dirty = False
+        except Exception as e:
+            print(f"Fehler beim Speichern der Selektor-Statistik: {e}")
+
+def get_ordered_selectors(element_key, selectors):
+    """
+    Sortiert die Fallback-Selektoren eines UI-Elements nach Erfolg:
+    zuletzt erfolgreicher Selektor zuerst, danach nach Trefferzahl,
+    unbekannte Selektoren in der ursprünglichen Reihenfolge.
+    """
+    with _selector_lock:
+        entry = _get_selector_stats().get(element_key, {})
+        last_success = entry.get("last_success")
+        hits = {sel: info.get("hits", 0) for sel, info in entry.get("selectors", {}).items()}
+
+    def sort_key(item):
+        index, selector = item
+        return (selector != last_success, -hits.get(selector, 0), index)
+
+    return [selector for _, selector in sorted(enumerate(selectors), key=sort_key)]
+
+def has_selector_history(element_key, selectors):
+    """True wenn für das Element bereits ein (noch gültiger) Selektor getroffen hat"""
+    with _selector_lock:
+        last_success = _get_selector_stats().get(element_key, {}).get("last_success")
+    return last_success in selectors
+
+def record_selector_result(element_key, selector, hit):
+    """Merkt sich Treffer/Fehlschlag eines Selektors"""
+    global _selector_stats_dirty
+    with _selector_lock:
+        entry = _get_selector_stats().setdefault(element_key, {"last_success": None, "selectors": {}})
+        info = entry["selectors"].setdefault(selector, {"hits": 0, "misses": 0, "last_hit": None})
+        winner_changed = False
+        if hit:
+            info["hits"] += 1
+            info["last_hit"] = datetime.now().isoformat()
+            winner_changed = entry.get("last_success") != selector
+            entry["last_success"] = selector
+        else:
+            info["misses"] += 1
+        _selector_stats_dirty = True
+
+    # Neuer Gewinner-Selektor sofort sichern, Zähler reichen beim nächsten Flush
+    if winner_changed:
+        print(f"Selektor-Registry: '{element_key}' verwendet ab jetzt {selector}")
+        flush_selector_stats()
+
+def find_with_selector_registry(driver, element_key, selectors, condition=None, accept=None, timeout=None, probe_timeout=None):
+    """
+    Sucht ein UI-Element über eine Liste von Fallback-Selektoren.
+    Der zuletzt erfolgreiche Selektor bekommt das volle Timeout, alle
+    anderen nur eine kurze Probe. Ohne Historie gilt für alle das volle Timeout.
+
+    Args:
+        driver: WebDriver-Instanz
+        element_key (str): Name des UI-Elements für die Statistik
+        selectors (list): CSS-Selektoren in der Hand-Reihenfolge
+        condition: Expected Condition Factory (Standard: presence_of_element_located)
+        accept: Optionale Funktion, die das Ergebnis prüft und das gewünschte
+                Element zurückgibt (oder None, wenn der Treffer nicht passt)
+
+    Returns:
+        tuple: (selector, element) oder (None, None)
+    """
+    settings = get_config_section("selector_registry")
+    timeout = settings["timeout"] if timeout is None else timeout
+    probe_timeout = settings["probe_timeout"] if probe_timeout is None else probe_timeout
+    condition = condition or EC.presence_of_element_located
+
+    known = has_selector_history(element_key, selectors)
+    for index, selector in enumerate(get_ordered_selectors(element_key, selectors)):
+        wait_time = timeout if (index == 0 or not known) else probe_timeout
+        try:
+            result = WebDriverWait(driver, wait_time).until(condition((By.CSS_SELECTOR, selector)))
+        except Exception:
+            record_selector_result(element_key, selector, False)
+            continue
+
+        if accept is not None:
+            result = accept(result)
+            if not result:
+                record_selector_result(element_key, selector, False)
+                continue
+
+        record_selector_result(element_key, selector, True)
+        return selector, result
+
+    return None, None
+
+# === Persistentes Chrome-Profil ===
+
+PROFILE_LOCK_FILE = "profile.lock"
+# Dateien, die Chrome für die laufende Instanz anlegt und nicht geklont werden dürfen
+PROFILE_CLONE_IGNORE = shutil.ignore_patterns("Singleton*", "lockfile", PROFILE_LOCK_FILE, "Crashpad")
+
+def _pid_alive(pid):
+    """Prüft ob ein Prozess noch läuft (ohne ihn unter Windows zu beenden)"""
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            ctypes.windll.kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def acquire_profile_lock(profile_dir):
+    """
+    Sperrt ein Profilverzeichnis für diesen Prozess (O_EXCL-Lockdatei mit PID).
+    Verwaiste Sperren abgestürzter Prozesse werden übernommen.
+
+    Returns:
+        bool: True wenn die Sperre erworben wurde
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    lock_path = os.path.join(profile_dir, PROFILE_LOCK_FILE)
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(lock_path, 'r') as f:
+                    owner_pid = int(f.read().split()[0])
+            except (OSError, ValueError, IndexError):
+                owner_pid = -1
+            if _pid_alive(owner_pid):
+                return False
+            print(f"Verwaiste Profilsperre entfernt: {lock_path}")
+            try:
+                os.remove(lock_path)
+            except OSError:
+                return False
+            continue
+        with os.fdopen(fd, 'w') as f:
+            f.write(f"{os.getpid()} {threading.get_ident()} {datetime.now().isoformat()}")
+        return True
+    return False
+
+def release_profile_lock(profile_dir):
+    """Gibt die Profilsperre frei, sofern sie diesem Prozess gehört"""
+    lock_path = os.path.join(profile_dir, PROFILE_LOCK_FILE)
+    try:
+        with open(lock_path, 'r') as f:
+            owner_pid = int(f.read().split()[0])
+        if owner_pid == os.getpid():
+            os.remove(lock_path)
+    except (OSError, ValueError, IndexError):
+        pass
+
+def _profile_is_warm(profile_dir):
+    """Ein Profil gilt als warm, sobald Chrome es einmal angelegt hat"""
+    return os.path.isdir(os.path.join(profile_dir, "Default"))
+
+def _clone_main_profile(main_profile, clone_dir):
+    """
+    Klont das warme Hauptprofil in einen (bereits gesperrten) Klon. Nur solange
+    das Hauptprofil gesperrt werden kann, also kein Chrome seine SQLite-Dateien
+    (Cookies, Login Data) gerade schreibt - sonst bleibt der Klon kalt.
+    """
+    if not _profile_is_warm(main_profile) or not acquire_profile_lock(main_profile):
+        return False
+    try:
+        print(f"Klone Chrome-Profil nach: {clone_dir}")
+        shutil.copytree(main_profile, clone_dir, ignore=PROFILE_CLONE_IGNORE, dirs_exist_ok=True)
+        return True
+    finally:
+        release_profile_lock(main_profile)
+
+def acquire_browser_profile(settings):
+    """
+    Liefert ein gesperrtes Profilverzeichnis: das Hauptprofil oder, wenn dieses
+    bereits von einem anderen Worker benutzt wird, einen Klon davon.
+
+    Returns:
+        tuple: (profile_dir, "warm" | "clone" | "cold") - nur "warm" bringt eine
+               verlässliche Session mit; Klone (evtl. veraltete Session) und kalte
+               Profile bekommen die gespeicherten Cookies injiziert
+    """
+    main_profile = os.path.join(BASE_DIR, settings["profile_dir"])
+    if acquire_profile_lock(main_profile):
+        state = "warm" if _profile_is_warm(main_profile) else "cold"
+        print(f"Verwende Chrome-Profil ({state}): {main_profile}")
+        return main_profile, state
+
+    for i in range(1, settings["max_profile_clones"] + 1):
+        profile_dir = os.path.join(BASE_DIR, f"{settings['profile_dir']}_clones", f"clone_{i}")
+        if not acquire_profile_lock(profile_dir):
+            continue
+        if not _profile_is_warm(profile_dir):
+            _clone_main_profile(main_profile, profile_dir)
+        state = "clone" if _profile_is_warm(profile_dir) else "cold"
+        print(f"Verwende Chrome-Profil ({state}): {profile_dir}")
+        return profile_dir, state
+
+    raise Exception("Alle Chrome-Profile sind belegt. Bitte warten oder max_profile_clones erhöhen.")
+
+def quit_driver(driver):
+    """Beendet den Browser und gibt ein ggf. gesperrtes Profil wieder frei"""
+    try:
+        driver.quit()
+    finally:
+        profile_dir = getattr(driver, "profile_dir", None)
+        if profile_dir:
+            release_profile_lock(profile_dir)
+            driver.profile_dir = None
+
 # === Selenium Setup ===
-def create_driver():
+def create_driver(performance_profile=None, remote_url=None, download_dir=None):
+    """
+    Startet Chrome mit dem konfigurierten Browser-Profil.
+
+    Args:
+        performance_profile (str): "standard" oder "performance"; None = Wert aus
+            browser.performance_profile. Das Performance-Profil nutzt die Page-Load-
+            Strategie "eager" und blockiert Bilder, Medien, Fonts und Tracker.
+        remote_url (str): Remote-WebDriver-Endpunkt (z.B. aus einem Broker-Lease)
+        download_dir (str): Download-Ordner aus Sicht des Browsers (Standard: DOWNLOAD_DIR)
+    """
+    load_selenium()
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+
+    browser_settings = get_config_section("browser")
+    performance_profile = performance_profile or browser_settings["performance_profile"]
+    performance = performance_profile == "performance"
+
     chrome_options = Options()
-    chrome_options.add_experimental_option("prefs", {
+    prefs = {
         "profile.default_content_setting_values.notifications": 2,
-        "download.default_directory": DOWNLOAD_DIR,
+        "download.default_directory": download_dir or DOWNLOAD_DIR,
         "download.prompt_for_download": False,
         "download.directory_upgrade": True,
         "safebrowsing.enabled": True
-    })
-    chrome_options.add_argument("--start-maximized")
+    }
+    if performance:
+        prefs["profile.managed_default_content_settings.images"] = 2
+        chrome_options.page_load_strategy = "eager"
+    chrome_options.add_experimental_option("prefs", prefs)
+    if browser_settings["headless"]:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1920,1080")
+    else:
+        chrome_options.add_argument("--start-maximized")
     chrome_options.add_argument(f"--user-agent={USER_AGENT}")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
 
-    # Create drivers directory if it doesn't exist
-    drivers_dir = os.path.join(SCRIPT_DIR, "drivers")
-    if not os.path.exists(drivers_dir):
-        os.makedirs(drivers_dir)
+    # Optional: persistentes Profil statt gepickelter Cookies
+    profile_dir, profile_state = None, "cookies"
+    if browser_settings["profile_mode"] == "persistent" and not remote_url:
+        profile_dir, profile_state = acquire_browser_profile(browser_settings)
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        chrome_options.add_argument("--profile-directory=Default")
+
+    try:
+        if remote_url:
+            print(f"Verwende Remote-WebDriver: {remote_url}")
+            driver = webdriver.Remote(command_executor=remote_url, options=chrome_options)
+        else:
+            driver = _start_chrome(chrome_options)
+    except Exception:
+        if profile_dir:
+            release_profile_lock(profile_dir)
+        raise
 
-    # Try local driver first, then fall back to ChromeDriverManager
-    local_driver_path = os.path.join(drivers_dir, "chromedriver.exe")
-    if os.path.exists(local_driver_path):
+    driver.profile_dir = profile_dir
+    driver.profile_state = profile_state
+    driver.performance_profile = performance_profile
+
+    if performance:
+        # Alles blockieren, was wir für die paar benötigten DOM-Knoten nicht brauchen
         try:
-            driver = webdriver.Chrome(service=Service(local_driver_path), options=chrome_options)
-        except:
-            # If local driver fails, use ChromeDriverManager
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    else:
-        # Use ChromeDriverManager if local driver doesn't exist
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+            execute_cdp(driver, "Network.enable")
+            execute_cdp(driver, "Network.setBlockedURLs", {"urls": browser_settings["blocked_url_patterns"]})
+        except Exception as e:
+            print(f"Warnung: URL-Blocking nicht aktiv: {e}")
+
+    if browser_settings["headless"]:
+        # Downloads im Headless-Modus explizit erlauben
+        try:
+            execute_cdp(driver, "Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": download_dir or DOWNLOAD_DIR})
+        except Exception as e:
+            print(f"Warnung: Download-Verhalten konnte nicht gesetzt werden: {e}")
 
     # Stealth: Remove "webdriver" from navigator (fixed JavaScript syntax)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     
     return driver
 
+def _start_chrome(chrome_options):
+    """
+    Startet Chrome über den gemeinsamen ChromeDriver-Dienst (ein Prozess für alle
+    Sessions). Passt der gecachte Treiber nicht mehr zu Chrome, wird er einmalig
+    neu aufgelöst. Die Startzeit wird in performance_log.jsonl festgehalten.
+    """
+    start = time.perf_counter()
+    for force_download in (False, True):
+        resolved = resolve_chromedriver(force_download=force_download)
+        try:
+            service = get_shared_service(resolved["path"])
+            connection = ChromiumRemoteConnection(service.service_url, vendor_prefix="goog",
+                                                  browser_name="chrome", keep_alive=True)
+            driver = webdriver.Remote(command_executor=connection, options=chrome_options)
+            service_mode = "shared"
+        except Exception as e:
+            print(f"Gemeinsamer ChromeDriver-Dienst nicht nutzbar, starte eigenen: {e}")
+            try:
+                driver = webdriver.Chrome(service=Service(resolved["path"]), options=chrome_options)
+                service_mode = "own"
+            except Exception as e:
+                if force_download:
+                    raise
+                print(f"Gecachter ChromeDriver unbrauchbar, löse neu auf: {e}")
+                stop_shared_service()
+                continue
+
+        record_timing("driver_startup", time.perf_counter() - start,
+                      driver_source=resolved["source"], service=service_mode)
+        return driver
+
+# === ChromeDriver-Cache ===
+
+DRIVERS_DIR = os.path.join(BASE_DIR, "drivers")
+DRIVER_MANIFEST = os.path.join(DRIVERS_DIR, "driver_manifest.json")
+CHROMEDRIVER_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+_driver_lock = threading.RLock()
+_resolved_driver = None
+_shared_service = None
+
+def _major_version(version):
+    return version.split(".")[0] if version else None
+
+def get_installed_chrome_version():
+    """Ermittelt die installierte Chrome-Version offline (Registry bzw. --version)"""
+    if os.name == "nt":
+        import winreg
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                continue
+        return None
+
+    for binary in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser"):
+        path = shutil.which(binary)
+        if path:
+            try:
+                output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+            except Exception:
+                continue
+            match = re.search(r"(\d+\.\d+\.\d+\.\d+)", output)
+            if match:
+                return match.group(1)
+    return None
+
+def _get_chromedriver_version(driver_path):
+    """Liest die Version eines ChromeDriver-Binaries (z.B. 120.0.6099.109)"""
+    try:
+        output = subprocess.run([driver_path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except Exception as e:
+        print(f"ChromeDriver-Version nicht lesbar ({driver_path}): {e}")
+        return None
+    match = re.search(r"(\d+\.\d+\.\d+\.\d+)", output)
+    return match.group(1) if match else None
+
+def _load_driver_manifest():
+    if os.path.exists(DRIVER_MANIFEST):
+        try:
+            with open(DRIVER_MANIFEST, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Fehler beim Laden des Treiber-Manifests: {e}")
+    return None
+
+def resolve_chromedriver(force_download=False):
+    """
+    Liefert den passenden ChromeDriver ohne Netzwerkzugriff, solange das Manifest
+    in drivers/driver_manifest.json zur installierten Chrome-Version passt.
+    Reihenfolge: Manifest -> drivers/ neben der EXE -> mitgelieferter Treiber
+    (PyInstaller) -> ChromeDriverManager (Download, Ergebnis wird gecacht).
+
+    Returns:
+        dict: {"path", "driver_version", "chrome_version", "source"}
+    """
+    global _resolved_driver
+    with _driver_lock:
+        if _resolved_driver and not force_download and os.path.exists(_resolved_driver["path"]):
+            return _resolved_driver
+
+        os.makedirs(DRIVERS_DIR, exist_ok=True)
+        chrome_version = get_installed_chrome_version()
+        chrome_major = _major_version(chrome_version)
+
+        manifest = None if force_download else _load_driver_manifest()
+        if manifest and os.path.exists(manifest.get("driver_path", "")) and \
+                (chrome_major is None or chrome_major == _major_version(manifest.get("driver_version"))):
+            print(f"ChromeDriver aus Cache: {manifest['driver_path']} ({manifest.get('driver_version')})")
+            _resolved_driver = {
+                "path": manifest["driver_path"],
+                "driver_version": manifest.get("driver_version"),
+                "chrome_version": chrome_version,
+                "source": "manifest"
+            }
+            return _resolved_driver
+
+        resolved = None
+        if not force_download:
+            candidates = [os.path.join(DRIVERS_DIR, CHROMEDRIVER_NAME)]
+            if hasattr(sys, "_MEIPASS"):
+                candidates.append(os.path.join(sys._MEIPASS, "drivers", CHROMEDRIVER_NAME))
+            for candidate in candidates:
+                if not os.path.exists(candidate):
+                    continue
+                driver_version = _get_chromedriver_version(candidate)
+                if chrome_major is None or chrome_major == _major_version(driver_version):
+                    resolved = {"path": candidate, "driver_version": driver_version, "source": "local"}
+                    break
+                print(f"Lokaler ChromeDriver {driver_version} passt nicht zu Chrome {chrome_version}")
+
+        if resolved is None:
+            print("Lade passenden ChromeDriver über ChromeDriverManager...")
+            downloaded = ChromeDriverManager().install()
+            driver_version = _get_chromedriver_version(downloaded) or "unbekannt"
+            cached_path = os.path.join(DRIVERS_DIR, f"chromedriver-{driver_version}{os.path.splitext(CHROMEDRIVER_NAME)[1]}")
+            shutil.copy2(downloaded, cached_path)
+            resolved = {"path": cached_path, "driver_version": driver_version, "source": "download"}
+
+        resolved["chrome_version"] = chrome_version
+        try:
+            atomic_write_json(DRIVER_MANIFEST, {
+                "driver_path": resolved["path"],
+                "driver_version": resolved["driver_version"],
+                "chrome_version": chrome_version,
+                "resolved_at": datetime.now().isoformat()
+            })
+        except Exception as e:
+            print(f"Fehler beim Schreiben des Treiber-Manifests: {e}")
+
+        _resolved_driver = resolved
+        return _resolved_driver
+
+def get_shared_service(driver_path):
+    """Startet den ChromeDriver-Dienst einmalig und verwendet ihn für alle Sessions"""
+    global _shared_service
+    with _driver_lock:
+        service = _shared_service
+        if service is not None and service.path == driver_path and \
+                service.process is not None and service.process.poll() is None:
+            return service
+        stop_shared_service()
+        service = Service(driver_path)
+        service.start()
+        _shared_service = service
+        print(f"ChromeDriver-Dienst gestartet: {service.service_url}")
+        return service
+
+def stop_shared_service():
+    """Beendet den gemeinsamen ChromeDriver-Dienst"""
+    global _shared_service
+    with _driver_lock:
+        if _shared_service is not None:
+            try:
+                _shared_service.stop()
+            except Exception as e:
+                print(f"Fehler beim Beenden des ChromeDriver-Dienstes: {e}")
+            _shared_service = None
+
+atexit.register(stop_shared_service)
+
 # === Session-Info speichern ===
 def save_session_info(driver):
     try:
+        now = datetime.now().isoformat()
         session_info = {
             "url": driver.current_url,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now,
+            "login_time": now,  # bleibt beim Keep-Alive unverändert
             "user_agent": driver.execute_script("return navigator.userAgent;")
         }
         
-        with open(SESSION_FILE, "w") as file:
-            json.dump(session_info, file)
+        atomic_write_json(SESSION_FILE, session_info)
         print(f"Session-Info gespeichert: {SESSION_FILE}")
         return True
     except Exception as e:
@@ -427,14 +1214,13 @@ def save_cookies(driver):
             print("WARNUNG: Keine relevanten Cookies gefunden!")
             return False
         
-        # Speichere Cookies
-        with open(COOKIE_FILE, "wb") as file:
-            pickle.dump(relevant_cookies, file)
-        print(f"Cookies gespeichert in: {os.path.abspath(COOKIE_FILE)}")
-        
-        # Speichere Session-Info
-        if save_session_info(driver):
-            print("Session-Info erfolgreich gespeichert")
+        # Speichere Cookies und Session-Info gemeinsam (Keep-Alive schreibt nicht dazwischen)
+        with _cookie_file_lock:
+            atomic_write_pickle(COOKIE_FILE, relevant_cookies)
+            print(f"Cookies gespeichert in: {os.path.abspath(COOKIE_FILE)}")
+            if save_session_info(driver):
+                print("Session-Info erfolgreich gespeichert")
+        invalidate_session_probe()
         
         return True
         
@@ -442,19 +1228,59 @@ def save_cookies(driver):
         print(f"FEHLER beim Speichern der Cookies: {e}")
         return False
 
+# === Chrome DevTools Protocol ===
+def execute_cdp(driver, cmd, params=None):
+    """Führt ein DevTools-Kommando aus (auch für Remote-Sessions ohne execute_cdp_cmd)"""
+    params = params or {}
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd(cmd, params)
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})["value"]
+
+def cookie_to_cdp(cookie):
+    """Wandelt ein Selenium-Cookie in ein Network.CookieParam für CDP um"""
+    cdp_cookie = {
+        'name': cookie.get('name'),
+        'value': cookie.get('value'),
+        'domain': cookie.get('domain', '.amazon.de'),
+        'path': cookie.get('path', '/'),
+        'secure': bool(cookie.get('secure', False)),
+        'httpOnly': bool(cookie.get('httpOnly', False)),
+    }
+    if 'expiry' in cookie:
+        cdp_cookie['expires'] = cookie['expiry']
+    # SameSite=None wird von Chrome nur für sichere Cookies akzeptiert
+    same_site = cookie.get('sameSite')
+    if same_site in ('Strict', 'Lax') or (same_site == 'None' and cdp_cookie['secure']):
+        cdp_cookie['sameSite'] = same_site
+    return cdp_cookie
+
 # === Cookies laden ===
-def load_cookies(driver):
-    if not os.path.exists(COOKIE_FILE):
+def load_cookies(driver, cookies=None):
+    """
+    Setzt die gespeicherten Cookies (oder die übergebenen, z.B. aus einem
+    Broker-Lease) vor der ersten Navigation.
+    Alle Amazon-Domains werden in einem einzigen CDP-Aufruf gesetzt; nur falls
+    das nicht möglich ist, wird der alte Weg über LOGIN_URL + add_cookie genutzt.
+    """
+    if cookies is None and not os.path.exists(COOKIE_FILE):
         print("Cookie-Datei nicht gefunden")
         return False
     
     try:
-        with open(COOKIE_FILE, "rb") as file:
-            cookies = pickle.load(file)
+        if cookies is None:
+            with open(COOKIE_FILE, "rb") as file:
+                cookies = pickle.load(file)
         
         print(f"Cookies geladen: {len(cookies)} Stück")
 
-        # Gehe erst zur Login-Seite, bevor Cookies gesetzt werden
+        try:
+            execute_cdp(driver, "Network.setCookies", {"cookies": [cookie_to_cdp(c) for c in cookies]})
+            print(f"Erfolgreich {len(cookies)} Cookies per DevTools gesetzt")
+            return len(cookies) > 0
+        except Exception as e:
+            print(f"CDP-Cookie-Injektion fehlgeschlagen, verwende add_cookie: {e}")
+
+        # Fallback: Gehe erst zur Login-Seite, bevor Cookies gesetzt werden
         driver.get(LOGIN_URL)
         time.sleep(3)
 
@@ -487,6 +1313,35 @@ def load_cookies(driver):
         print(f"Fehler beim Laden der Cookies: {e}")
         return False
 
+def prepare_session(driver, lease=None):
+    """
+    Stellt die Anmeldung für einen frischen Browser bereit.
+    Ein Broker-Lease liefert die Cookies des Brokers, ein warmes persistentes
+    Hauptprofil bringt seine Session selbst mit, sonst (auch bei Klonen, deren
+    Session veraltet sein kann) werden die gespeicherten Cookies injiziert.
+    """
+    if lease and lease.get("cookies"):
+        return load_cookies(driver, cookies=lease["cookies"])
+    if getattr(driver, "profile_state", None) == "warm":
+        print("Persistentes Profil: verwende Session aus dem Profil")
+        return True
+    return load_cookies(driver)
+
+def open_seller_central(driver, timeout=15):
+    """
+    Öffnet Seller Central (bereits angemeldet) und wartet auf das fertige Dokument.
+    Die Ladezeit wird je Profilzustand (cookies/cold/warm) gemessen.
+    """
+    start = time.perf_counter()
+    driver.get(LOGIN_URL)
+    # "interactive" reicht: mit page_load_strategy=eager wird nicht auf Bilder etc. gewartet
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") in ("interactive", "complete")
+    )
+    record_timing("seller_central_load", time.perf_counter() - start,
+                  profile_state=getattr(driver, "profile_state", "cookies"),
+                  performance_profile=getattr(driver, "performance_profile", "standard"))
+
 # === Verbesserte manuelle Login-Funktion ===
 def manual_login():
     driver = None
@@ -503,7 +1358,7 @@ def manual_login():
         print("Zur Login-Seite navigiert")
         
         # Zeige Login-Anweisungen
-        safe_messagebox(messagebox.showinfo, 
+        safe_messagebox("showinfo", 
             "Manueller Login erforderlich", 
             "Bitte führe den Login jetzt durch:\n\n"
             "1. Gib deine Amazon-Anmeldedaten ein\n"
@@ -514,6 +1369,7 @@ def manual_login():
         )
         
         # Warte auf Benutzer-Bestätigung mit Dialog
+        load_tk()
         root = tk.Tk()
         root.withdraw()  # Verstecke das Hauptfenster
         
@@ -567,20 +1423,20 @@ def manual_login():
         
         if not login_confirmed:
             print("Login abgebrochen durch Benutzer")
-            safe_messagebox(messagebox.showinfo, "Abgebrochen", "Login-Prozess wurde abgebrochen.")
+            safe_messagebox("showinfo", "Abgebrochen", "Login-Prozess wurde abgebrochen.")
             return
         
         print("Login-Bestätigung erhalten, speichere Cookies...")
         
         # Speichere Cookies direkt nach Bestätigung
         if save_cookies(driver):
-            safe_messagebox(messagebox.showinfo, "Erfolg!", 
+            safe_messagebox("showinfo", "Erfolg!", 
             "Login erfolgreich abgeschlossen!\n\n"
             "Cookies wurden gespeichert und bleiben gültig, bis sie vom Server abgelehnt werden.\n"
             "Du kannst jetzt Bestellungen suchen.")
             print("Cookie-Speicherung erfolgreich")
         else:
-            safe_messagebox(messagebox.showwarning, "Teilweise erfolgreich", 
+            safe_messagebox("showwarning", "Teilweise erfolgreich", 
                 "Login war erfolgreich, aber Cookies konnten nicht gespeichert werden.\n"
                 "Du musst dich beim nächsten Mal erneut einloggen.")
             print("Cookie-Speicherung fehlgeschlagen")
@@ -588,14 +1444,14 @@ def manual_login():
     except Exception as e:
         error_msg = f"Kritischer Fehler beim Login: {str(e)}"
         print(error_msg)
-        safe_messagebox(messagebox.showerror, "Fehler", error_msg)
+        safe_messagebox("showerror", "Fehler", error_msg)
         
     finally:
         # Browser nur schließen wenn der Benutzer es bestätigt hat
         if driver:
             try:
                 print("Schließe Browser...")
-                driver.quit()
+                quit_driver(driver)
                 print("Browser erfolgreich geschlossen")
             except Exception as e:
                 print(f"Fehler beim Schließen des Browsers: {e}")
@@ -603,7 +1459,7 @@ def manual_login():
 # === Cookie-Status prüfen ===
 def check_cookie_status():
     if not os.path.exists(COOKIE_FILE):
-        safe_messagebox(messagebox.showinfo, "Cookie-Status", "❌ Keine Cookies gespeichert.\n\nBitte logge dich zuerst manuell ein.")
+        safe_messagebox("showinfo", "Cookie-Status", "❌ Keine Cookies gespeichert.\n\nBitte logge dich zuerst manuell ein.")
         return
     
     try:
@@ -614,52 +1470,620 @@ def check_cookie_status():
         session_info = load_session_info()
         
         if session_info:
-            saved_time = datetime.fromisoformat(session_info["timestamp"])
+            # Alter seit dem Login, nicht seit dem letzten Keep-Alive
+            saved_time = datetime.fromisoformat(session_info.get("login_time") or session_info["timestamp"])
             time_diff = datetime.now() - saved_time
             
             hours_old = time_diff.total_seconds() / 3600
             
+            probe = probe_session(force=True)
+            if probe["valid"]:
+                probe_text = f"✅ Status: Gültig (von Seller Central bestätigt in {probe['elapsed_ms']:.0f} ms)"
+            elif probe["valid"] is False:
+                probe_text = f"❌ Status: Abgelaufen ({probe['reason']})\nBitte erneut manuell einloggen."
+            else:
+                probe_text = f"⚠️ Status: Unbekannt ({probe['reason']})"
+
             status = f"✅ Cookies gefunden!\n\n"
             status += f"Anzahl: {len(cookies)} Cookies\n"
-            status += f"Gespeichert: {saved_time.strftime('%d.%m.%Y um %H:%M:%S')}\n"
-            status += f"Alter: {int(hours_old)} Stunden\n\n"
-            status += "✅ Status: Gültig (kein Ablaufdatum)"
+            status += f"Login: {saved_time.strftime('%d.%m.%Y um %H:%M:%S')}\n"
+            status += f"Alter: {int(hours_old)} Stunden\n"
+            if session_info.get("login_time") and session_info["timestamp"] != session_info["login_time"]:
+                refreshed = datetime.fromisoformat(session_info["timestamp"])
+                status += f"Zuletzt erneuert: {refreshed.strftime('%d.%m.%Y um %H:%M:%S')}\n"
+            status += "\n"
+            status += probe_text
             
-            safe_messagebox(messagebox.showinfo, "Cookie-Status", status)
+            safe_messagebox("showinfo", "Cookie-Status", status)
         else:
-            safe_messagebox(messagebox.showinfo, "Cookie-Status", 
+            safe_messagebox("showinfo", "Cookie-Status", 
                 f"⚠️ Cookies gefunden ({len(cookies)} Stück)\n\n"
                 "Aber keine Session-Info vorhanden.\n"
                 "Die Cookies sollten trotzdem funktionieren.")
     
     except Exception as e:
-        safe_messagebox(messagebox.showerror, "Fehler", f"Fehler beim Prüfen der Cookies:\n{str(e)}")
+        safe_messagebox("showerror", "Fehler", f"Fehler beim Prüfen der Cookies:\n{str(e)}")
 
-# === Warte auf Download-Vollendung ===
-def wait_for_download_completion(download_dir, timeout=30):
-    """Warte bis der Download vollständig ist"""
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
-        # Prüfe ob .crdownload Dateien vorhanden sind (unvollständige Downloads)
-        partial_files = [f for f in os.listdir(download_dir) if f.endswith('.crdownload')]
-        if not partial_files:
-            # Prüfe ob mindestens eine ZIP-Datei vorhanden ist
-            zip_files = [f for f in os.listdir(download_dir) if f.endswith('.zip')]
-            if zip_files:
-                # Zusätzliche Wartezeit für Datei-Stabilität
-                time.sleep(2)
-                return True
-        
-        time.sleep(1)
-    
-    return False
+# === Session-Prüfung ohne Browser ===
 
-# === Multi-Position Verarbeitung ===
+# Der Lock schützt nur den Cache; die HTTP-Anfrage läuft außerhalb (single flight:
+# "pending" ist das Event der laufenden Prüfung, "generation" zählt Invalidierungen)
+_session_probe_cache = {"result": None, "checked_at": 0.0, "pending": None, "generation": 0}
+_session_probe_lock = threading.Lock()
 
-def find_order_positions(driver):
-    """
-    Erkennt alle Positionen einer Bestellung und prüft welche Anpassungsinformationen haben.
+def load_stored_cookies():
+    """Liest die gespeicherten Cookies (oder None)"""
+    if not os.path.exists(COOKIE_FILE):
+        return None
+    with open(COOKIE_FILE, "rb") as file:
+        return pickle.load(file)
+
+def _cookie_header_for(cookies, host):
+    """Baut den Cookie-Header für einen Host aus den gespeicherten Selenium-Cookies"""
+    now = time.time()
+    pairs = []
+    for cookie in cookies:
+        domain = cookie.get('domain', '').lstrip('.').lower()
+        if not (host == domain or host.endswith('.' + domain)):
+            continue
+        if 'expiry' in cookie and cookie['expiry'] < now:
+            continue
+        pairs.append(f"{cookie['name']}={cookie['value']}")
+    return "; ".join(pairs)
+
+def _ssl_context():
+    import ssl
+    try:
+        import certifi
+        return ssl.create_default_context(cafile=certifi.where())
+    except ImportError:
+        return ssl.create_default_context()
+
+def http_get_with_cookies(url, cookies, timeout=5, max_redirects=5):
+    """
+    Schlanker HTTP-GET mit den gespeicherten Cookies, Redirects werden selbst verfolgt.
+
+    Returns:
+        tuple: (status, final_url, set_cookie_headers)
+    """
+    import http.client
+    from urllib.parse import urlsplit, urljoin
+
+    set_cookies = []
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        host = parts.hostname.lower()
+        if parts.scheme == "https":
+            connection = http.client.HTTPSConnection(host, parts.port, timeout=timeout, context=_ssl_context())
+        else:
+            connection = http.client.HTTPConnection(host, parts.port, timeout=timeout)
+        try:
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            headers = {"User-Agent": USER_AGENT, "Accept": "text/html"}
+            cookie_header = _cookie_header_for(cookies, host)
+            if cookie_header:
+                headers["Cookie"] = cookie_header
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            set_cookies.extend((host, value) for value in response.headers.get_all("Set-Cookie") or [])
+            location = response.getheader("Location")
+        finally:
+            connection.close()
+
+        if response.status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            continue
+        return response.status, url, set_cookies
+
+    return response.status, url, set_cookies
+
+def _is_signin_url(url):
+    from urllib.parse import urlsplit
+    path = urlsplit(url).path.lower()
+    return "signin" in path or "/ap/" in path
+
+def probe_session(force=False):
+    """
+    Prüft die gespeicherten Cookies per HTTP gegen Seller Central (ohne Chrome).
+    Das Ergebnis wird für session_probe.ttl_seconds zwischengespeichert.
+
+    Returns:
+        dict: {"valid": True/False/None, "reason", "elapsed_ms", "checked_at"}
+              None bedeutet: nicht prüfbar (z.B. Netzwerkfehler)
+    """
+    settings = get_config_section("session_probe")
+    while True:
+        with _session_probe_lock:
+            cached = _session_probe_cache["result"]
+            if cached and not force and time.time() - _session_probe_cache["checked_at"] < settings["ttl_seconds"]:
+                return cached
+            pending = _session_probe_cache["pending"]
+            if pending is None:
+                pending = _session_probe_cache["pending"] = threading.Event()
+                generation = _session_probe_cache["generation"]
+                break
+        # Läuft bereits eine Prüfung (GUI, Keep-Alive, Statusanzeige)? Deren Ergebnis abwarten
+        pending.wait()
+        with _session_probe_lock:
+            if _session_probe_cache["result"]:
+                return _session_probe_cache["result"]
+
+    start = time.perf_counter()
+    result = {"valid": None, "reason": "Prüfung abgebrochen"}
+    try:
+        cookies = load_stored_cookies()
+        if not cookies:
+            result = {"valid": False, "reason": "keine Cookies gespeichert"}
+        else:
+            status, final_url, _ = http_get_with_cookies(settings["url"], cookies, timeout=settings["timeout"])
+            if _is_signin_url(final_url):
+                result = {"valid": False, "reason": "Weiterleitung zur Anmeldung"}
+            elif status == 200:
+                result = {"valid": True, "reason": "OK"}
+            else:
+                result = {"valid": None, "reason": f"HTTP {status}"}
+    except Exception as e:
+        result = {"valid": None, "reason": str(e)}
+    finally:
+        result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        result["checked_at"] = datetime.now().isoformat()
+        with _session_probe_lock:
+            # Während der Anfrage neu eingeloggt oder invalidiert? Dann nicht überschreiben
+            if _session_probe_cache["generation"] == generation:
+                _session_probe_cache["result"] = result
+                _session_probe_cache["checked_at"] = time.time()
+            _session_probe_cache["pending"] = None
+        pending.set()
+
+    print(f"Session-Prüfung: valid={result['valid']} ({result['reason']}, {result['elapsed_ms']:.0f} ms)")
+    return result
+
+def invalidate_session_probe():
+    """Verwirft das zwischengespeicherte Prüfergebnis (z.B. nach neuem Login)"""
+    with _session_probe_lock:
+        _session_probe_cache["result"] = None
+        _session_probe_cache["generation"] += 1
+
+def _store_probe_result(valid, reason):
+    with _session_probe_lock:
+        _session_probe_cache["result"] = {
+            "valid": valid, "reason": reason, "elapsed_ms": 0.0,
+            "checked_at": datetime.now().isoformat()
+        }
+        _session_probe_cache["checked_at"] = time.time()
+        _session_probe_cache["generation"] += 1
+
+# === Session Keep-Alive ===
+
+_cookie_file_lock = threading.Lock()
+_keepalive_state = {"thread": None, "stop": None}
+
+def merge_set_cookies(cookies, set_cookie_headers):
+    """
+    Übernimmt Set-Cookie-Antworten in die gespeicherte Cookie-Liste
+    (Selenium-Format). Gelöschte Cookies (Max-Age=0 / abgelaufen) werden entfernt.
+
+    Args:
+        cookies (list): Gespeicherte Cookies
+        set_cookie_headers (list): [(host, header_value), ...]
+
+    Returns:
+        tuple: (neue Cookie-Liste, Anzahl Änderungen)
+    """
+    from http.cookies import SimpleCookie, CookieError
+    from email.utils import parsedate_to_datetime
+
+    merged = [dict(cookie) for cookie in cookies]
+    changes = 0
+    now = time.time()
+
+    for host, header in set_cookie_headers:
+        parsed = SimpleCookie()
+        try:
+            parsed.load(header)
+        except CookieError:
+            continue
+        for name, morsel in parsed.items():
+            domain = morsel['domain'] or host
+            path = morsel['path'] or '/'
+            expiry = None
+            if morsel['max-age']:
+                try:
+                    expiry = int(now + int(morsel['max-age']))
+                except ValueError:
+                    pass
+            elif morsel['expires']:
+                try:
+                    expiry = int(parsedate_to_datetime(morsel['expires']).timestamp())
+                except (TypeError, ValueError):
+                    pass
+
+            def same_cookie(cookie):
+                return cookie.get('name') == name and \
+                    cookie.get('domain', '').lstrip('.') == domain.lstrip('.') and \
+                    cookie.get('path', '/') == path
+
+            existing = next((c for c in merged if same_cookie(c)), None)
+            if expiry is not None and expiry <= now:
+                if existing:
+                    merged.remove(existing)
+                    changes += 1
+                continue
+
+            updated = {
+                'name': name,
+                'value': morsel.value,
+                'domain': domain,
+                'path': path,
+                'secure': bool(morsel['secure']),
+                'httpOnly': bool(morsel['httponly']),
+            }
+            if morsel['samesite']:
+                updated['sameSite'] = morsel['samesite'].capitalize()
+            if expiry is not None:
+                updated['expiry'] = expiry
+
+            if existing is None:
+                merged.append(updated)
+                changes += 1
+            elif existing.get('value') != updated['value'] or existing.get('expiry') != updated.get('expiry'):
+                existing.update(updated)
+                changes += 1
+
+    return merged, changes
+
+def session_keepalive_once():
+    """
+    Berührt Seller Central einmal mit den gespeicherten Cookies und schreibt
+    erneuerte Cookies atomar nach amazon_cookies.pkl / amazon_session_info.json.
+
+    Returns:
+        dict: {"valid": True/False/None, "reason", "updated_cookies"}
+    """
+    url = get_config_section("session_probe")["url"]
+    timeout = get_config_section("session_probe")["timeout"]
+    try:
+        with _cookie_file_lock:
+            cookies = load_stored_cookies()
+            loaded_mtime = os.path.getmtime(COOKIE_FILE) if cookies else None
+        if not cookies:
+            _store_probe_result(False, "keine Cookies gespeichert")
+            return {"valid": False, "reason": "keine Cookies gespeichert", "updated_cookies": 0}
+
+        status, final_url, set_cookies = http_get_with_cookies(url, cookies, timeout=timeout)
+        if _is_signin_url(final_url):
+            _store_probe_result(False, "Weiterleitung zur Anmeldung")
+            return {"valid": False, "reason": "Weiterleitung zur Anmeldung", "updated_cookies": 0}
+        if status != 200:
+            return {"valid": None, "reason": f"HTTP {status}", "updated_cookies": 0}
+
+        merged, changes = merge_set_cookies(cookies, set_cookies)
+        with _cookie_file_lock:
+            # Während der Anfrage neu eingeloggt? Dann die frischen Cookies nicht überschreiben
+            if not os.path.exists(COOKIE_FILE) or os.path.getmtime(COOKIE_FILE) != loaded_mtime:
+                print("Keep-Alive: Cookies wurden zwischenzeitlich neu gespeichert - nichts geschrieben")
+                return {"valid": True, "reason": "OK", "updated_cookies": 0}
+            if changes:
+                atomic_write_pickle(COOKIE_FILE, merged)
+            session_info = load_session_info() or {"user_agent": USER_AGENT}
+            # Alte Session-Dateien ohne login_time: Login-Zeitpunkt aus timestamp übernehmen
+            session_info.setdefault("login_time", session_info.get("timestamp"))
+            session_info["url"] = final_url
+            session_info["timestamp"] = datetime.now().isoformat()
+            atomic_write_json(SESSION_FILE, session_info)
+
+        _store_probe_result(True, "OK (Keep-Alive)")
+        print(f"Keep-Alive: Session aktiv, {changes} Cookie(s) erneuert")
+        return {"valid": True, "reason": "OK", "updated_cookies": changes}
+
+    except Exception as e:
+        print(f"Keep-Alive fehlgeschlagen: {e}")
+        return {"valid": None, "reason": str(e), "updated_cookies": 0}
+
+def start_session_keepalive(on_expired=None, on_result=None):
+    """
+    Startet den Keep-Alive-Hintergrundthread (keepalive.interval_minutes).
+    on_expired wird einmal pro Ablauf aufgerufen, sobald ein erneuter Login nötig ist.
+    """
+    settings = get_config_section("keepalive")
+    if not settings["enabled"] or _keepalive_state["thread"] is not None:
+        return
+
+    stop_event = threading.Event()
+
+    def run():
+        alerted = False
+        while not stop_event.is_set():
+            result = session_keepalive_once()
+            if on_result:
+                on_result(result)
+            if result["valid"] is False and not alerted:
+                alerted = True
+                if on_expired:
+                    on_expired(result)
+            elif result["valid"]:
+                alerted = False
+            stop_event.wait(get_config_section("keepalive")["interval_minutes"] * 60)
+
+    thread = threading.Thread(target=run, daemon=True)
+    _keepalive_state.update(thread=thread, stop=stop_event)
+    thread.start()
+
+def stop_session_keepalive():
+    if _keepalive_state["stop"] is not None:
+        _keepalive_state["stop"].set()
+    _keepalive_state.update(thread=None, stop=None)
+
+# === Session-Broker für mehrere Packstationen ===
+# Achtung: Die API spricht unverschlüsseltes HTTP und liefert Seller-Central-Cookies
+# aus. Außerhalb von 127.0.0.1 startet sie nur mit gesetztem broker.token und gehört
+# in ein vertrauenswürdiges Netz (oder hinter einen TLS-Proxy).
+
+def is_loopback_host(host):
+    """True, wenn der Server nur lokal erreichbar ist"""
+    import ipaddress
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def check_service_token(service, host, token):
+    """Verweigert den Start im Netzwerk ohne Token (Cookies/Renderjobs für jeden im LAN)"""
+    if not token and not is_loopback_host(host):
+        raise ValueError(f"{service}: Ohne Token nur auf 127.0.0.1 erlaubt (Host {host}). "
+                         "Bitte ein Token konfigurieren - die Verbindung ist unverschlüsselt.")
+
+def token_matches(expected, provided):
+    """Vergleicht Tokens in konstanter Zeit (kein Token konfiguriert = offen)"""
+    import hmac
+    if not expected:
+        return True
+    return hmac.compare_digest(expected.encode("utf-8"), (provided or "").encode("utf-8"))
+
+def _broker_headers():
+    headers = {"Content-Type": "application/json"}
+    token = get_config_section("broker")["token"]
+    if token:
+        headers["X-Broker-Token"] = token
+    return headers
+
+def _broker_call(path, payload, timeout=10):
+    """POST an den konfigurierten Broker, liefert die JSON-Antwort"""
+    import urllib.request
+    import urllib.error
+
+    url = get_config_section("broker")["url"].rstrip("/") + path
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+                                     headers=_broker_headers(), method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read().decode("utf-8")).get("error", str(e))
+        except Exception:
+            message = str(e)
+        raise Exception(f"Broker: {message}")
+
+def request_session_lease(kind=None):
+    """
+    Leiht eine Session beim Broker (broker.url). Ohne konfigurierten Broker
+    wird None zurückgegeben und die lokale Cookie-Datei verwendet.
+
+    Returns:
+        dict: Lease mit "lease_id" und "cookies" bzw. "webdriver_url" oder None
+    """
+    settings = get_config_section("broker")
+    if not settings["url"]:
+        return None
+    lease = _broker_call("/lease", {
+        "kind": kind or settings["lease_kind"],
+        "client": os.environ.get("COMPUTERNAME") or os.environ.get("HOSTNAME") or "station"
+    })
+    print(f"Session-Lease erhalten: {lease['lease_id']} ({lease['kind']}, gültig bis {lease['expires_at']})")
+    return lease
+
+def lease_download_dirs(lease, download_dir=None):
+    """
+    Download-Ordner für ein Webdriver-Lease: der Remote-Browser speichert in den
+    Ordner des Brokers (remote_download_dir), die Station wartet auf die ZIP unter
+    broker.local_download_dir (dieselbe Freigabe; leer = gleicher Pfad).
+    Eine Prüfdatei stellt vor dem Browserstart sicher, dass der Ordner hier erreichbar ist.
+
+    Returns:
+        tuple: (Ordner für den Browser, lokaler Ordner) - ohne Lease-Ordner beide download_dir
+    """
+    if not lease or not lease.get("download_dir"):
+        return download_dir, download_dir
+    browser_dir = lease["download_dir"]
+    local_dir = get_config_section("broker")["local_download_dir"] or browser_dir
+    sentinel = os.path.join(local_dir, f".station_check_{os.getpid()}_{threading.get_ident()}")
+    try:
+        with open(sentinel, 'w', encoding='utf-8') as f:
+            f.write(lease["lease_id"])
+        os.remove(sentinel)
+    except OSError as e:
+        raise ValueError(f"Download-Ordner des Remote-Browsers ({browser_dir}) ist hier unter "
+                         f"{local_dir} nicht erreichbar ({e}). Bitte broker.local_download_dir "
+                         f"auf dieselbe Freigabe setzen.")
+    return browser_dir, local_dir
+
+def release_session_lease(lease):
+    """Gibt ein Lease zurück (Fehler werden nur protokolliert, das Lease läuft ohnehin ab)"""
+    if not lease:
+        return
+    try:
+        _broker_call("/release", {"lease_id": lease["lease_id"]})
+        print(f"Session-Lease zurückgegeben: {lease['lease_id']}")
+    except Exception as e:
+        print(f"Lease konnte nicht zurückgegeben werden: {e}")
+
+def create_session_broker(host=None, port=None):
+    """
+    Erstellt den Broker-Server, der die authentifizierte Session besitzt und
+    Leases über eine lokale HTTP-API vergibt:
+
+        GET  /health   Status, Session-Gültigkeit, aktive Leases
+        POST /lease    {"kind": "cookies"|"webdriver", "client": "..."}
+        POST /release  {"lease_id": "..."}
+
+    Die Session wird über session_probe.url geprüft (lässt sich auf den
+    lokalen Stand-in umbiegen) und vom Keep-Alive frisch gehalten.
+    Außerhalb von Loopback ist broker.token Pflicht (HTTP ist unverschlüsselt).
+    """
+    import uuid
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    settings = get_config_section("broker")
+    host = host or settings["host"]
+    check_service_token("Session-Broker", host, settings["token"])
+    leases = {}
+    leases_lock = threading.Lock()
+
+    def expire_leases():
+        now = time.time()
+        for lease_id in [lid for lid, lease in leases.items() if lease["expires"] < now]:
+            print(f"Lease abgelaufen: {lease_id} ({leases[lease_id]['client']})")
+            del leases[lease_id]
+
+    class BrokerHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status, data):
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self):
+            if not token_matches(settings["token"], self.headers.get("X-Broker-Token")):
+                self._reply(403, {"error": "ungültiges Token"})
+                return False
+            return True
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length).decode("utf-8")) if length else {}
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == "/health":
+                with leases_lock:
+                    expire_leases()
+                    active = [{"lease_id": lid, "kind": l["kind"], "client": l["client"]} for lid, l in leases.items()]
+                self._reply(200, {"status": "ok", "session": probe_session(), "active_leases": active})
+            else:
+                self._reply(404, {"error": "unbekannter Pfad"})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            try:
+                payload = self._read_json()
+            except ValueError:
+                self._reply(400, {"error": "ungültiges JSON"})
+                return
+
+            if self.path == "/lease":
+                kind = payload.get("kind", "cookies")
+                if kind not in ("cookies", "webdriver"):
+                    self._reply(400, {"error": f"unbekannte Lease-Art: {kind}"})
+                    return
+                if probe_session()["valid"] is False:
+                    self._reply(409, {"error": "Session abgelaufen - bitte am Broker neu einloggen"})
+                    return
+
+                with leases_lock:
+                    expire_leases()
+                    if kind == "webdriver":
+                        if not settings["webdriver_url"]:
+                            self._reply(400, {"error": "kein webdriver_url am Broker konfiguriert"})
+                            return
+                        in_use = sum(1 for l in leases.values() if l["kind"] == "webdriver")
+                        if in_use >= settings["max_webdriver_leases"]:
+                            self._reply(503, {"error": "alle Remote-Browser belegt"})
+                            return
+                    lease_id = uuid.uuid4().hex
+                    expires = time.time() + settings["lease_seconds"]
+                    leases[lease_id] = {"kind": kind, "client": payload.get("client", "?"), "expires": expires}
+
+                lease = {
+                    "lease_id": lease_id,
+                    "kind": kind,
+                    "expires_at": datetime.fromtimestamp(expires).isoformat(),
+                    "cookies": load_stored_cookies() or []
+                }
+                if kind == "webdriver":
+                    lease["webdriver_url"] = settings["webdriver_url"]
+                    lease["download_dir"] = settings["remote_download_dir"] or None
+                print(f"Lease vergeben: {lease_id} ({kind}) an {leases[lease_id]['client']}")
+                self._reply(200, lease)
+
+            elif self.path == "/release":
+                with leases_lock:
+                    released = leases.pop(payload.get("lease_id"), None) is not None
+                self._reply(200, {"released": released})
+
+            else:
+                self._reply(404, {"error": "unbekannter Pfad"})
+
+    server = ThreadingHTTPServer((host, port or settings["port"]), BrokerHandler)
+    server.daemon_threads = True
+    server.leases = leases
+    return server
+
+def run_session_broker(host=None, port=None):
+    """Startet den Session-Broker im Vordergrund inkl. Keep-Alive"""
+    try:
+        server = create_session_broker(host, port)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"Session-Broker läuft auf http://{server.server_address[0]}:{server.server_address[1]}")
+    start_session_keepalive(on_expired=lambda result: print(
+        f"⚠️ Session abgelaufen ({result['reason']}) - bitte am Broker neu einloggen"))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_session_keepalive()
+        server.server_close()
+
+# === Warte auf Download-Vollendung ===
+def wait_for_download_completion(download_dir, timeout=30):
+    """Warte bis der Download vollständig ist"""
+    start_time = time.time()
+    
+    while time.time() - start_time < timeout:
+        # Prüfe ob .crdownload Dateien vorhanden sind (unvollständige Downloads)
+        partial_files = [f for f in os.listdir(download_dir) if f.endswith('.crdownload')]
+        if not partial_files:
+            # Prüfe ob mindestens eine ZIP-Datei vorhanden ist
+            zip_files = [f for f in os.listdir(download_dir) if f.endswith('.zip')]
+            if zip_files:
+                # Zusätzliche Wartezeit für Datei-Stabilität
+                time.sleep(2)
+                return True
+        
+        time.sleep(1)
+    
+    return False
+
+# === Multi-Position Verarbeitung ===
+
+def find_order_positions(driver):
+    """
+    Erkennt alle Positionen einer Bestellung und prüft welche Anpassungsinformationen haben.
     Optimiert: weniger sleep-Zeiten, robustes Verhalten bleibt.
     
     Returns:
@@ -681,12 +2105,14 @@ def find_order_positions(driver):
         ]
         
         expanders = []
-        for selector in expander_selectors:
+        for selector in get_ordered_selectors("order_expander", expander_selectors):
             found = driver.find_elements(By.CSS_SELECTOR, selector)
             if found:
                 expanders = found
+                record_selector_result("order_expander", selector, True)
                 print(f"Expanders gefunden mit Selektor: {selector}")
                 break
+            record_selector_result("order_expander", selector, False)
         
         if not expanders:
             print("Keine Expander gefunden – möglicherweise nur eine Position.")
@@ -760,7 +2186,7 @@ def find_order_positions(driver):
         print(f"❌ Fehler bei der Positionssuche: {e}")
         return []
 
-def process_single_position(driver, position_info, order_number):
+def process_single_position(driver, position_info, order_number, download_dir=None):
     """
     Verarbeitet eine einzelne Position
     
@@ -768,6 +2194,7 @@ def process_single_position(driver, position_info, order_number):
         driver: WebDriver-Instanz
         position_info: Dictionary mit Position-Informationen
         order_number: Bestellnummer
+        download_dir: Lokaler Download-Ordner dieses Browsers (Standard: DOWNLOAD_DIR)
     
     Returns:
         bool: True wenn erfolgreich verarbeitet
@@ -807,7 +2234,7 @@ def process_single_position(driver, position_info, order_number):
         
         # Verarbeite die ZIP-Datei
         position_order_number = f"{order_number}_pos{position_num}"
-        success = process_downloaded_zip(position_order_number)
+        success = process_downloaded_zip(position_order_number, download_dir=download_dir)
         
         if success:
             print(f"✅ Position {position_num} erfolgreich verarbeitet")
@@ -846,129 +2273,256 @@ def process_single_position(driver, position_info, order_number):
             pass
         return False
 
-def search_order_multi_position(order_number):
+def select_germany_account(driver):
     """
-    Erweiterte Bestellungssuche mit Multi-Position-Unterstützung
+    Wählt im Account-Auswahlfenster den Deutschland-Account aus, falls es erscheint.
+    Die Fallback-Selektoren laufen über die Selektor-Registry.
     """
-    driver = create_driver()
+    try:
+        print("Prüfe auf Account-Auswahlfenster...")
+        germany_selectors = [
+            'button.full-page-account-switcher-account-details span.full-page-account-switcher-account-label',
+            'button.full-page-account-switcher-account-details',
+            '[data-testid="account-switcher-account-details"]',
+            'button[class*="account-switcher"]'
+        ]
+
+        def pick_germany(elements):
+            for element in elements:
+                if "Deutschland" in element.text or "Germany" in element.text:
+                    return element
+            return None
+
+        _, germany_button = find_with_selector_registry(
+            driver, "account_switcher_germany", germany_selectors,
+            condition=EC.presence_of_all_elements_located, accept=pick_germany
+        )
+
+        if not germany_button:
+            return False
+
+        print("Deutschland Account gefunden")
+        germany_button.click()
+        time.sleep(2)
+
+        # Bestätigungsbutton (inkl. kat-button)
+        confirm_selectors = [
+            'kat-button[data-test="confirm-selection"]',
+            'kat-button.full-page-account-switcher-button',
+            'button.kat-button.full-page-account-switcher-button',
+            'button[class*="full-page-account-switcher-button"]',
+            'button[class*="account-switcher-button"]',
+            'button.kat-button'
+        ]
+
+        selector, confirm_button = find_with_selector_registry(
+            driver, "account_switcher_confirm", confirm_selectors
+        )
+        if confirm_button:
+            print(f"Bestätigungsbutton gefunden mit Selektor: {selector}")
+            # JavaScript-Klick (robuster bei Custom Elements)
+            driver.execute_script("arguments[0].click();", confirm_button)
+            time.sleep(2)
+        else:
+            print("Bestätigungsbutton nicht gefunden, versuche trotzdem fortzufahren...")
+        return True
+
+    except Exception as e:
+        print(f"Account-Auswahl übersprungen: {str(e)}")
+        return False
+
+# === Navigation zur Bestellung ===
+
+# Amazon-Bestellnummern haben das feste Format 123-1234567-1234567
+ORDER_NUMBER_PATTERN = re.compile(r'^\d{3}-\d{7}-\d{7}$')
+
+def open_order_via_url(driver, order_number):
+    """
+    Öffnet die Bestelldetails direkt über die URL (ohne globales Suchfeld)
+
+    Returns:
+        str: "found" oder None wenn die Seite nicht wie erwartet geladen wurde
+    """
+    settings = get_config_section("navigation")
+    if not ORDER_NUMBER_PATTERN.match(order_number):
+        print(f"Bestellnummer {order_number} passt nicht zum Amazon-Format, Direkt-URL übersprungen")
+        return None
+
+    url = settings["order_detail_url"].format(order_number=order_number)
+    print(f"Öffne Bestelldetails direkt: {url}")
+    try:
+        driver.get(url)
+        # Fertig, sobald Bestellkopf ODER Positionen da sind - Bestellungen mit einer
+        # Position ohne Anpassung zeigen keinen Expander
+        ready_selector = ", ".join([
+            settings["order_header_selector"],
+            "span.a-expander-prompt",
+            "a.a-link-normal[href*='fulfillment']",
+        ])
+        WebDriverWait(driver, settings["direct_timeout"]).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+        )
+    except Exception as e:
+        print(f"Direkt-URL fehlgeschlagen: {e}")
+        return None
+
+    current_url = driver.current_url
+    if order_number not in current_url or any(keyword in current_url.lower() for keyword in ["signin", "login"]):
+        print(f"Direkt-URL wurde umgeleitet: {current_url}")
+        return None
+    return "found"
+
+def open_order_via_search(driver, order_number):
+    """
+    Öffnet die Bestelldetails über das globale Suchfeld
+
+    Returns:
+        str: "found" oder "not_found" (Timeouts werden als Exception weitergegeben)
+    """
+    search_field = WebDriverWait(driver, 15).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "input#sc-search-field"))
+    )
+    print("Suchfeld gefunden")
+
+    search_field.clear()
+    search_field.send_keys(order_number)
+
+    search_button = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.CSS_SELECTOR, "button.sc-search-button.search-icon-container"))
+    )
+    search_button.click()
+    print("Suche durchgeführt")
+
+    # Warte auf Suchergebnisse bzw. "Nicht gefunden"
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "div.sc-no-results-message, span.a-expander-prompt"))
+    )
+    if driver.find_elements(By.CSS_SELECTOR, "div.sc-no-results-message"):
+        return "not_found"
+    return "found"
+
+def open_order_details(driver, order_number):
+    """
+    Öffnet die Bestelldetails je nach navigation.mode ("direct" oder "search").
+    Im Direkt-Modus wird nur bei einem Fehlschlag auf das Suchfeld zurückgegriffen.
+    Beide Wege werden in performance_log.jsonl gemessen.
+
+    Returns:
+        str: "found" oder "not_found"
+    """
+    mode = get_config_section("navigation")["mode"]
+
+    if mode == "direct":
+        start = time.perf_counter()
+        status = open_order_via_url(driver, order_number)
+        record_timing("order_navigation", time.perf_counter() - start,
+                      mode="direct", success=status == "found", order=order_number)
+        if status:
+            return status
+        print("Fallback: Suche über das Suchfeld")
+
+    start = time.perf_counter()
+    try:
+        status = open_order_via_search(driver, order_number)
+    except Exception:
+        record_timing("order_navigation", time.perf_counter() - start,
+                      mode="search", success=False, order=order_number)
+        raise
+    record_timing("order_navigation", time.perf_counter() - start,
+                  mode="search", success=True, order=order_number)
+    return status
+
+def process_order(order_number, download_dir=None):
+    """
+    Verarbeitet eine Bestellung mit allen angepassten Positionen (ohne Abschlussdialoge).
+    Wird von der GUI (search_order_multi_position) und vom Batch-Modus genutzt.
+
+    Args:
+        download_dir: Lokaler Download-Ordner dieses Browsers (Standard: DOWNLOAD_DIR)
+
+    Returns:
+        dict: status (done, cached, cancelled, review, not_found, no_positions, no_customization,
+              session_expired, no_cookies, broker_error, download_dir_error, page_timeout, error),
+              positions, processed, failed, renders_saved, seconds, error
+    """
+    start = time.perf_counter()
+    result = {"order": order_number, "status": "error", "positions": 0, "customizable": 0,
+              "processed": 0, "failed": 0, "renders_saved": 0, "error": None}
+    reset_policy_counts()
+
+    def finish(status, **fields):
+        result.update(fields, status=status, seconds=round(time.perf_counter() - start, 3))
+        result.update(policy_counts())
+        record_timing("order_processing", result["seconds"], order=order_number, status=status,
+                      auto_approved=result["auto_approved"], escalated=result["escalated"],
+                      template_cache_hit_rate=template_cache_stats()["hit_rate"])
+        return result
+
+    # Bereits vollständig verarbeitete Bestellung? Dann ohne Browser aus dem Cache
+    restored = restore_cached_order(order_number)
+    if restored:
+        queue_restored_deliveries(restored)
+        return finish("cached", processed=len(restored), customizable=len(restored))
+
+    # Session vom Broker leihen (falls konfiguriert)
+    try:
+        lease = request_session_lease()
+    except Exception as e:
+        return finish("broker_error", error=str(e))
+
+    # Abgelaufene Session erkennen, bevor Chrome gestartet wird
+    if lease is None and probe_session()["valid"] is False:
+        return finish("session_expired")
+
+    # Remote-Browser: ZIP-Wartezeit und Entpacken laufen über die lokale Sicht der Freigabe
+    try:
+        browser_download_dir, download_dir = lease_download_dirs(lease, download_dir)
+    except ValueError as e:
+        release_session_lease(lease)
+        return finish("download_dir_error", error=str(e))
+
+    try:
+        driver = create_driver(remote_url=lease.get("webdriver_url") if lease else None,
+                               download_dir=browser_download_dir)
+    except Exception:
+        release_session_lease(lease)
+        raise
     
     try:
         print(f"=== Starte Multi-Position-Suche für Bestellung: {order_number} ===")
         
         # Standard Login-Prozess
-        if not load_cookies(driver):
-            safe_messagebox(messagebox.showerror, "Fehler", "Keine gültigen Cookies gefunden. Bitte logge dich zuerst manuell ein.")
-            return
+        if not prepare_session(driver, lease):
+            return finish("no_cookies")
 
-        driver.refresh()
-        time.sleep(3)
+        open_seller_central(driver)
         
         current_url = driver.current_url
         print(f"URL nach Cookie-Login: {current_url}")
         
         if any(keyword in current_url.lower() for keyword in ["signin", "login", "auth"]):
-            safe_messagebox(messagebox.showerror, "Session abgelaufen", "Deine Session ist abgelaufen. Bitte logge dich erneut ein.")
-            return
+            invalidate_session_probe()
+            return finish("session_expired")
 
         # Account-Auswahl handling (Deutschland)
+        select_germany_account(driver)
+        
+        # Bestellung öffnen (Direkt-URL oder Suchfeld) und auf "Nicht gefunden" prüfen
         try:
-            print("Prüfe auf Account-Auswahlfenster...")
-            germany_selectors = [
-                'button.full-page-account-switcher-account-details span.full-page-account-switcher-account-label',
-                'button.full-page-account-switcher-account-details',
-                '[data-testid="account-switcher-account-details"]',
-                'button[class*="account-switcher"]'
-            ]
+            if open_order_details(driver, order_number) == "not_found":
+                return finish("not_found")
             
-            germany_button = None
-            for selector in germany_selectors:
-                try:
-                    elements = WebDriverWait(driver, 5).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                    )
-                    
-                    for element in elements:
-                        if "Deutschland" in element.text or "Germany" in element.text:
-                            germany_button = element
-                            break
-                    
-                    if germany_button:
-                        break
-                        
-                except:
-                    continue
-            
-            if germany_button:
-                print("Deutschland Account gefunden")
-                germany_button.click()
-                time.sleep(2)
-                
-                # Bestätigungsbutton
-                confirm_selectors = [
-                    'kat-button[data-test="confirm-selection"]',
-                    'kat-button.full-page-account-switcher-button',
-                    'button.kat-button.full-page-account-switcher-button',
-                    'button[class*="full-page-account-switcher-button"]',
-                    'button[class*="account-switcher-button"]',
-                    'button.kat-button'
-                ]
-
-                for selector in confirm_selectors:
-                    try:
-                        confirm_button = WebDriverWait(driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        if confirm_button:
-                            driver.execute_script("arguments[0].click();", confirm_button)
-                            time.sleep(2)
-                            break
-                    except:
-                        continue
-
-        except Exception as e:
-            print(f"Account-Auswahl übersprungen: {str(e)}")
-        
-        # Suche nach der Bestellung
-        search_field = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input#sc-search-field"))
-        )
-        print("Suchfeld gefunden")
-        
-        search_field.clear()
-        search_field.send_keys(order_number)
-        
-        search_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.sc-search-button.search-icon-container"))
-        )
-        search_button.click()
-        print("Suche durchgeführt")
-        
-        # Prüfe auf "Nicht gefunden"
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.sc-no-results-message, span.a-expander-prompt"))
-            )
-            
-            no_results = driver.find_elements(By.CSS_SELECTOR, "div.sc-no-results-message")
-            if no_results:
-                safe_messagebox(messagebox.showwarning, "Nicht gefunden", f"Bestellung {order_number} wurde nicht gefunden.")
-                return
-            
-            # Erkenne alle Positionen
-            positions = find_order_positions(driver)
+            # Erkenne alle Positionen
+            positions = find_order_positions(driver)
             
             if not positions:
-                safe_messagebox(messagebox.showwarning, "Keine Positionen", "Keine Bestellpositionen gefunden.")
-                return
+                return finish("no_positions")
             
-            # Zeige Übersicht der gefundenen Positionen
             customizable_positions = [p for p in positions if p['has_customization']]
+            result.update(positions=len(positions), customizable=len(customizable_positions))
             
             if not customizable_positions:
-                safe_messagebox(messagebox.showinfo, "Keine Anpassungen", 
-                    f"Bestellung {order_number} hat {len(positions)} Position(en), "
-                    "aber keine davon hat Anpassungsinformationen.")
-                return
+                return finish("no_customization")
             
             # Bestätigung anzeigen
             message = f"BESTELLUNG: {order_number}\n\n"
@@ -979,20 +2533,47 @@ def search_order_multi_position(order_number):
                 message += f"• Position {pos['position']}\n"
             message += "\nSollen alle Positionen verarbeitet werden?"
             
-            result = ask_yes_no_safe("Multi-Position Verarbeitung", message)
-            if not result:
+            confirmed = ask_yes_no_safe("Multi-Position Verarbeitung", message, context={
+                "kind": "positions", "order": order_number,
+                "positions": len(positions), "customizable": len(customizable_positions)})
+            if not confirmed:
+                review_reason = take_review_reason()
+                if review_reason:
+                    journal_record(order_number, "review", error=review_reason)
+                    return finish("review", error=review_reason)
                 print("Verarbeitung vom Benutzer abgebrochen")
-                return
+                return finish("cancelled")
             
             # Verarbeite alle Positionen mit Anpassungsinformationen
             processed_count = 0
             failed_count = 0
+            begin_render_dedup(order_number)
+
+            for position_info in customizable_positions:
+                position_key = f"{order_number}_pos{position_info['position']}"
+                if journal_get(position_key) is None:
+                    journal_record(position_key, "queued")
             
             for position_info in customizable_positions:
                 try:
                     print(f"\n{'='*50}")
                     print(f"VERARBEITE POSITION {position_info['position']} VON {len(customizable_positions)}")
                     print(f"{'='*50}")
+
+                    # Nach einem Abbruch ab der letzten abgeschlossenen Stufe weitermachen
+                    position_key = f"{order_number}_pos{position_info['position']}"
+                    if journal_completed_tiff(position_key):
+                        print(f"Position {position_info['position']} bereits gerendert (Job-Journal) - übersprungen")
+                        processed_count += 1
+                        continue
+                    resumed_zip = journal_downloaded_zip(position_key)
+                    if resumed_zip:
+                        print(f"Position {position_info['position']} bereits heruntergeladen - rendere ohne Download")
+                        if process_downloaded_zip(position_key, zip_path=resumed_zip):
+                            processed_count += 1
+                        else:
+                            failed_count += 1
+                        continue
                     
                     # NEU: Nach jeder Navigation die Positionen neu laden
                     current_positions = find_order_positions(driver)
@@ -1006,7 +2587,8 @@ def search_order_multi_position(order_number):
                         failed_count += 1
                         continue
                     
-                    success = process_single_position(driver, current_position_info, order_number)
+                    success = process_single_position(driver, current_position_info, order_number,
+                                                      download_dir=download_dir)
                     
                     if success:
                         processed_count += 1
@@ -1021,56 +2603,282 @@ def search_order_multi_position(order_number):
                     failed_count += 1
                     continue
             
-            # Abschlussmeldung
-            final_message = f"VERARBEITUNG ABGESCHLOSSEN!\n\n"
-            final_message += f"Bestellung: {order_number}\n"
-            final_message += f"Erfolgreich verarbeitet: {processed_count}\n"
-            final_message += f"Fehlgeschlagen: {failed_count}\n"
-            final_message += f"Gesamtpositionen: {len(positions)}\n\n"
-            final_message += "Die TIFF-Dateien befinden sich im 'amazon_order_downloads' Ordner."
-            
-            safe_messagebox(messagebox.showinfo, "Verarbeitung abgeschlossen", final_message)
-            
-            # Öffne den Download-Ordner
-            try:
-                os.startfile(DOWNLOAD_DIR)
-            except:
-                pass
+            renders_saved = pop_render_dedup_stats(order_number)
+            if renders_saved:
+                print(f"♻️ {renders_saved} Renderlauf/-läufe durch identische Positionen eingespart")
+
+            if processed_count and not failed_count:
+                remember_order_positions(order_number,
+                    [f"{order_number}_pos{p['position']}" for p in customizable_positions])
+
+            review_count = sum(1 for p in customizable_positions
+                               if (journal_get(f"{order_number}_pos{p['position']}") or {}).get("stage") == "review")
+            return finish("done", processed=processed_count, failed=failed_count,
+                          renders_saved=renders_saved, review=review_count)
                 
         except Exception as e:
-            safe_messagebox(messagebox.showwarning, "Nicht gefunden", 
-                f"Bestellung {order_number} wurde nicht gefunden oder die Seite hat zu lange geladen.")
+            return finish("page_timeout", error=str(e))
             
     except Exception as e:
-        safe_messagebox(messagebox.showerror, "Fehler", f"Multi-Position-Prozess fehlgeschlagen: {e}")
         print(f"Kritischer Fehler: {str(e)}")
+        return finish("error", error=str(e))
         
     finally:
         # Browser erst am Ende schließen
-        driver.quit()
+        quit_driver(driver)
+        flush_selector_stats()
+        release_session_lease(lease)
+        pop_render_dedup_stats(order_number)
 
-# Aktualisierte process_downloaded_zip für Multi-Position
-def process_downloaded_zip(order_number):
-    """Verarbeite die heruntergeladene ZIP-Datei - Multi-Position Version"""
-    print(f"=== Starte Verarbeitung für: {order_number} ===")
-    
-    # Warte auf Download-Vollendung
-    if not wait_for_download_completion(DOWNLOAD_DIR, timeout=30):
-        print("❌ Download nicht rechtzeitig abgeschlossen")
+def search_order_multi_position(order_number):
+    """
+    Erweiterte Bestellungssuche mit Multi-Position-Unterstützung (GUI)
+    """
+    result = process_order(order_number)
+    status = result["status"]
+
+    if status == "cached":
+        safe_messagebox("showinfo", "Aus dem Cache",
+            f"Bestellung {order_number} wurde bereits verarbeitet.\n\n"
+            f"{result['processed']} TIFF-Datei(en) aus dem Cache wiederhergestellt.")
+    elif status == "broker_error":
+        safe_messagebox("showerror", "Session-Broker", f"Keine Session vom Broker erhalten:\n{result['error']}")
+    elif status == "download_dir_error":
+        safe_messagebox("showerror", "Download-Ordner", result["error"])
+    elif status == "session_expired":
+        safe_messagebox("showerror", "Session abgelaufen", "Deine Session ist abgelaufen. Bitte logge dich erneut ein.")
+    elif status == "no_cookies":
+        safe_messagebox("showerror", "Fehler", "Keine gültigen Cookies gefunden. Bitte logge dich zuerst manuell ein.")
+    elif status == "not_found":
+        safe_messagebox("showwarning", "Nicht gefunden", f"Bestellung {order_number} wurde nicht gefunden.")
+    elif status == "no_positions":
+        safe_messagebox("showwarning", "Keine Positionen", "Keine Bestellpositionen gefunden.")
+    elif status == "no_customization":
+        safe_messagebox("showinfo", "Keine Anpassungen", 
+            f"Bestellung {order_number} hat {result['positions']} Position(en), "
+            "aber keine davon hat Anpassungsinformationen.")
+    elif status == "review":
+        safe_messagebox("showinfo", "Zur Prüfung",
+            f"Bestellung {order_number} wurde auf die Prüfliste gesetzt:\n{result['error']}")
+    elif status == "page_timeout":
+        safe_messagebox("showwarning", "Nicht gefunden", 
+            f"Bestellung {order_number} wurde nicht gefunden oder die Seite hat zu lange geladen.")
+    elif status == "error":
+        safe_messagebox("showerror", "Fehler", f"Multi-Position-Prozess fehlgeschlagen: {result['error']}")
+    elif status == "done":
+        # Abschlussmeldung
+        final_message = f"VERARBEITUNG ABGESCHLOSSEN!\n\n"
+        final_message += f"Bestellung: {order_number}\n"
+        final_message += f"Erfolgreich verarbeitet: {result['processed']}\n"
+        final_message += f"Fehlgeschlagen: {result['failed']}\n"
+        final_message += f"Gesamtpositionen: {result['positions']}\n"
+        final_message += f"Renders gespart (identische Positionen): {result['renders_saved']}\n"
+        if result["auto_approved"] or result["escalated"]:
+            final_message += f"Automatisch bestätigt: {result['auto_approved']} | Zur Prüfung: {result['escalated']}\n"
+        final_message += "\n"
+        final_message += "Die TIFF-Dateien befinden sich im 'amazon_order_downloads' Ordner."
+        
+        safe_messagebox("showinfo", "Verarbeitung abgeschlossen", final_message)
+        
+        # Öffne den Download-Ordner
+        try:
+            os.startfile(DOWNLOAD_DIR)
+        except:
+            pass
+
+# === Preflight: Bildprüfung direkt aus der ZIP ===
+# Liest nur JSON und Bild-Header (Größe, Modus, EXIF-Ausrichtung, ICC) aus der ZIP
+# und prüft quality_settings.min_dpi, bevor entpackt, dekodiert oder gerastert wird.
+# Das Seitenverhältnis ist nur ein Hinweis: das Bild wird in den Ausschnitt der
+# Vorlage eingepasst, übliche 4:3- oder 3:2-Fotos sind also kein Fehler.
+
+EXIF_ORIENTATION_TAG = 274
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+
+def inspect_zip_image(zip_path):
+    """
+    Ermittelt Druckdimensionen und Header des Kundenbilds, ohne die ZIP zu entpacken.
+
+    Returns:
+        dict: member, width, height (ausrichtungskorrigiert), mode, format,
+              orientation, icc_profile_bytes, print_dimensions
+    """
+    load_render_libs()
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        members = [info for info in zip_ref.infolist() if not info.is_dir()]
+        json_members = sorted((info for info in members if info.filename.lower().endswith('.json')),
+                              key=lambda info: info.filename.count('/'))
+        data = json.loads(zip_ref.read(json_members[0])) if json_members else {}
+
+        # Gleiche Auswahl wie process_files_to_tiff: Bildname aus der JSON, sonst größte Datei
+        image_members = [info for info in members if info.filename.lower().endswith(IMAGE_EXTENSIONS)]
+        if not image_members:
+            raise Exception("Keine Bilddatei in der ZIP")
+        target_name = search_for_image_in_data(data.get('customizationData', {}))
+        member = None
+        if target_name:
+            member = next((info for info in image_members
+                           if os.path.basename(info.filename) == target_name), None)
+            member = member or next((info for info in image_members
+                                     if os.path.splitext(os.path.basename(info.filename))[0]
+                                     == os.path.splitext(target_name)[0]), None)
+        member = member or max(image_members, key=lambda info: info.file_size)
+
+        # Image.open liest nur den Header; die Pixeldaten bleiben unangetastet
+        with zip_ref.open(member) as image_file:
+            img = Image.open(image_file)
+            width, height = img.size
+            orientation = img.getexif().get(EXIF_ORIENTATION_TAG, 1)
+            info = {
+                "member": member.filename,
+                "mode": img.mode,
+                "format": img.format,
+                "orientation": orientation,
+                "icc_profile_bytes": len(img.info.get("icc_profile") or b""),
+            }
+
+    # EXIF-Ausrichtung 5-8 = um 90° gedreht
+    if orientation in (5, 6, 7, 8):
+        width, height = height, width
+    info.update(width=width, height=height, print_dimensions=find_print_dimensions(data))
+    return info
+
+def preflight_check(zip_path, order_number, interactive=True):
+    """
+    Schnelle Qualitätsprüfung des Kundenbilds vor dem Rendern.
+    quality_settings.preflight_action: "ask" (Rückfrage), "reject" (abbrechen), "off"
+    Ohne Bediener (interactive=False) entscheidet die Bestätigungs-Regel; ohne Regel
+    kommt die Bestellung auf die Prüfliste.
+
+    Returns:
+        bool: True = weiterverarbeiten
+    """
+    settings = get_config_section("quality_settings")
+    action = settings["preflight_action"]
+    if action == "off":
+        return True
+
+    start = time.perf_counter()
+    try:
+        info = inspect_zip_image(zip_path)
+    except Exception as e:
+        print(f"Warnung: Preflight nicht möglich ({e}) - wird übersprungen")
+        return True
+
+    problems = []
+    effective_dpi = None
+    if info["print_dimensions"]:
+        heating_type, specs = detect_heating_type(info["print_dimensions"])
+        if specs:
+            # Das Bild füllt die Platte: die knappere Achse bestimmt die Auflösung
+            effective_dpi = min(info["width"] / (specs["width"] / 25.4),
+                                info["height"] / (specs["height"] / 25.4))
+            if effective_dpi < settings["min_dpi"]:
+                problems.append(f"Effektive Auflösung {effective_dpi:.0f} DPI < {settings['min_dpi']} DPI "
+                                f"({info['width']}x{info['height']} px auf {specs['width']}x{specs['height']} mm)")
+            ratio_deviation = abs((info["width"] / info["height"]) / (specs["width"] / specs["height"]) - 1)
+            if ratio_deviation > settings["max_ratio_deviation"]:
+                print(f"ℹ️ Seitenverhältnis weicht um {ratio_deviation:.1%} von der Platte ab - "
+                      f"Bild wird im Vorlagen-Ausschnitt beschnitten")
+
+    record_timing("preflight", time.perf_counter() - start, order=order_number,
+                  dpi=round(effective_dpi) if effective_dpi else None, mode=info["mode"],
+                  orientation=info["orientation"], icc=bool(info["icc_profile_bytes"]), problems=len(problems))
+    if not problems:
+        print(f"✅ Preflight OK: {info['width']}x{info['height']} px, {info['mode']}"
+              f"{f', {effective_dpi:.0f} DPI' if effective_dpi else ''}")
+        return True
+
+    message = f"BILDQUALITÄT: {order_number}\n\n" + "\n".join(f"• {problem}" for problem in problems)
+    if action == "reject":
+        print(f"❌ Preflight abgelehnt: {'; '.join(problems)}")
+        safe_messagebox("showerror", "Bildqualität unzureichend", message)
         return False
-    
-    # Finde die neueste ZIP-Datei
-    zip_files = [f for f in os.listdir(DOWNLOAD_DIR) if f.endswith('.zip')]
-    if not zip_files:
-        print(f"❌ Keine ZIP-Datei gefunden in: {DOWNLOAD_DIR}")
+    title = "Bildqualität prüfen"
+    context = {"kind": "preflight", "order": order_number, "problems": problems, "dpi": effective_dpi}
+    if interactive:
+        return ask_yes_no_safe(title, message + "\n\nTrotzdem verarbeiten?", context=context)
+
+    handler = _confirmation["handler"]
+    decision = handler(title, message, context) if handler is not None else None
+    if decision is None:
+        # Kein Bediener und keine Regel: auf die Prüfliste statt ablehnen
+        _policy_state.review_reason = "Preflight: " + "; ".join(problems)
+        print(f"🔎 Preflight-Befund: {'; '.join(problems)}")
         return False
+    return decision
+
+# Aktualisierte process_downloaded_zip für Multi-Position
+def process_downloaded_zip(order_number, zip_path=None, interactive=True, download_dir=None):
+    """
+    Verarbeite die heruntergeladene ZIP-Datei - Multi-Position Version
+
+    Args:
+        zip_path: Bereits vorhandene ZIP (z.B. Wiederaufnahme aus dem Job-Journal);
+                  ohne Angabe wird der neueste Download verwendet
+        interactive (bool): False = ohne Bestätigungsdialog (Hot-Folder)
+        download_dir: Ordner, in dem der Browser die ZIP ablegt (Standard: DOWNLOAD_DIR)
+    """
+    print(f"=== Starte Verarbeitung für: {order_number} ===")
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    download_dir = download_dir or DOWNLOAD_DIR
     
-    latest_zip = max(zip_files, key=lambda f: os.path.getmtime(os.path.join(DOWNLOAD_DIR, f)))
-    zip_path = os.path.join(DOWNLOAD_DIR, latest_zip)
+    if zip_path is None:
+        # Warte auf Download-Vollendung
+        if not wait_for_download_completion(download_dir, timeout=30):
+            print("❌ Download nicht rechtzeitig abgeschlossen")
+            return False
+        
+        # Finde die neueste ZIP-Datei
+        zip_files = [f for f in os.listdir(download_dir) if f.endswith('.zip')]
+        if not zip_files:
+            print(f"❌ Keine ZIP-Datei gefunden in: {download_dir}")
+            return False
+        
+        latest_zip = max(zip_files, key=lambda f: os.path.getmtime(os.path.join(download_dir, f)))
+
+        # ZIP unter festem Namen ablegen, damit sie einen Absturz übersteht
+        os.makedirs(JOURNAL_ZIP_DIR, exist_ok=True)
+        zip_path = os.path.join(JOURNAL_ZIP_DIR, f"{order_number}.zip")
+        os.replace(os.path.join(download_dir, latest_zip), zip_path)
     
     print(f"Verarbeite ZIP-Datei: {zip_path}")
+    zip_sha256 = file_sha256(zip_path)
+
+    # Laut Journal mit derselben ZIP bereits gerendert? Dann nichts wegwerfen
+    done_tiff = journal_completed_tiff(order_number, zip_sha256)
+    if done_tiff:
+        print(f"✅ Bereits verarbeitet (Job-Journal): {done_tiff}")
+        remove_processed_zip(zip_path)
+        return True
+
+    # Unveränderte Anpassung bereits gerendert? Dann TIFF aus dem Cache übernehmen
+    cache_start = time.perf_counter()
+    cache_key = result_cache_key(zip_path, zip_sha256)
+    cached_tiff = restore_cached_result(cache_key, order_number)
+    if cached_tiff:
+        record_timing("result_cache_hit", time.perf_counter() - cache_start, order=order_number)
+        print(f"✅ TIFF aus dem Cache übernommen: {cached_tiff}")
+        journal_record(order_number, "rendered", zip_path=zip_path, zip_sha256=zip_sha256,
+                       tiff_path=cached_tiff, error=None, settings_fingerprint=render_settings_fingerprint())
+        queue_delivery(order_number, cached_tiff)
+        remove_processed_zip(zip_path)
+        return True
+
+    journal_record(order_number, "downloaded", zip_path=zip_path, zip_sha256=zip_sha256,
+                   tiff_path=None, error=None)
+
+    # Preflight: Bild-Header direkt aus der ZIP prüfen, bevor entpackt und gerendert wird
+    if not preflight_check(zip_path, order_number, interactive=interactive):
+        review_reason = take_review_reason()
+        if review_reason:
+            print(f"🔎 {order_number} auf die Prüfliste gesetzt")
+            journal_record(order_number, "review", error=review_reason)
+        else:
+            journal_record(order_number, "downloaded", error="Preflight: Bildqualität unzureichend")
+        return False
     
-    # Erstelle Ordner für entpackte Dateien
+    # Erstelle Ordner für entpackte Dateien (enthält hier nur unfertige Reste)
     extract_dir = os.path.join(DOWNLOAD_DIR, order_number)
     
     if os.path.exists(extract_dir):
@@ -1092,26 +2900,41 @@ def process_downloaded_zip(order_number):
         
     except Exception as e:
         print(f"❌ Fehler beim Entpacken: {e}")
+        journal_record(order_number, "downloaded", error=f"Entpacken: {e}")
         return False
     
-    # Verarbeite die Dateien zu TIFF
-    tiff_path = process_files_to_tiff(extract_dir, order_number)
+    # Verarbeite die Dateien zu TIFF (lokal oder auf dem Render-Server)
+    tiff_path = render_order(extract_dir, order_number, zip_path, interactive=interactive)
     
     if tiff_path and os.path.exists(tiff_path):
         print(f"✅ TIFF-Datei erfolgreich erstellt: {tiff_path}")
+        store_cached_result(cache_key, tiff_path, order_number)
+        journal_record(order_number, "rendered", tiff_path=tiff_path, error=None,
+                       settings_fingerprint=render_settings_fingerprint())
+        queue_delivery(order_number, tiff_path)
         
         # Lösche die ZIP-Datei nach erfolgreicher Verarbeitung
-        try:
-            os.remove(zip_path)
-            print(f"ZIP-Datei gelöscht: {zip_path}")
-        except Exception as e:
-            print(f"Warnung: ZIP-Datei konnte nicht gelöscht werden: {e}")
+        remove_processed_zip(zip_path)
         
         return True
     else:
+        review_reason = take_review_reason()
+        if review_reason:
+            print(f"🔎 {order_number} auf die Prüfliste gesetzt")
+            journal_record(order_number, "review", error=review_reason)
+            return False
         print("❌ TIFF-Datei konnte nicht erstellt werden")
+        journal_record(order_number, "downloaded", error="TIFF-Datei konnte nicht erstellt werden")
         return False
 
+def remove_processed_zip(zip_path):
+    """Löscht die ZIP-Datei nach erfolgreicher Verarbeitung"""
+    try:
+        os.remove(zip_path)
+        print(f"ZIP-Datei gelöscht: {zip_path}")
+    except Exception as e:
+        print(f"Warnung: ZIP-Datei konnte nicht gelöscht werden: {e}")
+
 
 def extract_image_filename_from_json(extract_dir):
     """
@@ -1229,16 +3052,169 @@ def find_correct_image_file(extract_dir, target_filename):
         print(f"Fehler beim Suchen der korrekten Bilddatei: {e}")
         return None  
 
+# === Produkt-Memo (bestätigter Heizungstyp je ASIN/SKU/Vorlage) ===
+# Einmal bestätigte Produkte werden beim nächsten Mal ohne Erkennung und ohne
+# Rückfrage übernommen. Weicht Vorlage oder Druckmaß vom Memo ab, wird das
+# gemeldet und wie bisher erkannt und bestätigt.
+
+PRODUCT_MEMO_FILE = os.path.join(BASE_DIR, "product_memo.json")
+_product_memo_lock = threading.Lock()
+PRODUCT_ID_KEYS = (
+    ("asin", ("asin",)),
+    ("sku", ("sku", "sellersku", "merchantsku")),
+    ("template", ("templateid", "customizationtemplateid")),
+)
+# Nur diese Ebenen werden durchsucht (direkte Schlüssel), damit keine verschachtelten
+# oder fremden Werte (z.B. Zubehör-ASINs in Unterelementen) als Produkt gelten
+PRODUCT_ID_SCOPES = ((), ("customizationInfo",), ("customizationData",))
+
+def find_product_identifier(data):
+    """
+    Sucht ASIN, SKU oder Vorlagen-ID (in dieser Reihenfolge) auf der obersten
+    Ebene der Anpassungsdaten bzw. direkt in customizationInfo/customizationData.
+
+    Returns:
+        str: z.B. "asin:B0ABC12345" oder None
+    """
+    scopes = []
+    for path in PRODUCT_ID_SCOPES:
+        node = data
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+        if isinstance(node, dict):
+            scopes.append({key.lower(): value for key, value in node.items()
+                           if isinstance(value, (str, int)) and str(value).strip()})
+
+    for kind, keys in PRODUCT_ID_KEYS:
+        for found in scopes:
+            for key in keys:
+                if key in found:
+                    return f"{kind}:{str(found[key]).strip()}"
+    return None
+
+def _load_product_memo():
+    try:
+        with open(PRODUCT_MEMO_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def lookup_product_memo(product_id, dimensions, template):
+    """
+    Prüft das Produkt-Memo.
+
+    Returns:
+        tuple: (dimensions mit Heizungstyp oder None, Abweichungsgrund oder None)
+    """
+    if not product_id:
+        return None, None
+    with _product_memo_lock:
+        entry = _load_product_memo().get(product_id)
+    if not entry:
+        return None, None
+
+    heating_specs = load_config()["heating_panels"].get(entry["heating_type"])
+    if (entry["width"], entry["height"]) != (dimensions["width"], dimensions["height"]):
+        reason = (f"Druckmaß {dimensions['width']}x{dimensions['height']} statt "
+                  f"{entry['width']}x{entry['height']}")
+    elif template and entry.get("template_hash") and template["template_hash"] != entry["template_hash"]:
+        reason = "SVG-Vorlage hat sich geändert"
+    elif not heating_specs:
+        reason = f"Heizungstyp '{entry['heating_type']}' ist nicht mehr konfiguriert"
+    else:
+        memo_dimensions = dict(dimensions, heating_type=entry["heating_type"],
+                               heating_specs=heating_specs, product_id=product_id)
+        print(f"📒 Produkt-Memo: {product_id} -> {entry['heating_type']} (Erkennung und Rückfrage übersprungen)")
+        return memo_dimensions, None
+
+    print(f"⚠️ Produkt-Memo weicht ab ({product_id}): {reason}")
+    return None, reason
+
+def remember_product(product_id, dimensions, template, mismatch=None):
+    """Speichert einen bestätigten Heizungstyp samt Vorlagen-Geometrie im Produkt-Memo"""
+    if not product_id:
+        return
+    try:
+        with _product_memo_lock:
+            memo = _load_product_memo()
+            previous = memo.get(product_id, {})
+            memo[product_id] = {
+                "heating_type": dimensions["heating_type"],
+                "width": dimensions["width"],
+                "height": dimensions["height"],
+                "ratio": dimensions["ratio"],
+                "template_hash": template["template_hash"] if template else None,
+                "confirmed": datetime.now().isoformat(),
+                "mismatches": previous.get("mismatches", 0) + (1 if mismatch else 0),
+                "last_mismatch": mismatch or previous.get("last_mismatch"),
+            }
+            atomic_write_json(PRODUCT_MEMO_FILE, memo)
+        print(f"📒 Produkt-Memo aktualisiert: {product_id} -> {dimensions['heating_type']}")
+    except Exception as e:
+        print(f"Warnung: Produkt-Memo konnte nicht gespeichert werden: {e}")
+
 # === ERWEITERTE VERSION mit Heizungstyp-Erkennung ===
-def extract_dimensions_and_check_text(extract_dir):
+def find_print_dimensions(data):
+    """
+    Liest die Druckdimensionen aus den Anpassungsdaten (ohne Dialoge).
+
+    Returns:
+        dict: {'width', 'height', 'ratio'} oder None
+    """
+    required_dimensions = None
+    
+    # Zuerst in customizationData suchen
+    if 'customizationData' in data:
+        for child in data['customizationData'].get('children', []):
+            for subchild in child.get('children', []):
+                for item in subchild.get('children', []):
+                    if item.get('type') == "PlacementContainerCustomization":
+                        dims = item.get('dimension', {})
+                        if 'width' in dims and 'height' in dims:
+                            required_dimensions = {
+                                'width': dims['width'],
+                                'height': dims['height'],
+                                'ratio': dims['width'] / dims['height']
+                            }
+                            print(f"Gefundene Druckdimensionen: {dims['width']}x{dims['height']}")
+                            break
+                if required_dimensions:
+                    break
+            if required_dimensions:
+                break
+    
+    # Falls nicht gefunden, in customizationInfo suchen
+    if not required_dimensions and 'customizationInfo' in data:
+        for surface in data['customizationInfo'].get('version3.0', {}).get('surfaces', []):
+            for area in surface.get('areas', []):
+                if area.get('customizationType') == "ImagePrinting":
+                    dims = area.get('Dimensions', {})
+                    if 'width' in dims and 'height' in dims:
+                        required_dimensions = {
+                            'width': dims['width'],
+                            'height': dims['height'],
+                            'ratio': dims['width'] / dims['height']
+                        }
+                        print(f"Gefundene Druckdimensionen (ImagePrinting): {dims['width']}x{dims['height']}")
+                        break
+            if required_dimensions:
+                break
+
+    return required_dimensions
+
+def extract_dimensions_and_check_text(extract_dir, interactive=True):
     """
     Erweiterte Version mit Heizungstyp-Erkennung
+
+    Args:
+        extract_dir (str): Verzeichnis mit den entpackten Dateien
+        interactive (bool): False = ohne Bestätigungsdialog (nur bekannte Heizungstypen)
     """
     try:
         # Suche nach JSON-Dateien
         json_files = [f for f in os.listdir(extract_dir) if f.lower().endswith('.json')]
         if not json_files:
-            safe_messagebox(messagebox.showerror, "Fehler", "Keine JSON-Datei im Download gefunden")
+            safe_messagebox("showerror", "Fehler", "Keine JSON-Datei im Download gefunden")
             return None
         
         json_path = os.path.join(extract_dir, json_files[0])
@@ -1255,64 +3231,40 @@ def extract_dimensions_and_check_text(extract_dir):
                     if area.get('customizationType') == "TextPrinting" and area.get('label') == "Verkäufer nachricht":
                         if area.get('text', '').strip():
                             seller_message = area['text'].strip()
-                            safe_messagebox(messagebox.showinfo, 
+                            safe_messagebox("showinfo", 
                                 "Verkäuferhinweis", 
                                 f"Nachricht vom Verkäufer:\n\n{seller_message}"
                             )
         
         # 2. Suche Druckdimensionen (kritischer Teil)
-        required_dimensions = None
-        
-        # Zuerst in customizationData suchen
-        if 'customizationData' in data:
-            for child in data['customizationData'].get('children', []):
-                for subchild in child.get('children', []):
-                    for item in subchild.get('children', []):
-                        if item.get('type') == "PlacementContainerCustomization":
-                            dims = item.get('dimension', {})
-                            if 'width' in dims and 'height' in dims:
-                                required_dimensions = {
-                                    'width': dims['width'],
-                                    'height': dims['height'],
-                                    'ratio': dims['width'] / dims['height']
-                                }
-                                print(f"Gefundene Druckdimensionen: {dims['width']}x{dims['height']}")
-                                break
-                    if required_dimensions:
-                        break
-                if required_dimensions:
-                    break
-        
-        # Falls nicht gefunden, in customizationInfo suchen
-        if not required_dimensions and 'customizationInfo' in data:
-            for surface in data['customizationInfo'].get('version3.0', {}).get('surfaces', []):
-                for area in surface.get('areas', []):
-                    if area.get('customizationType') == "ImagePrinting":
-                        dims = area.get('Dimensions', {})
-                        if 'width' in dims and 'height' in dims:
-                            required_dimensions = {
-                                'width': dims['width'],
-                                'height': dims['height'],
-                                'ratio': dims['width'] / dims['height']
-                            }
-                            print(f"Gefundene Druckdimensionen (ImagePrinting): {dims['width']}x{dims['height']}")
-                            break
-                if required_dimensions:
-                    break
+        required_dimensions = find_print_dimensions(data)
         
         if not required_dimensions:
-            safe_messagebox(messagebox.showerror, 
+            safe_messagebox("showerror", 
                 "Fehler", 
                 "Konnte Druckdimensionen nicht ermitteln.\n"
                 "Die Verarbeitung wird abgebrochen."
             )
             return None
         
+        # Bekanntes Produkt? Dann Heizungstyp aus dem Produkt-Memo übernehmen
+        product_id = find_product_identifier(data)
+        svg_path = find_template_svg(extract_dir)
+        template = analyse_svg_template(svg_path) if product_id and svg_path else None
+        memo_dimensions, memo_mismatch = lookup_product_memo(product_id, required_dimensions, template)
+        if memo_dimensions:
+            return memo_dimensions
+        if memo_mismatch:
+            safe_messagebox("showwarning", "Produkt-Memo weicht ab",
+                f"Produkt: {product_id}\n{memo_mismatch}\n\n"
+                "Der Heizungstyp wird neu erkannt und muss bestätigt werden.")
+        
         # 3. NEU: Heizungstyp-Erkennung
         heating_type, heating_specs = detect_heating_type(required_dimensions)
         
         # 4. NEU: Validierung mit Benutzer-Bestätigung
-        if not validate_heating_match(heating_type, heating_specs, required_dimensions):
+        if not validate_heating_match(heating_type, heating_specs, required_dimensions, show_dialog=interactive,
+                                      memo_mismatch=memo_mismatch):
             # Falls Benutzer ablehnt oder kein Match, zeige Empfehlungen
             if heating_type == "Unbekannt":
                 recommendations = get_heating_recommendations(required_dimensions)
@@ -1323,23 +3275,28 @@ def extract_dimensions_and_check_text(extract_dir):
                         rec_text += f"   Verhältnis: {rec_specs['width']/rec_specs['height']:.4f}\n"
                         rec_text += f"   Abweichung: {deviation:.4f}\n\n"
                     
-                    safe_messagebox(messagebox.showinfo, "Empfehlungen", rec_text)
+                    safe_messagebox("showinfo", "Empfehlungen", rec_text)
             
             return None  # Abbruch der Verarbeitung
         
         # 5. Erweitere Dimensions um Heizungsinfo
         required_dimensions['heating_type'] = heating_type
         required_dimensions['heating_specs'] = heating_specs
+
+        # Nur vom Bediener (bzw. auto_confirm) bestätigte Zuordnungen merken
+        if interactive:
+            remember_product(product_id, required_dimensions, template, mismatch=memo_mismatch)
         
         return required_dimensions
         
     except Exception as e:
-        safe_messagebox(messagebox.showerror, "Fehler", f"JSON-Verarbeitung fehlgeschlagen: {str(e)}")
+        safe_messagebox("showerror", "Fehler", f"JSON-Verarbeitung fehlgeschlagen: {str(e)}")
         return None
 
 def check_and_correct_aspect_ratio(tiff_path, target_ratio, tolerance=0.01):
     """Überprüft und korrigiert das Bildverhältnis der TIFF-Datei"""
     try:
+        load_render_libs()
         img = Image.open(tiff_path)
         current_width, current_height = img.size
         current_ratio = current_width / current_height
@@ -1391,24 +3348,144 @@ def check_and_correct_aspect_ratio(tiff_path, target_ratio, tolerance=0.01):
         print(f"Fehler bei der Bildkorrektur: {e}")
         return False
 
+# === Spekulatives Rendern während der Heizungstyp-Rückfrage ===
+# Während der Bediener den Heizungstyp bestätigt, wird die TIFF bereits in einem
+# eigenen temporären Ordner gerendert (auch die modifizierte SVG liegt dort, damit
+# ein abgebrochener Lauf einen erneuten Scan derselben Bestellung nicht stört).
+# Bestätigen übernimmt sie sofort, Ablehnen verwirft sie.
+
+def speculation_worthwhile(extract_dir, order_number, image_path, svg_path):
+    """
+    Nur spekulativ rendern, wenn tatsächlich eine Rückfrage erscheint und das
+    Ergebnis nicht schon feststeht (Produkt-Memo, identische Position gerendert).
+    """
+    if _headless["enabled"] or getattr(_dialog_state, "quiet", False):
+        return False
+    try:
+        json_files = [f for f in os.listdir(extract_dir) if f.lower().endswith('.json')]
+        if not json_files:
+            return False
+        with open(os.path.join(extract_dir, json_files[0]), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        print_dimensions = find_print_dimensions(data)
+        if not print_dimensions:
+            return False
+
+        product_id = find_product_identifier(data)
+        template = analyse_svg_template(svg_path) if product_id else None
+        if lookup_product_memo(product_id, print_dimensions, template)[0]:
+            return False
+
+        heating_type, heating_specs = detect_heating_type(print_dimensions)
+        if not heating_specs:
+            return False  # Unbekannt/Fehler: es wird ohnehin nicht gerendert
+        dedup_key = render_dedup_key(image_path, svg_path, dict(print_dimensions, heating_type=heating_type))
+        return not has_shared_render(order_number, dedup_key)
+    except Exception as e:
+        print(f"Spekulatives Rendern übersprungen: {e}")
+        return False
+
+def _speculative_render_worker(speculation, image_path, svg_path, extract_dir):
+    start = time.perf_counter()
+    _dialog_state.quiet = True  # Fehler meldet später der reguläre Ablauf
+    try:
+        print_dimensions = panel_specs = None
+        json_files = [f for f in os.listdir(extract_dir) if f.lower().endswith('.json')]
+        if json_files:
+            with open(os.path.join(extract_dir, json_files[0]), 'r', encoding='utf-8') as f:
+                print_dimensions = find_print_dimensions(json.load(f))
+        if print_dimensions:
+            panel_specs = detect_heating_type(print_dimensions)[1]
+
+        modified_svg = embed_image_in_svg(image_path, svg_path, panel_specs, speculation["order_number"],
+                                          output_svg_path=os.path.join(speculation["dir"], "modified.svg"))
+        if not modified_svg or speculation["cancel"].is_set():
+            return
+        if not convert_svg_to_tiff(modified_svg, speculation["path"]) or speculation["cancel"].is_set():
+            return
+
+        ratio_ok = True
+        if print_dimensions:
+            ratio_ok = check_and_correct_aspect_ratio(speculation["path"], print_dimensions['ratio'])
+        speculation["ratio_ok"] = ratio_ok
+    except Exception as e:
+        print(f"Spekulatives Rendern fehlgeschlagen: {e}")
+    finally:
+        speculation["seconds"] = time.perf_counter() - start
+        with speculation["lock"]:
+            speculation["done"] = True
+            if speculation["cancel"].is_set():
+                shutil.rmtree(speculation["dir"], ignore_errors=True)
+
+def start_speculative_render(image_path, svg_path, extract_dir, order_number):
+    """Startet das Rendern im Hintergrund, bevor der Heizungstyp bestätigt ist"""
+    import tempfile
+    speculative_dir = tempfile.mkdtemp(prefix="speculative_")
+    speculation = {
+        "dir": speculative_dir,
+        "path": os.path.join(speculative_dir, f"{order_number}.tiff"),
+        "order_number": order_number,
+        "cancel": threading.Event(),
+        "lock": threading.Lock(),
+        "done": False,
+        "ratio_ok": None,
+        "started": time.perf_counter(),
+    }
+    speculation["thread"] = threading.Thread(
+        target=_speculative_render_worker,
+        args=(speculation, image_path, svg_path, extract_dir), daemon=True)
+    speculation["thread"].start()
+    return speculation
+
+def cancel_speculative_render(speculation):
+    """Verwirft das spekulative Ergebnis (wartet nicht auf den Worker)"""
+    with speculation["lock"]:
+        speculation["cancel"].set()
+        if speculation["done"]:
+            shutil.rmtree(speculation["dir"], ignore_errors=True)
+    print("Spekulatives Rendern verworfen")
+
+def commit_speculative_render(speculation, output_path):
+    """
+    Übernimmt das spekulative Ergebnis nach der Bestätigung.
+
+    Returns:
+        bool: Ergebnis der Verhältniskontrolle, None wenn das Rendern fehlschlug
+    """
+    waited = time.perf_counter()
+    speculation["thread"].join()
+    waited = time.perf_counter() - waited
+    if speculation["ratio_ok"] is None or not os.path.exists(speculation["path"]):
+        shutil.rmtree(speculation["dir"], ignore_errors=True)
+        return None
+
+    # Temp-Ordner liegt evtl. auf einem anderen Laufwerk: verschieben statt umbenennen
+    shutil.move(speculation["path"], output_path)
+    backup_path = speculation["path"].replace('.tiff', '_original.tiff')
+    if os.path.exists(backup_path):
+        shutil.move(backup_path, output_path.replace('.tiff', '_original.tiff'))
+    shutil.rmtree(speculation["dir"], ignore_errors=True)
+    record_timing("speculative_render", speculation["seconds"], wait_after_confirm=round(waited, 4))
+    return speculation["ratio_ok"]
+
 # Aktualisierte process_files_to_tiff Funktion
-def process_files_to_tiff(extract_dir, order_number):
-    """Verarbeite SVG und Bilddateien zu TIFF mit korrekter Bilderkennung"""
+def process_files_to_tiff(extract_dir, order_number, dimensions=None, interactive=True):
+    """
+    Verarbeite SVG und Bilddateien zu TIFF mit korrekter Bilderkennung
+
+    Args:
+        dimensions (dict): Bereits ermittelte und bestätigte Dimensionen (überspringt Schritt 3)
+        interactive (bool): False = ohne Dialoge (Render-Server, Batch)
+    """
     try:
+        load_render_libs()
         print(f"=== Starte Dateiverarbeitung für {order_number} ===")
         
         # 1. Finde SVG-Datei
-        svg_file = None
-        for root, dirs, files in os.walk(extract_dir):
-            for file in files:
-                if file.lower().endswith('.svg'):
-                    svg_file = os.path.join(root, file)
-                    break
-            if svg_file:
-                break
+        svg_file = find_template_svg(extract_dir)
         
         if not svg_file:
-            safe_messagebox(messagebox.showerror, "Fehler", "Keine SVG-Datei gefunden")
+            safe_messagebox("showerror", "Fehler", "Keine SVG-Datei gefunden")
             return None
         
         # 2. NEUE LOGIK: Extrahiere korrekten Bildnamen aus JSON
@@ -1429,7 +3506,7 @@ def process_files_to_tiff(extract_dir, order_number):
                         image_files.append(os.path.join(root, file))
             
             if not image_files:
-                safe_messagebox(messagebox.showerror, "Fehler", "Keine Bilddateien gefunden")
+                safe_messagebox("showerror", "Fehler", "Keine Bilddateien gefunden")
                 return None
             
             target_image_file = max(image_files, key=lambda f: os.path.getsize(f))
@@ -1438,103 +3515,349 @@ def process_files_to_tiff(extract_dir, order_number):
         print(f"🎯 Verwende Bilddatei: {os.path.basename(target_image_file)}")
         
         # 3. Extrahiere Dimensionen und Heizungstyp
-        dimensions = extract_dimensions_and_check_text(extract_dir)
+        #    Während die Rückfrage offen ist, wird bereits spekulativ gerendert
+        speculation = None
+        if dimensions is None:
+            preview_window = None
+            if interactive and speculation_worthwhile(extract_dir, order_number, target_image_file, svg_file):
+                speculation = start_speculative_render(target_image_file, svg_file, extract_dir, order_number)
+            if interactive and preview_window_available():
+                # Vorschau nur, wenn sie während der Rückfrage auch gezeigt wird
+                preview_path = render_preview(target_image_file, svg_file,
+                                              os.path.join(extract_dir, f"{order_number}_preview.png"), order_number)
+                preview_window = open_preview_window(preview_path, f"Vorschau {order_number}")
+            try:
+                dimensions = extract_dimensions_and_check_text(extract_dir, interactive=interactive)
+            finally:
+                close_preview_window(preview_window)
         if not dimensions:  # Wenn keine Dimensionen gefunden wurden oder Benutzer abgebrochen
+            if speculation:
+                cancel_speculative_render(speculation)
             return None  # Verarbeitung abbrechen
         
-        # 4. Verarbeite Bild
-        modified_svg = embed_image_in_svg(target_image_file, svg_file)
-        if not modified_svg:
-            return None
-        
-        # 5. Konvertiere zu TIFF
+        # Identische Position dieser Bestellung bereits gerendert? Dann Ergebnis teilen
         output_path = os.path.join(extract_dir, f"{order_number}.tiff")
-        if not convert_svg_to_tiff(modified_svg, output_path):
-            return None
+        dedup_key = render_dedup_key(target_image_file, svg_file, dimensions)
+        shared_tiff = find_shared_render(order_number, dedup_key)
+        if shared_tiff:
+            if speculation:
+                cancel_speculative_render(speculation)
+            link_or_copy(shared_tiff, output_path)
+            print(f"♻️ Identisch mit {os.path.basename(shared_tiff)} - Rendern übersprungen")
+            return output_path
         
-        # 6. Verhältniskontrolle (mit Heizungstyp-Info)
-        if dimensions and 'ratio' in dimensions:
-            print("Führe Verhältniskontrolle durch...")
-            if not check_and_correct_aspect_ratio(output_path, dimensions['ratio']):
-                safe_messagebox(messagebox.showwarning, "Warnung", "Bildverhältnis konnte nicht perfekt korrigiert werden")
+        ratio_ok = commit_speculative_render(speculation, output_path) if speculation else None
+        if ratio_ok is None:
+            # 4. Verarbeite Bild
+            modified_svg = embed_image_in_svg(target_image_file, svg_file,
+                                              dimensions.get('heating_specs'), order_number)
+            if not modified_svg:
+                return None
+            
+            # 5. Konvertiere zu TIFF
+            if not convert_svg_to_tiff(modified_svg, output_path):
+                return None
+            
+            # 6. Verhältniskontrolle (mit Heizungstyp-Info)
+            if dimensions and 'ratio' in dimensions:
+                print("Führe Verhältniskontrolle durch...")
+                ratio_ok = check_and_correct_aspect_ratio(output_path, dimensions['ratio'])
+        if ratio_ok is False:
+            safe_messagebox("showwarning", "Warnung", "Bildverhältnis konnte nicht perfekt korrigiert werden")
         
+        register_shared_render(order_number, dedup_key, output_path)
         return output_path
         
     except Exception as e:
-        safe_messagebox(messagebox.showerror, "Fehler", f"Verarbeitung fehlgeschlagen: {str(e)}")
+        safe_messagebox("showerror", "Fehler", f"Verarbeitung fehlgeschlagen: {str(e)}")
         return None
 
-def embed_image_in_svg(image_path, svg_path):
-    """Ersetzt das Bild innerhalb des clipPath"""
-    try:
-        print(f"=== Bette Bild ein: {image_path} in {svg_path} ===")
-        
-        # Lese SVG-Datei
-        with open(svg_path, "rb") as f:
-            tree = etree.parse(f)
-            root = tree.getroot()
+# === Bild-Dekodierung in benötigter Auflösung ===
+# Handyfotos mit 40+ Megapixeln sind oft deutlich größer als die Platte beim
+# Ziel-DPI braucht. JPEGs werden dann per Draft-Modus (DCT-Skalierung 1/2..1/8)
+# direkt kleiner dekodiert, andere Formate per reduce() verkleinert.
 
-        namespaces = {
-            'svg': 'http://www.w3.org/2000/svg',
-            'xlink': 'http://www.w3.org/1999/xlink'
-        }
+# Absolute SVG-Einheiten in Pixel (CSS: 96 px pro Zoll, so rendert auch cairosvg)
+SVG_UNIT_PX = {"": 1.0, "px": 1.0, "pt": 96 / 72, "pc": 16.0, "mm": 96 / 25.4, "cm": 96 / 2.54, "in": 96.0}
 
-        # Finde das Bild-Element innerhalb des clipPath
-        clip_path_images = root.xpath('//svg:g[@clip-path]//svg:image', namespaces=namespaces)
-        
-        if not clip_path_images:
-            print("Kein Bild im clipPath gefunden, suche nach allen Bildern...")
-            # Fallback: Suche nach allen Bildern
-            all_images = root.xpath('//svg:image', namespaces=namespaces)
-            if all_images:
-                clip_path_images = all_images[:1]  # Nimm das erste Bild
-            else:
-                raise Exception("Keine Bild-Elemente in der SVG gefunden")
-        
-        # Das Ziel-Bild (normalerweise das große Bild)
-        target_image = clip_path_images[0]
-        print(f"Ziel-Bild-Element gefunden: {target_image.get('width')}x{target_image.get('height')}")
+def _svg_length(value):
+    """SVG-Längenangabe in Pixel (None bei Prozent, relativen Einheiten oder fehlendem Wert)"""
+    match = re.fullmatch(r'\s*([-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*([a-zA-Z%]*)\s*', value or "")
+    if not match or match.group(2).lower() not in SVG_UNIT_PX:
+        return None
+    return float(match.group(1)) * SVG_UNIT_PX[match.group(2).lower()]
 
-        # Lade und kodiere das Bild
-        with open(image_path, "rb") as img_file:
-            encoded_string = "data:image/jpeg;base64," + base64.b64encode(img_file.read()).decode('utf-8')
+def needed_image_size(svg_path, panel_specs=None):
+    """
+    Pixel, die das Kundenbild mindestens haben muss:
+    Maximum aus Bild-Slot der Vorlage (Renderauflösung) und Platte bei target_dpi.
 
-        # Setze das neue Bild
-        target_image.set("{http://www.w3.org/1999/xlink}href", encoded_string)
-        print("Bild erfolgreich eingebettet")
+    Returns:
+        tuple: (breite, höhe) oder None, wenn nichts bekannt ist
+    """
+    analysis = analyse_svg_template(svg_path)
+    sizes = []
 
-        # Speichere die modifizierte SVG
-        new_svg_path = os.path.splitext(svg_path)[0] + "_modified.svg"
-        with open(new_svg_path, "wb") as new_svg:
-            new_svg.write(etree.tostring(tree, pretty_print=True, encoding="UTF-8"))
+    slot = analysis["slot"] or {}
+    slot_width, slot_height = _svg_length(slot.get("width")), _svg_length(slot.get("height"))
+    if slot_width and slot_height:
+        # Slot steht in viewBox-Einheiten, gerendert wird in width/height der SVG
+        scale = 1.0
+        svg_width = _svg_length(analysis["width"])
+        if analysis["viewBox"] and svg_width:
+            viewbox_width = float(analysis["viewBox"].replace(",", " ").split()[2])
+            scale = svg_width / viewbox_width if viewbox_width else 1.0
+        sizes.append((slot_width * scale, slot_height * scale))
 
-        print(f"Modifizierte SVG gespeichert: {new_svg_path}")
-        return new_svg_path
+    if panel_specs:
+        target_dpi = get_config_section("quality_settings")["target_dpi"]
+        sizes.append((panel_specs["width"] / 25.4 * target_dpi, panel_specs["height"] / 25.4 * target_dpi))
 
-    except Exception as e:
-        print(f"Fehler bei der Bildeinbettung: {e}")
-        safe_messagebox(messagebox.showerror, "Fehler", f"Bildeinbettung fehlgeschlagen: {str(e)}")
+    if not sizes:
         return None
+    return int(max(size[0] for size in sizes)) + 1, int(max(size[1] for size in sizes)) + 1
 
-def convert_svg_to_tiff(svg_path, output_path):
-    """Konvertiere SVG zu TIFF"""
+def load_image_for_embedding(image_path, needed_size=None, order_number=None):
+    """
+    Liefert die Bilddaten für die SVG - verkleinert dekodiert, wenn die Quelle
+    mindestens doppelt so groß ist wie benötigt. Schlägt das Verkleinern fehl,
+    werden die Originalbytes eingebettet.
+
+    Returns:
+        tuple: (bytes, mime_type)
+    """
+    with open(image_path, "rb") as f:
+        original = f.read()
+    if not needed_size:
+        return original, "image/jpeg"
     try:
-        print(f"=== Konvertiere SVG zu TIFF: {svg_path} -> {output_path} ===")
-        
-        # Temporärer PNG-Pfad
-        png_path = os.path.splitext(output_path)[0] + "_temp.png"
-        
-        # Konvertiere SVG zu PNG
-        cairosvg.svg2png(
-            url=svg_path,
-            write_to=png_path,
-            background_color=None,
-            scale=1.0
-        )
-        print("SVG zu PNG konvertiert")
+        return _reduce_image_for_embedding(original, image_path, needed_size, order_number)
+    except Exception as e:
+        print(f"Warnung: Bild konnte nicht verkleinert werden ({e}) - Original wird eingebettet")
+        return original, "image/jpeg"
 
-        # Öffne PNG und verarbeite es
-        img = Image.open(png_path)
+def _reduce_image_for_embedding(original, image_path, needed_size, order_number):
+    start = time.perf_counter()
+    img = Image.open(io.BytesIO(original))
+    source_width, source_height = img.size
+    bands = len(img.getbands())
+    needed_width, needed_height = needed_size
+    # Bei EXIF-Ausrichtung 5-8 liegen die gespeicherten Pixel um 90° gedreht vor
+    if img.getexif().get(EXIF_ORIENTATION_TAG, 1) in (5, 6, 7, 8):
+        needed_width, needed_height = needed_height, needed_width
+
+    if source_width < 2 * needed_width or source_height < 2 * needed_height:
+        return original, "image/jpeg"
+
+    if img.format == "JPEG":
+        img.draft(img.mode, (needed_width, needed_height))
+        img.load()
+    else:
+        img.load()
+        # reduce() kennt nur 8-Bit-Graustufen/Farbe: Palette (P), 1-Bit, 16-Bit vorher umwandeln
+        if img.mode not in ("RGB", "RGBA", "L", "LA", "CMYK"):
+            has_alpha = "transparency" in img.info or img.mode.endswith("A")
+            img = img.convert("RGBA" if has_alpha else "RGB")
+        factor = min(source_width // needed_width, source_height // needed_height)
+        img = img.reduce(factor)
+    decode_seconds = time.perf_counter() - start
+    if img.size == (source_width, source_height):
+        return original, "image/jpeg"
+
+    # Neu kodieren, EXIF (Ausrichtung) und ICC-Profil bleiben erhalten
+    buffer = io.BytesIO()
+    save_options = {key: img.info[key] for key in ("exif", "icc_profile") if img.info.get(key)}
+    if img.mode in ("RGB", "L", "CMYK"):
+        img.save(buffer, format="JPEG", quality=95, **save_options)
+        mime_type = "image/jpeg"
+    else:
+        img.save(buffer, format="PNG", **save_options)
+        mime_type = "image/png"
+
+    memory_saved_mb = (source_width * source_height - img.width * img.height) * bands / (1024 * 1024)
+    print(f"🗜 Bild verkleinert dekodiert: {source_width}x{source_height} -> {img.width}x{img.height} "
+          f"(benötigt {needed_size[0]}x{needed_size[1]}, {memory_saved_mb:.0f} MB weniger Speicher)")
+    record_timing("image_decode", decode_seconds, order=order_number, image=os.path.basename(image_path),
+                  source=f"{source_width}x{source_height}", decoded=f"{img.width}x{img.height}",
+                  memory_saved_mb=round(memory_saved_mb, 1))
+    return buffer.getvalue(), mime_type
+
+# === Vorschau für die Bediener-Bestätigung ===
+# Kleines PNG der fertigen Komposition (Vorlage + Kundenbild), gerendert aus einem
+# per Draft-Modus dekodierten Thumbnail. Liegt als {order}_preview.png neben der
+# TIFF und wird während der Heizungstyp-Rückfrage in einem eigenen Fenster gezeigt.
+# Ohne GUI (Render-Server, Hot-Folder, Batch) wird keine Vorschau gerendert.
+
+def render_preview(image_path, svg_path, preview_path, order_number=None):
+    """
+    Rendert die Vorschau (aus dem Cache, wenn neuer als Bild und Vorlage)
+
+    Returns:
+        str: Pfad der Vorschau oder None
+    """
+    settings = get_config_section("preview")
+    if not settings["enabled"]:
+        return None
+    try:
+        if (os.path.exists(preview_path) and
+                os.path.getmtime(preview_path) >= max(os.path.getmtime(image_path), os.path.getmtime(svg_path))):
+            return preview_path
+
+        start = time.perf_counter()
+        load_render_libs()
+        template = get_svg_template(svg_path)
+        if not template["slot_path"]:
+            return None
+        max_size = settings["max_size"]
+
+        # Kundenbild nur in Vorschaugröße dekodieren
+        img = Image.open(image_path)
+        img.draft("RGB", (max_size, max_size))
+        exif = img.info.get("exif")
+        img.thumbnail((max_size, max_size))
+        buffer = io.BytesIO()
+        if img.mode in ("RGBA", "LA", "P"):
+            img.save(buffer, format="PNG")
+            mime_type = "image/png"
+        else:
+            img.convert("RGB").save(buffer, format="JPEG", quality=80, **({"exif": exif} if exif else {}))
+            mime_type = "image/jpeg"
+
+        tree = copy.deepcopy(template["tree"])
+        tree.xpath(template["slot_path"])[0].set(
+            "{http://www.w3.org/1999/xlink}href",
+            f"data:{mime_type};base64," + base64.b64encode(buffer.getvalue()).decode('utf-8'))
+
+        # Auf max_size skalieren (längste Seite), transparenten Rand wie bei der TIFF abschneiden
+        # Unbekannte Größe (Prozent, relative Einheiten): Breite direkt auf max_size festlegen
+        analysis = template["analysis"]
+        svg_size = [_svg_length(analysis["width"]), _svg_length(analysis["height"])]
+        if all(svg_size):
+            size_options = {"scale": max_size / max(svg_size)}
+        else:
+            size_options = {"output_width": max_size}
+        png_bytes = cairosvg.svg2png(bytestring=etree.tostring(tree), background_color=None, **size_options)
+        preview = Image.open(io.BytesIO(png_bytes))
+        if preview.mode in ("RGBA", "LA") and preview.getbbox():
+            preview = preview.crop(preview.getbbox())
+        preview.thumbnail((max_size, max_size))
+        preview.save(preview_path + ".part", format="PNG")
+        os.replace(preview_path + ".part", preview_path)
+
+        record_timing("preview_render", time.perf_counter() - start, order=order_number,
+                      size=f"{preview.width}x{preview.height}")
+        return preview_path
+    except Exception as e:
+        print(f"Vorschau konnte nicht erstellt werden: {e}")
+        return None
+
+def preview_window_available():
+    """True, wenn ein Vorschaufenster gezeigt werden kann (GUI läuft, keine stillen Dialoge)"""
+    return tk is not None and bool(tk._default_root) and not _headless["enabled"] and not getattr(_dialog_state, "quiet", False)
+
+def open_preview_window(preview_path, title):
+    """
+    Zeigt die Vorschau in einem nicht-modalen Fenster (im GUI-Thread)
+
+    Returns:
+        dict: Handle für close_preview_window oder None (ohne GUI)
+    """
+    if not preview_path or not preview_window_available():
+        return None
+    root = tk._default_root
+    handle = {"window": None, "closed": False}
+
+    def _open():
+        if handle["closed"]:
+            return
+        window = tk.Toplevel(root)
+        window.title(title)
+        window.attributes("-topmost", True)
+        photo = tk.PhotoImage(file=preview_path)
+        label = tk.Label(window, image=photo)
+        label.image = photo  # Referenz halten, sonst räumt Tk das Bild weg
+        label.pack(padx=10, pady=10)
+        handle["window"] = window
+
+    root.after(0, _open)
+    return handle
+
+def close_preview_window(handle):
+    """Schließt das Vorschaufenster"""
+    if not handle:
+        return
+
+    def _close():
+        handle["closed"] = True
+        if handle["window"] is not None:
+            handle["window"].destroy()
+
+    tk._default_root.after(0, _close)
+
+def embed_image_in_svg(image_path, svg_path, panel_specs=None, order_number=None, output_svg_path=None):
+    """
+    Ersetzt das Bild innerhalb des clipPath
+
+    Args:
+        panel_specs (dict): Heizplatte (mm) - bestimmt die benötigte Bildauflösung
+        output_svg_path (str): Ziel der modifizierten SVG (Standard: <svg>_modified.svg)
+    """
+    try:
+        load_render_libs()
+        print(f"=== Bette Bild ein: {image_path} in {svg_path} ===")
+        
+        # Vorlage aus dem Cache (geparst und analysiert), Kopie zum Bearbeiten
+        template = get_svg_template(svg_path)
+        if not template["slot_path"]:
+            raise Exception("Keine Bild-Elemente in der SVG gefunden")
+        tree = copy.deepcopy(template["tree"])
+
+        # Das Ziel-Bild (normalerweise das große Bild im clipPath)
+        target_image = tree.xpath(template["slot_path"])[0]
+        print(f"Ziel-Bild-Element gefunden: {target_image.get('width')}x{target_image.get('height')}")
+
+        # Lade das Bild (nur so groß wie benötigt) und kodiere es
+        image_bytes, mime_type = load_image_for_embedding(
+            image_path, needed_image_size(svg_path, panel_specs), order_number)
+        encoded_string = f"data:{mime_type};base64," + base64.b64encode(image_bytes).decode('utf-8')
+
+        # Setze das neue Bild
+        target_image.set("{http://www.w3.org/1999/xlink}href", encoded_string)
+        print("Bild erfolgreich eingebettet")
+
+        # Speichere die modifizierte SVG
+        new_svg_path = output_svg_path or os.path.splitext(svg_path)[0] + "_modified.svg"
+        with open(new_svg_path, "wb") as new_svg:
+            new_svg.write(etree.tostring(tree, pretty_print=True, encoding="UTF-8"))
+
+        print(f"Modifizierte SVG gespeichert: {new_svg_path}")
+        return new_svg_path
+
+    except Exception as e:
+        print(f"Fehler bei der Bildeinbettung: {e}")
+        safe_messagebox("showerror", "Fehler", f"Bildeinbettung fehlgeschlagen: {str(e)}")
+        return None
+
+def convert_svg_to_tiff(svg_path, output_path):
+    """Konvertiere SVG zu TIFF"""
+    try:
+        load_render_libs()
+        print(f"=== Konvertiere SVG zu TIFF: {svg_path} -> {output_path} ===")
+        
+        # Temporärer PNG-Pfad
+        png_path = os.path.splitext(output_path)[0] + "_temp.png"
+        
+        # Konvertiere SVG zu PNG
+        cairosvg.svg2png(
+            url=svg_path,
+            write_to=png_path,
+            background_color=None,
+            scale=1.0
+        )
+        print("SVG zu PNG konvertiert")
+
+        # Öffne PNG und verarbeite es
+        img = Image.open(png_path)
         print(f"PNG geöffnet: {img.size}, Modus: {img.mode}")
         
         # Entferne Transparenz durch Cropping
@@ -1546,25 +3869,1388 @@ def convert_svg_to_tiff(svg_path, output_path):
             else:
                 print("Warnung: Bild enthält nur transparente Pixel")
 
-        # Speichere als TIFF
-        img.save(output_path, format="TIFF", compression="tiff_deflate")
-        print(f"TIFF gespeichert: {output_path}")
-        
-        # Lösche temporäre Dateien
-        try:
-            os.remove(png_path)
-            os.remove(svg_path)  # Lösche die modifizierte SVG
-            print("Temporäre Dateien gelöscht")
-        except Exception as e:
-            print(f"Warnung: Temporäre Dateien konnten nicht gelöscht werden: {e}")
+        # Speichere als TIFF
+        img.save(output_path, format="TIFF", compression="tiff_deflate")
+        print(f"TIFF gespeichert: {output_path}")
+        
+        # Lösche temporäre Dateien
+        try:
+            os.remove(png_path)
+            os.remove(svg_path)  # Lösche die modifizierte SVG
+            print("Temporäre Dateien gelöscht")
+        except Exception as e:
+            print(f"Warnung: Temporäre Dateien konnten nicht gelöscht werden: {e}")
+
+        return True
+
+    except Exception as e:
+        print(f"Fehler bei der TIFF-Konvertierung: {e}")
+        safe_messagebox("showerror", "Fehler", f"Konvertierung fehlgeschlagen: {str(e)}")
+        return False
+
+# === Job-Journal (SQLite) ===
+# Hält für jede Bestellposition die zuletzt abgeschlossene Stufe fest:
+# queued -> downloaded (ZIP-Pfad + Hash) -> rendered (TIFF-Pfad) -> delivered
+# (bzw. imposed, wenn die Platte auf einem Sammelbogen ausgeschossen wurde).
+# Nach einem Absturz wird ab der letzten abgeschlossenen Stufe weitergemacht.
+# Eskalierte Rückfragen (auto_confirm) stehen als "review" auf der Prüfliste.
+
+JOB_JOURNAL_DB = os.path.join(BASE_DIR, "job_journal.sqlite3")
+JOURNAL_ZIP_DIR = os.path.join(DOWNLOAD_DIR, "_journal_zips")
+JOURNAL_STAGES = ("queued", "downloaded", "rendered", "delivered", "imposed")
+_journal_lock = threading.Lock()
+
+def _journal_connect():
+    connection = sqlite3.connect(JOB_JOURNAL_DB, timeout=10)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("""CREATE TABLE IF NOT EXISTS jobs (
+        job_key TEXT PRIMARY KEY,
+        order_number TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        zip_path TEXT,
+        zip_sha256 TEXT,
+        tiff_path TEXT,
+        error TEXT,
+        updated TEXT NOT NULL)""")
+    connection.execute("""CREATE TABLE IF NOT EXISTS job_events (
+        job_key TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        details TEXT)""")
+    # Ältere Journale: Spalte für den Render-Einstellungs-Fingerabdruck nachrüsten
+    if "settings_fingerprint" not in [row["name"] for row in connection.execute("PRAGMA table_info(jobs)")]:
+        connection.execute("ALTER TABLE jobs ADD COLUMN settings_fingerprint TEXT")
+    return connection
+
+def journal_record(job_key, stage, **fields):
+    """
+    Schreibt einen Stufenwechsel ins Journal (job_key = Bestellnummer oder <order>_posN).
+    Nicht übergebene Felder behalten ihren bisherigen Wert.
+    """
+    now = datetime.now().isoformat()
+    columns = {key: fields[key] for key in ("zip_path", "zip_sha256", "tiff_path", "error", "settings_fingerprint")
+               if key in fields}
+    try:
+        with _journal_lock:
+            connection = _journal_connect()
+            try:
+                with connection:
+                    connection.execute(
+                        "INSERT INTO jobs (job_key, order_number, stage, updated) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(job_key) DO UPDATE SET stage = excluded.stage, updated = excluded.updated",
+                        (job_key, job_key.split("_pos")[0], stage, now))
+                    for column, value in columns.items():
+                        connection.execute(f"UPDATE jobs SET {column} = ? WHERE job_key = ?", (value, job_key))
+                    connection.execute("INSERT INTO job_events VALUES (?, ?, ?, ?)",
+                                       (job_key, stage, now, json.dumps(columns, ensure_ascii=False)))
+            finally:
+                connection.close()
+    except Exception as e:
+        print(f"Warnung: Job-Journal konnte nicht geschrieben werden: {e}")
+
+def journal_get(job_key):
+    """Liefert den Journal-Eintrag einer Position als dict (oder None)"""
+    try:
+        with _journal_lock:
+            connection = _journal_connect()
+            try:
+                row = connection.execute("SELECT * FROM jobs WHERE job_key = ?", (job_key,)).fetchone()
+            finally:
+                connection.close()
+        return dict(row) if row else None
+    except Exception as e:
+        print(f"Warnung: Job-Journal konnte nicht gelesen werden: {e}")
+        return None
+
+def journal_jobs_in_stage(stage):
+    """Alle Journal-Einträge, deren letzte abgeschlossene Stufe stage ist"""
+    try:
+        with _journal_lock:
+            connection = _journal_connect()
+            try:
+                rows = connection.execute("SELECT * FROM jobs WHERE stage = ? ORDER BY updated", (stage,)).fetchall()
+            finally:
+                connection.close()
+        return [dict(row) for row in rows]
+    except Exception as e:
+        print(f"Warnung: Job-Journal konnte nicht gelesen werden: {e}")
+        return []
+
+def journal_completed_tiff(job_key, zip_sha256=None):
+    """
+    TIFF-Pfad, falls die Position laut Journal schon gerendert wurde, die Datei
+    noch existiert und mit den aktuellen Render-Einstellungen entstanden ist
+    (optional nur für dieselbe ZIP).
+    """
+    job = journal_get(job_key)
+    if not job or job["stage"] not in ("rendered", "delivered", "imposed"):
+        return None
+    if job.get("settings_fingerprint") != render_settings_fingerprint():
+        print(f"{job_key}: Render-Einstellungen geändert - Journal-Ergebnis wird nicht übernommen")
+        return None
+    if zip_sha256 and job["zip_sha256"] and job["zip_sha256"] != zip_sha256:
+        return None
+    if job["tiff_path"] and os.path.exists(job["tiff_path"]):
+        return job["tiff_path"]
+    return None
+
+def journal_downloaded_zip(job_key):
+    """ZIP-Pfad, falls die Position heruntergeladen, aber noch nicht gerendert wurde"""
+    job = journal_get(job_key)
+    if job and job["stage"] == "downloaded" and job["zip_path"] and os.path.exists(job["zip_path"]):
+        return job["zip_path"]
+    return None
+
+def journal_resumable_jobs():
+    """Positionen, die vor einem Absturz heruntergeladen, aber nicht mehr gerendert wurden"""
+    return [job for job in journal_jobs_in_stage("downloaded")
+            if not job["error"] and job["zip_path"] and os.path.exists(job["zip_path"])]
+
+def resume_downloaded_jobs():
+    """
+    Rendert alle unterbrochenen Positionen aus der bereits vorhandenen ZIP.
+
+    Returns:
+        tuple: (erfolgreich, fehlgeschlagen)
+    """
+    succeeded = failed = 0
+    for job in journal_resumable_jobs():
+        print(f"Setze {job['job_key']} nach Abbruch fort (ZIP bereits vorhanden)")
+        if process_downloaded_zip(job["job_key"], zip_path=job["zip_path"]):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+# === Auslieferung an den RIP-Hot-Folder ===
+# Fertige TIFFs werden im Hintergrund in die Zielordner aus delivery.destinations
+# kopiert: erst als .part, nach SHA-256-Vergleich per Umbenennen sichtbar. Ein
+# abgebrochener Transfer setzt beim nächsten Versuch am Ende der .part fort.
+# Offene Auslieferungen stehen im Job-Journal (Stufe rendered, Fehler "Auslieferung ...").
+
+DELIVERY_PENDING = "Auslieferung ausstehend"
+_delivery = {"pool": None, "pending": set(), "stats": {"files": 0, "bytes": 0, "seconds": 0.0, "failed": 0}}
+_delivery_lock = threading.Lock()
+
+def _copy_resumable(source_path, target_path, source_sha256, chunk_size):
+    """
+    Kopiert nach target_path.part (ab dessen Ende), prüft die Prüfsumme und benennt um.
+
+    Returns:
+        tuple: (kopierte Bytes, übernommene Bytes aus einem früheren Versuch)
+    """
+    part_path = target_path + ".part"
+    total = os.path.getsize(source_path)
+    resumed = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if resumed > total:
+        os.remove(part_path)
+        resumed = 0
+
+    with open(source_path, "rb") as source, open(part_path, "ab") as target:
+        source.seek(resumed)
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            target.write(chunk)
+        target.flush()
+        os.fsync(target.fileno())
+
+    if file_sha256(part_path) != source_sha256:
+        os.remove(part_path)  # nächster Versuch beginnt von vorn
+        raise IOError("Prüfsumme der Kopie stimmt nicht")
+    os.replace(part_path, target_path)
+    return total - resumed, resumed
+
+def deliver_tiff(job_key, tiff_path, destination, source_sha256=None):
+    """Kopiert eine TIFF in einen Zielordner (mit Wiederholungen). Returns: bool"""
+    settings = get_config_section("delivery")
+    target_path = os.path.join(destination, os.path.basename(tiff_path))
+    source_sha256 = source_sha256 or file_sha256(tiff_path)
+
+    if (os.path.exists(target_path) and os.path.getsize(target_path) == os.path.getsize(tiff_path)
+            and file_sha256(target_path) == source_sha256):
+        print(f"📤 {job_key}: bereits in {destination}")
+        return True
+
+    for attempt in range(1, settings["retries"] + 1):
+        start = time.perf_counter()
+        try:
+            os.makedirs(destination, exist_ok=True)
+            copied, resumed = _copy_resumable(tiff_path, target_path, source_sha256,
+                                              int(settings["chunk_mb"] * 1024 * 1024))
+        except OSError as e:
+            print(f"⚠️ Auslieferung {job_key} -> {destination} (Versuch {attempt}): {e}")
+            if attempt < settings["retries"]:
+                time.sleep(settings["retry_delay"] * attempt)
+            continue
+
+        seconds = time.perf_counter() - start
+        megabytes = copied / (1024 * 1024)
+        throughput = megabytes / seconds if seconds else 0.0
+        with _delivery_lock:
+            stats = _delivery["stats"]
+            stats["files"] += 1
+            stats["bytes"] += copied
+            stats["seconds"] += seconds
+        print(f"📤 {job_key} -> {destination}: {megabytes:.1f} MB in {seconds:.1f}s ({throughput:.1f} MB/s)")
+        record_timing("delivery", seconds, order=job_key, destination=destination,
+                      mb=round(megabytes, 1), mb_per_s=round(throughput, 1),
+                      resumed_mb=round(resumed / (1024 * 1024), 1), attempt=attempt)
+        return True
+
+    with _delivery_lock:
+        _delivery["stats"]["failed"] += 1
+    return False
+
+def _delivery_job(job_key, tiff_path, destinations):
+    source_sha256 = file_sha256(tiff_path)
+    failed = [destination for destination in destinations
+              if not deliver_tiff(job_key, tiff_path, destination, source_sha256)]
+    if failed:
+        journal_record(job_key, "rendered", error=f"Auslieferung fehlgeschlagen: {', '.join(failed)}")
+        return False
+    journal_record(job_key, "delivered", error=None)
+    return True
+
+def queue_delivery(job_key, tiff_path, allow_imposition=True):
+    """
+    Stellt eine fertige TIFF in die Auslieferungs-Warteschlange (delivery.workers parallel).
+
+    Args:
+        allow_imposition (bool): False = nie auf den Sammelbogen verschieben (Bögen selbst)
+
+    Returns:
+        Future oder None, wenn keine Auslieferung konfiguriert ist
+    """
+    settings = get_config_section("delivery")
+    if not settings["enabled"] or not settings["destinations"]:
+        return None
+    if allow_imposition and get_config_section("imposition")["enabled"] and imposition_panel(tiff_path):
+        print(f"📤 {job_key}: wird mit dem nächsten Sammelbogen ausgeliefert")
+        return None
+    from concurrent.futures import ThreadPoolExecutor
+
+    journal_record(job_key, "rendered", error=DELIVERY_PENDING)
+    with _delivery_lock:
+        if _delivery["pool"] is None:
+            _delivery["pool"] = ThreadPoolExecutor(max_workers=max(1, settings["workers"]),
+                                                   thread_name_prefix="delivery")
+        future = _delivery["pool"].submit(_delivery_job, job_key, tiff_path, list(settings["destinations"]))
+        _delivery["pending"].add(future)
+    future.add_done_callback(lambda done: _delivery["pending"].discard(done))
+    return future
+
+def queue_restored_deliveries(tiff_paths):
+    """Liefert aus dem Cache wiederhergestellte TIFFs aus (bereits ausgelieferte nicht erneut)"""
+    for tiff_path in tiff_paths:
+        job_key = os.path.splitext(os.path.basename(tiff_path))[0]
+        job = journal_get(job_key)
+        if job and job["stage"] == "delivered":
+            print(f"📤 {job_key}: bereits ausgeliefert")
+            continue
+        journal_record(job_key, "rendered", tiff_path=tiff_path, error=None,
+                       settings_fingerprint=render_settings_fingerprint())
+        queue_delivery(job_key, tiff_path)
+
+def resume_pending_deliveries():
+    """Stellt abgebrochene oder fehlgeschlagene Auslieferungen aus dem Journal erneut ein"""
+    jobs = [job for job in journal_jobs_in_stage("rendered")
+            if (job["error"] or "").startswith("Auslieferung")
+            and job["tiff_path"] and os.path.exists(job["tiff_path"])]
+    for job in jobs:
+        print(f"📤 Setze Auslieferung von {job['job_key']} fort")
+        queue_delivery(job["job_key"], job["tiff_path"])
+    return len(jobs)
+
+def wait_for_deliveries():
+    """Wartet, bis alle eingestellten Auslieferungen fertig sind"""
+    from concurrent.futures import wait
+    with _delivery_lock:
+        pending = list(_delivery["pending"])
+    if pending:
+        print(f"Warte auf {len(pending)} Auslieferung(en)...")
+        wait(pending)
+
+def delivery_stats():
+    """Bisherige Auslieferungen: Dateien, MB, Durchsatz, Fehlschläge"""
+    with _delivery_lock:
+        stats = dict(_delivery["stats"])
+    megabytes = stats["bytes"] / (1024 * 1024)
+    return {
+        "files": stats["files"],
+        "mb": round(megabytes, 1),
+        "mb_per_s": round(megabytes / stats["seconds"], 1) if stats["seconds"] else None,
+        "failed": stats["failed"],
+    }
+
+# === TIFF-Ergebnis-Cache (inhaltsadressiert) ===
+# Schlüssel = SHA-256 über die Anpassungs-ZIP und die Render-Einstellungen.
+# Der Index ordnet zusätzlich Bestellnummer/Position dem Schlüssel zu, damit ein
+# erneuter Scan derselben Bestellung ohne Download und Rendern auskommt.
+
+RESULT_CACHE_DIR = os.path.join(BASE_DIR, "tiff_cache")
+RESULT_CACHE_INDEX = os.path.join(RESULT_CACHE_DIR, "index.json")
+RESULT_CACHE_VERSION = 1  # erhöhen, wenn sich die Render-Pipeline ändert
+_result_cache_lock = threading.RLock()
+
+def file_sha256(path):
+    """SHA-256 einer Datei (in 1-MB-Blöcken gelesen)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def render_settings_fingerprint():
+    """Fingerabdruck der Einstellungen, die das Render-Ergebnis beeinflussen"""
+    config = load_config()
+    settings = {
+        "version": RESULT_CACHE_VERSION,
+        "heating_panels": config.get("heating_panels", {}),
+        "quality_settings": get_config_section("quality_settings"),
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+def result_cache_key(zip_path, zip_sha256=None):
+    """Cache-Schlüssel für eine Anpassungs-ZIP (None wenn der Cache deaktiviert ist)"""
+    if not get_config_section("result_cache")["enabled"]:
+        return None
+    return hashlib.sha256(f"{zip_sha256 or file_sha256(zip_path)}:{render_settings_fingerprint()}".encode("utf-8")).hexdigest()
+
+def link_or_copy(src, dst):
+    """Legt dst als Hardlink auf src an, bei Bedarf (anderes Laufwerk, FAT) als Kopie"""
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def _load_result_cache_index():
+    try:
+        with open(RESULT_CACHE_INDEX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    index.setdefault("entries", {})
+    index.setdefault("positions", {})
+    index.setdefault("orders", {})
+    return index
+
+def _result_cache_path(cache_key):
+    return os.path.join(RESULT_CACHE_DIR, cache_key[:2], f"{cache_key}.tiff")
+
+def _evict_result_cache(index):
+    """Entfernt die am längsten nicht genutzten Einträge, bis max_size_mb eingehalten ist"""
+    max_bytes = get_config_section("result_cache")["max_size_mb"] * 1024 * 1024
+    entries = index["entries"]
+    total = sum(entry["size"] for entry in entries.values())
+    for cache_key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+        if total <= max_bytes:
+            break
+        total -= entries[cache_key]["size"]
+        del entries[cache_key]
+        try:
+            os.remove(_result_cache_path(cache_key))
+        except OSError:
+            pass
+        print(f"TIFF-Cache: Eintrag {cache_key[:12]} verdrängt")
+    index["positions"] = {pos: key for pos, key in index["positions"].items() if key in entries}
+
+def store_cached_result(cache_key, tiff_path, position_key):
+    """Legt eine fertige TIFF im Cache ab und verknüpft sie mit Bestellnummer/Position"""
+    if not cache_key:
+        return
+    try:
+        with _result_cache_lock:
+            cache_path = _result_cache_path(cache_key)
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            if not os.path.exists(cache_path):
+                shutil.copy2(tiff_path, cache_path + ".part")
+                os.replace(cache_path + ".part", cache_path)
+            index = _load_result_cache_index()
+            index["entries"][cache_key] = {"size": os.path.getsize(cache_path), "last_used": time.time()}
+            index["positions"][position_key] = cache_key
+            _evict_result_cache(index)
+            atomic_write_json(RESULT_CACHE_INDEX, index)
+    except Exception as e:
+        print(f"Warnung: TIFF konnte nicht im Cache abgelegt werden: {e}")
+
+def restore_cached_result(cache_key, position_key):
+    """
+    Stellt eine TIFF aus dem Cache unter DOWNLOAD_DIR/<position_key>/<position_key>.tiff bereit.
+
+    Returns:
+        str: Pfad der TIFF oder None bei Cache-Miss
+    """
+    if not cache_key:
+        return None
+    with _result_cache_lock:
+        index = _load_result_cache_index()
+        cache_path = _result_cache_path(cache_key)
+        if cache_key not in index["entries"] or not os.path.exists(cache_path):
+            return None
+        output_dir = os.path.join(DOWNLOAD_DIR, position_key)
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, f"{position_key}.tiff")
+        link_or_copy(cache_path, output_path)
+        index["entries"][cache_key]["last_used"] = time.time()
+        index["positions"][position_key] = cache_key
+        atomic_write_json(RESULT_CACHE_INDEX, index)
+    return output_path
+
+def remember_order_positions(order_number, position_keys):
+    """Merkt sich, welche Positionen eine vollständig verarbeitete Bestellung hatte"""
+    if not get_config_section("result_cache")["enabled"]:
+        return
+    try:
+        with _result_cache_lock:
+            index = _load_result_cache_index()
+            index["orders"][order_number] = {"positions": list(position_keys), "completed": time.time(),
+                                             "settings_fingerprint": render_settings_fingerprint()}
+            atomic_write_json(RESULT_CACHE_INDEX, index)
+    except Exception as e:
+        print(f"Warnung: Bestellindex konnte nicht gespeichert werden: {e}")
+
+def restore_cached_order(order_number):
+    """
+    Stellt alle TIFFs einer bereits verarbeiteten Bestellung aus dem Cache wieder her.
+
+    Returns:
+        list: Pfade der TIFFs oder None, wenn nicht alle Positionen im Cache liegen
+              oder die Render-Einstellungen sich seitdem geändert haben
+    """
+    if not get_config_section("result_cache")["enabled"]:
+        return None
+    start = time.perf_counter()
+    with _result_cache_lock:
+        index = _load_result_cache_index()
+        order = index["orders"].get(order_number)
+        if not order:
+            return None
+        if order.get("settings_fingerprint") != render_settings_fingerprint():
+            print(f"TIFF-Cache: Render-Einstellungen geändert, {order_number} wird neu gerendert")
+            return None
+        cache_keys = [index["positions"].get(position_key) for position_key in order["positions"]]
+        if not all(cache_keys):
+            return None
+        restored = []
+        for position_key, cache_key in zip(order["positions"], cache_keys):
+            tiff_path = restore_cached_result(cache_key, position_key)
+            if not tiff_path:
+                return None
+            restored.append(tiff_path)
+    record_timing("result_cache_order_hit", time.perf_counter() - start,
+                  order=order_number, positions=len(restored))
+    return restored
+
+# === SVG-Vorlagen-Cache ===
+# Vorlagen sind für alle Bestellungen desselben Produkts identisch. Geparster
+# Baum und Analyse (Geometrie-Hash, Bild-Slot) werden daher nach SHA-256 der
+# SVG-Bytes zwischengespeichert; pro Auftrag wird nur noch das Bild getauscht.
+
+SVG_NAMESPACES = {
+    'svg': 'http://www.w3.org/2000/svg',
+    'xlink': 'http://www.w3.org/1999/xlink'
+}
+_template_cache = OrderedDict()
+_template_cache_lock = threading.Lock()
+_template_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+def _parse_svg_template(svg_bytes):
+    """Parst eine Vorlage und ermittelt Geometrie-Hash und Bild-Slot"""
+    tree = etree.parse(io.BytesIO(svg_bytes))
+    root = tree.getroot()
+
+    digest = hashlib.sha256()
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            continue
+        attributes = {key: value for key, value in element.attrib.items()
+                      if not key.endswith("href")}
+        digest.update(element.tag.encode("utf-8"))
+        digest.update(json.dumps(attributes, sort_keys=True).encode("utf-8"))
+
+    # Bild innerhalb des clipPath, sonst das erste Bild überhaupt
+    slot_images = (root.xpath('//svg:g[@clip-path]//svg:image', namespaces=SVG_NAMESPACES)
+                   or root.xpath('//svg:image', namespaces=SVG_NAMESPACES))
+    slot = slot_path = None
+    if slot_images:
+        slot_path = tree.getpath(slot_images[0])
+        slot = {key: slot_images[0].get(key) for key in ("x", "y", "width", "height", "transform")
+                if slot_images[0].get(key) is not None}
+        clip_groups = [ancestor for ancestor in slot_images[0].iterancestors() if ancestor.get("clip-path")]
+        if clip_groups:
+            slot["clip-path"] = clip_groups[0].get("clip-path")
+
+    analysis = {
+        "template_hash": digest.hexdigest(),
+        "width": root.get("width"),
+        "height": root.get("height"),
+        "viewBox": root.get("viewBox"),
+        "slot": slot,
+    }
+    return {"tree": tree, "slot_path": slot_path, "analysis": analysis}
+
+def get_svg_template(svg_path):
+    """
+    Liefert die geparste und analysierte Vorlage aus dem Cache (LRU).
+    Der Baum darf nicht verändert werden - für Änderungen copy.deepcopy verwenden.
+
+    Returns:
+        dict: tree, slot_path (XPath des Bild-Slots), analysis
+    """
+    load_render_libs()
+    with open(svg_path, "rb") as f:
+        svg_bytes = f.read()
+    key = hashlib.sha256(svg_bytes).hexdigest()
+
+    with _template_cache_lock:
+        template = _template_cache.get(key)
+        if template is not None:
+            _template_cache.move_to_end(key)
+            _template_cache_stats["hits"] += 1
+            return template
+
+    start = time.perf_counter()
+    template = _parse_svg_template(svg_bytes)
+    parse_seconds = time.perf_counter() - start
+
+    max_entries = get_config_section("template_cache")["max_entries"]
+    with _template_cache_lock:
+        _template_cache_stats["misses"] += 1
+        _template_cache[key] = template
+        while len(_template_cache) > max_entries:
+            _template_cache.popitem(last=False)
+            _template_cache_stats["evictions"] += 1
+    record_timing("svg_template_parse", parse_seconds, template=key[:12])
+    return template
+
+def template_cache_stats():
+    """Treffer, Fehlschläge, Verdrängungen und Trefferquote des Vorlagen-Caches"""
+    with _template_cache_lock:
+        stats = dict(_template_cache_stats, size=len(_template_cache))
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+    return stats
+
+# === Deduplizierung identischer Positionen ===
+# Gleiches Kundenbild + gleiche Vorlagen-Geometrie + gleiche Heizplatte ergeben
+# dieselbe TIFF. Innerhalb einer Bestellung wird sie nur einmal gerendert und für
+# die übrigen Positionen als Hardlink bzw. Kopie ({order}_posN.tiff) übernommen.
+# Aktiv nur zwischen begin_render_dedup und pop_render_dedup_stats (process_order);
+# Hot-Folder, Render-Server, Prüfliste und Wiederaufnahme legen keine Einträge an.
+
+RENDER_DEDUP_MAX_ORDERS = 32  # Obergrenze, falls ein Aufrufer nicht aufräumt
+_render_dedup = OrderedDict()
+_render_dedup_lock = threading.Lock()
+
+def begin_render_dedup(order_number):
+    """Aktiviert die Deduplizierung für die Positionen einer Bestellung"""
+    with _render_dedup_lock:
+        _render_dedup[_dedup_order_key(order_number)] = {"results": {}, "saved": 0}
+        while len(_render_dedup) > RENDER_DEDUP_MAX_ORDERS:
+            _render_dedup.popitem(last=False)
+
+def _dedup_order_key(order_number):
+    """Bestellnummer ohne _posN-Suffix"""
+    return order_number.split("_pos")[0]
+
+def find_template_svg(extract_dir):
+    """Sucht die SVG-Vorlage (ohne bereits modifizierte Zwischenstände)"""
+    for root, dirs, files in os.walk(extract_dir):
+        for file in files:
+            if file.lower().endswith('.svg') and not file.lower().endswith('_modified.svg'):
+                return os.path.join(root, file)
+    return None
+
+def analyse_svg_template(svg_path):
+    """
+    Analysiert die SVG-Vorlage: Geometrie-Hash (ohne eingebettete Bilddaten),
+    Abmessungen und den Bild-Slot, in den das Kundenbild eingesetzt wird.
+
+    Returns:
+        dict: template_hash, width, height, viewBox, slot
+    """
+    return get_svg_template(svg_path)["analysis"]
+
+def template_geometry_fingerprint(svg_path):
+    """Hash der SVG-Vorlage ohne eingebettete Bilddaten (nur Geometrie und Attribute)"""
+    return analyse_svg_template(svg_path)["template_hash"]
+
+def render_dedup_key(image_path, svg_path, dimensions):
+    """Schlüssel aus Kundenbild, Vorlagen-Geometrie und Zielplatte"""
+    panel = {key: dimensions.get(key) for key in ("width", "height", "heating_type")}
+    parts = [file_sha256(image_path), template_geometry_fingerprint(svg_path),
+             json.dumps(panel, sort_keys=True)]
+    return hashlib.sha256(":".join(parts).encode("utf-8")).hexdigest()
+
+def find_shared_render(order_number, dedup_key):
+    """Liefert die TIFF einer identischen, bereits gerenderten Position derselben Bestellung"""
+    with _render_dedup_lock:
+        state = _render_dedup.get(_dedup_order_key(order_number))
+        tiff_path = state["results"].get(dedup_key) if state else None
+        if tiff_path and os.path.exists(tiff_path):
+            state["saved"] += 1
+            return tiff_path
+    return None
+
+def has_shared_render(order_number, dedup_key):
+    """Wie find_shared_render, zählt aber nicht als eingesparter Renderlauf"""
+    with _render_dedup_lock:
+        state = _render_dedup.get(_dedup_order_key(order_number))
+        tiff_path = state["results"].get(dedup_key) if state else None
+    return bool(tiff_path and os.path.exists(tiff_path))
+
+def register_shared_render(order_number, dedup_key, tiff_path):
+    """Merkt sich eine gerenderte TIFF für weitere Positionen derselben Bestellung"""
+    with _render_dedup_lock:
+        state = _render_dedup.get(_dedup_order_key(order_number))
+        if state is not None:
+            state["results"][dedup_key] = tiff_path
+
+def pop_render_dedup_stats(order_number):
+    """Gibt die Anzahl eingesparter Renderläufe einer Bestellung zurück und vergisst sie"""
+    with _render_dedup_lock:
+        state = _render_dedup.pop(_dedup_order_key(order_number), None)
+    return state["saved"] if state else 0
+
+# === Hot-Folder: manuell heruntergeladene ZIPs ohne Browser verarbeiten ===
+
+def _hot_folder_job_key(zip_path):
+    """
+    Auftragsname aus Dateiname und Inhalts-Hash (z.B. 303-1234567-1234567_pos1_3f2a9c01b7de).
+    Gleichnamige Drops (customization.zip) mit anderem Inhalt bekommen so eigene
+    Ordner, Journal-Einträge und TIFFs.
+    """
+    stem = os.path.splitext(os.path.basename(zip_path))[0]
+    stem = re.sub(r'[^\w.-]+', '_', stem).strip("_") or "hotfolder"
+    return f"{stem}_{file_sha256(zip_path)[:12]}"
+
+def _zip_is_complete(zip_path):
+    """Eine ZIP ist fertig geschrieben, sobald ihr Inhaltsverzeichnis lesbar ist"""
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            return bool(zip_ref.namelist())
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+def process_hot_folder_zip(zip_path, failed_dir):
+    """Übernimmt eine ZIP aus dem Eingangsordner in die Render-Pipeline"""
+    job_key = _hot_folder_job_key(zip_path)
+    os.makedirs(JOURNAL_ZIP_DIR, exist_ok=True)
+    journal_zip = os.path.join(JOURNAL_ZIP_DIR, f"{job_key}.zip")
+    shutil.move(zip_path, journal_zip)
+
+    start = time.perf_counter()
+    success = process_downloaded_zip(job_key, zip_path=journal_zip, interactive=False)
+    record_timing("hot_folder_job", time.perf_counter() - start, order=job_key, success=success)
+    if not success and os.path.exists(journal_zip):
+        os.makedirs(failed_dir, exist_ok=True)
+        shutil.move(journal_zip, os.path.join(failed_dir, os.path.basename(zip_path)))
+        print(f"❌ {job_key}: ZIP nach {failed_dir} verschoben")
+    return success
+
+def watch_hot_folder(inbox=None, workers=None):
+    """
+    Überwacht den Eingangsordner per Dateisystem-Benachrichtigung (watchdog) und
+    rendert neue ZIPs ohne Browser und ohne Dialoge.
+
+    Eine Datei gilt als vollständig, wenn settle_seconds lang kein Schreibereignis
+    mehr kam und ihr ZIP-Inhaltsverzeichnis lesbar ist. Gerendert wird in einem
+    Thread-Pool mit hot_folder.workers Plätzen.
+    """
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        print("❌ Für den Hot-Folder wird das Paket 'watchdog' benötigt (pip install watchdog)")
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    set_headless_mode(True)
+    settings = get_config_section("hot_folder")
+    inbox = os.path.abspath(inbox or os.path.join(BASE_DIR, settings["inbox"]))
+    failed_dir = os.path.join(inbox, settings["failed_subdir"])
+    os.makedirs(inbox, exist_ok=True)
+
+    pool = ThreadPoolExecutor(max_workers=workers or settings["workers"])
+    timers = {}
+    in_flight = set()
+    state_lock = threading.Lock()
+
+    def finish(zip_path, future):
+        with state_lock:
+            in_flight.discard(zip_path)
+        if future.exception():
+            print(f"❌ Fehler bei {os.path.basename(zip_path)}: {future.exception()}")
+
+    def settled(zip_path):
+        with state_lock:
+            timers.pop(zip_path, None)
+            if zip_path in in_flight or not os.path.exists(zip_path):
+                return
+            if not _zip_is_complete(zip_path):
+                # Noch unvollständig: weitere Schreibereignisse stoßen die Prüfung erneut an
+                print(f"… {os.path.basename(zip_path)} noch nicht vollständig")
+                return
+            in_flight.add(zip_path)
+        print(f"📥 Neue ZIP: {os.path.basename(zip_path)}")
+        future = pool.submit(process_hot_folder_zip, zip_path, failed_dir)
+        future.add_done_callback(lambda f: finish(zip_path, f))
+
+    def touch(path):
+        if not path.lower().endswith(".zip") or os.path.dirname(os.path.abspath(path)) != inbox:
+            return
+        with state_lock:
+            if path in timers:
+                timers[path].cancel()
+            timer = threading.Timer(settings["settle_seconds"], settled, args=(path,))
+            timer.daemon = True
+            timers[path] = timer
+            timer.start()
+
+    class InboxHandler(FileSystemEventHandler):
+        def on_created(self, event):
+            if not event.is_directory:
+                touch(event.src_path)
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                touch(event.src_path)
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                touch(event.dest_path)
+
+    observer = Observer()
+    observer.schedule(InboxHandler(), inbox, recursive=False)
+    observer.start()
+    print(f"Hot-Folder aktiv: {inbox} ({settings['workers'] if not workers else workers} Worker) - Strg+C beendet")
+
+    # Bereits vor dem Start abgelegte ZIPs und offene Auslieferungen einmalig übernehmen
+    resume_pending_deliveries()
+    for name in os.listdir(inbox):
+        touch(os.path.join(inbox, name))
+
+    # Kleine Platten im Zeitfenster sammeln und gemeinsam ausschießen
+    imposition = get_config_section("imposition")
+    next_imposition = time.monotonic() + imposition["window_minutes"] * 60
+
+    try:
+        while observer.is_alive():
+            observer.join(1)
+            if imposition["enabled"] and time.monotonic() >= next_imposition:
+                run_imposition()
+                next_imposition = time.monotonic() + imposition["window_minutes"] * 60
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
+        with state_lock:
+            for timer in timers.values():
+                timer.cancel()
+        pool.shutdown(wait=True)
+
+# === Ausschießen: Sammelbogen für kleine Platten ===
+# Fertige TIFFs der Typen aus imposition.panel_types werden gesammelt (Batch oder
+# alle imposition.window_minutes im Hot-Folder-Betrieb) und per MaxRects
+# (Best-Short-Side-Fit, mit Drehung) auf die Bogen-/Rollenbreite gepackt.
+# Jede Platte bekommt Beschnitt (Randpixel gestreckt) und Schnittmarken; pro Bogen
+# entsteht eine TIFF samt Layout-JSON. Ist imposition.enabled gesetzt, werden diese
+# Platten nicht mehr einzeln, sondern nur als Bogen ausgeliefert.
+
+IMPOSITION_DIR = os.path.join(BASE_DIR, "imposition")
+IMPOSITION_INDEX = os.path.join(IMPOSITION_DIR, "index.json")
+
+def imposition_panel(tiff_path, settings=None):
+    """
+    Ordnet eine TIFF anhand ihres Seitenverhältnisses einem Plattentyp aus
+    imposition.panel_types zu (nur Dateikopf wird gelesen).
+
+    Returns:
+        dict: tiff_path, heating_type, width, height (mm, in Ausrichtung der TIFF) oder None
+    """
+    settings = settings or get_config_section("imposition")
+    load_render_libs()
+    try:
+        with Image.open(tiff_path) as img:
+            ratio = img.width / img.height
+    except OSError as e:
+        print(f"Warnung: {tiff_path} nicht lesbar: {e}")
+        return None
+    panels = load_config().get("heating_panels", {})
+    for heating_type in settings["panel_types"]:
+        specs = panels.get(heating_type)
+        if not specs:
+            continue
+        for width, height in ((specs["width"], specs["height"]), (specs["height"], specs["width"])):
+            if abs(ratio - width / height) <= settings["ratio_tolerance"]:
+                return {"tiff_path": tiff_path, "heating_type": heating_type, "width": width, "height": height}
+    return None
+
+def _maxrects_find(free_rects, width, height):
+    """Best-Short-Side-Fit über alle freien Rechtecke, auch um 90° gedreht"""
+    best = best_score = None
+    for free_x, free_y, free_width, free_height in free_rects:
+        for item_width, item_height in ((width, height), (height, width)):
+            if item_width <= free_width and item_height <= free_height:
+                leftover = (free_width - item_width, free_height - item_height)
+                score = (min(leftover), max(leftover))
+                if best_score is None or score < best_score:
+                    best, best_score = (free_x, free_y, item_width, item_height), score
+    return best
+
+def _maxrects_split(free_rects, used):
+    """Teilt alle freien Rechtecke, die das belegte schneiden, und entfernt enthaltene"""
+    used_x, used_y, used_width, used_height = used
+    split = []
+    for free in free_rects:
+        free_x, free_y, free_width, free_height = free
+        if (used_x >= free_x + free_width or used_x + used_width <= free_x or
+                used_y >= free_y + free_height or used_y + used_height <= free_y):
+            split.append(free)
+            continue
+        if used_x > free_x:
+            split.append((free_x, free_y, used_x - free_x, free_height))
+        if used_x + used_width < free_x + free_width:
+            split.append((used_x + used_width, free_y, free_x + free_width - used_x - used_width, free_height))
+        if used_y > free_y:
+            split.append((free_x, free_y, free_width, used_y - free_y))
+        if used_y + used_height < free_y + free_height:
+            split.append((free_x, used_y + used_height, free_width, free_y + free_height - used_y - used_height))
+
+    split = list(dict.fromkeys(split))  # Duplikate entfernen
+    return [rect for rect in split if not any(
+        other is not rect and rect[0] >= other[0] and rect[1] >= other[1] and
+        rect[0] + rect[2] <= other[0] + other[2] and rect[1] + rect[3] <= other[1] + other[3]
+        for other in split)]
+
+def pack_panels(panels, bin_width, bin_length, spacing, bleed):
+    """
+    Packt Platten (mm) auf Bögen der Breite bin_width und maximalen Länge bin_length.
+    Jede Platte belegt width/height + 2 * bleed + spacing.
+
+    Returns:
+        tuple: (bögen, nicht platzierbare Platten); ein Bogen ist eine Liste von
+               (panel, x, y, gedreht) mit x/y als linke obere Ecke des belegten Rechtecks
+    """
+    extra = 2 * bleed + spacing
+    order = sorted(panels, key=lambda panel: (max(panel["width"], panel["height"]),
+                                              panel["width"] * panel["height"]), reverse=True)
+    sheets, unplaced = [], []
+    for panel in order:
+        footprint = (panel["width"] + extra, panel["height"] + extra)
+        for sheet in sheets + [None]:
+            if sheet is None:
+                sheet = {"free": [(0, 0, bin_width, bin_length)], "placements": []}
+                spot = _maxrects_find(sheet["free"], *footprint)
+                if spot is None:
+                    unplaced.append(panel)
+                    break
+                sheets.append(sheet)
+            else:
+                spot = _maxrects_find(sheet["free"], *footprint)
+                if spot is None:
+                    continue
+            x, y, width, height = spot
+            sheet["free"] = _maxrects_split(sheet["free"], spot)
+            sheet["placements"].append((panel, x, y, (width, height) != footprint))
+            break
+    return [sheet["placements"] for sheet in sheets], unplaced
+
+def _with_bleed(img, bleed_px):
+    """Erweitert das Bild um bleed_px an jeder Seite (Randpixel gestreckt)"""
+    if bleed_px <= 0:
+        return img
+    width, height = img.size
+    canvas = Image.new(img.mode, (width + 2 * bleed_px, height + 2 * bleed_px))
+    canvas.paste(img, (bleed_px, bleed_px))
+    canvas.paste(img.crop((0, 0, width, 1)).resize((width, bleed_px)), (bleed_px, 0))
+    canvas.paste(img.crop((0, height - 1, width, height)).resize((width, bleed_px)), (bleed_px, height + bleed_px))
+    full_height = height + 2 * bleed_px
+    canvas.paste(canvas.crop((bleed_px, 0, bleed_px + 1, full_height)).resize((bleed_px, full_height)), (0, 0))
+    canvas.paste(canvas.crop((bleed_px + width - 1, 0, bleed_px + width, full_height)).resize((bleed_px, full_height)),
+                 (bleed_px + width, 0))
+    return canvas
+
+def compose_sheet(placements, output_path, settings):
+    """
+    Setzt die gepackten Platten zu einer Bogen-TIFF zusammen und schreibt das Layout daneben.
+
+    Returns:
+        dict: Layout (mm-Koordinaten der Schnittkanten je Platte)
+    """
+    load_render_libs()
+    from PIL import ImageDraw
+
+    dpi = settings["dpi"]
+    def px(mm):
+        return int(round(mm * dpi / 25.4))
+
+    margin, bleed, spacing = settings["margin_mm"], settings["bleed_mm"], settings["spacing_mm"]
+    # Belegte Rechtecke enthalten spacing/2 Luft an jeder Seite
+    origin = margin - spacing / 2
+    used_length = max(y + (panel["width"] if rotated else panel["height"]) + 2 * bleed + spacing
+                      for panel, x, y, rotated in placements)
+    sheet_length = used_length + 2 * origin
+    sheet = Image.new("RGB", (px(settings["sheet_width_mm"]), px(sheet_length)), "white")
+    draw = ImageDraw.Draw(sheet)
+    mark, line = settings["cut_mark_mm"], max(1, px(0.25))
+
+    layout = {"sheet_width_mm": settings["sheet_width_mm"], "sheet_length_mm": round(sheet_length, 1),
+              "dpi": dpi, "bleed_mm": bleed, "panels": []}
+    trims = []
+    for panel, x, y, rotated in placements:
+        width, height = (panel["height"], panel["width"]) if rotated else (panel["width"], panel["height"])
+        trim_x, trim_y = origin + x + spacing / 2 + bleed, origin + y + spacing / 2 + bleed
+        trims.append((panel, trim_x, trim_y, width, height, rotated))
+        layout["panels"].append({
+            "job_key": os.path.splitext(os.path.basename(panel["tiff_path"]))[0],
+            "tiff_path": panel["tiff_path"], "heating_type": panel["heating_type"],
+            "x_mm": round(trim_x, 1), "y_mm": round(trim_y, 1),
+            "width_mm": width, "height_mm": height, "rotated": rotated})
+
+        # Schnittmarken an den Ecken, außerhalb des Beschnitts
+        for corner_x, direction_x in ((trim_x, -1), (trim_x + width, 1)):
+            for corner_y, direction_y in ((trim_y, -1), (trim_y + height, 1)):
+                start_x, start_y = corner_x + direction_x * bleed, corner_y + direction_y * bleed
+                draw.line([(px(start_x), px(corner_y)), (px(start_x + direction_x * mark), px(corner_y))],
+                          fill="black", width=line)
+                draw.line([(px(corner_x), px(start_y)), (px(corner_x), px(start_y + direction_y * mark))],
+                          fill="black", width=line)
+
+    # Platten nach den Marken einsetzen, damit keine Marke ins Motiv ragt
+    for panel, trim_x, trim_y, width, height, rotated in trims:
+        with Image.open(panel["tiff_path"]) as source:
+            img = source.convert("RGBA")
+        if rotated:
+            img = img.transpose(Image.Transpose.ROTATE_90)
+        background = Image.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        img = _with_bleed(background.resize((px(width), px(height)), Image.Resampling.LANCZOS), px(bleed))
+        sheet.paste(img, (px(trim_x - bleed), px(trim_y - bleed)))
+
+    sheet.save(output_path + ".part", format="TIFF", compression="tiff_deflate", dpi=(dpi, dpi))
+    os.replace(output_path + ".part", output_path)
+    atomic_write_json(os.path.splitext(output_path)[0] + ".json", layout)
+    return layout
+
+def imposition_candidate_paths(settings=None):
+    """
+    TIFFs aus dem Job-Journal, die noch auf einen Bogen dürfen: gerendert, weder
+    ausgeliefert noch zur Auslieferung eingestellt noch ausgeschossen, jünger als
+    max_age_hours. Einzeln ausgelieferte Platten würden sonst doppelt gedruckt.
+    """
+    settings = settings or get_config_section("imposition")
+    index = load_imposition_index()
+    cutoff = (datetime.now() - timedelta(hours=settings["max_age_hours"])).isoformat()
+    tiff_paths = [job["tiff_path"] for job in journal_jobs_in_stage("rendered")
+                  if not job["error"] and job["updated"] >= cutoff
+                  and job["tiff_path"] and os.path.exists(job["tiff_path"])
+                  and job["tiff_path"] not in index
+                  and os.path.dirname(os.path.abspath(job["tiff_path"])) != IMPOSITION_DIR]
+    return list(dict.fromkeys(tiff_paths))
+
+def collect_imposition_jobs(settings=None):
+    """Fertige, noch nicht ausgeschossene Platten der Typen aus imposition.panel_types"""
+    settings = settings or get_config_section("imposition")
+    return [tiff_path for tiff_path in imposition_candidate_paths(settings) if imposition_panel(tiff_path, settings)]
+
+def max_sheet_length_mm(settings):
+    """
+    Maximale Bogenlänge: max_sheet_length_mm, begrenzt durch max_sheet_mb
+    (der Bogen wird als ein RGB-Bild im Speicher zusammengesetzt).
+    """
+    width_px = settings["sheet_width_mm"] * settings["dpi"] / 25.4
+    memory_length_mm = settings["max_sheet_mb"] * 1024 * 1024 / (3 * width_px) * 25.4 / settings["dpi"]
+    return min(settings["max_sheet_length_mm"], memory_length_mm)
+
+def load_imposition_index():
+    """TIFF-Pfad -> Bogen, auf dem die Platte bereits ausgeschossen wurde"""
+    try:
+        with open(IMPOSITION_INDEX, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def run_imposition(tiff_paths=None):
+    """
+    Schießt die übergebenen TIFFs (oder alle gesammelten aus dem Journal) auf Bögen aus.
+
+    Returns:
+        list: Pfade der erzeugten Bogen-TIFFs
+    """
+    settings = get_config_section("imposition")
+    if tiff_paths is None:
+        tiff_paths = collect_imposition_jobs(settings)
+    panels = []
+    for tiff_path in tiff_paths:
+        panel = imposition_panel(os.path.abspath(tiff_path), settings)
+        if panel:
+            panels.append(panel)
+        else:
+            print(f"Übersprungen (kein Plattentyp aus imposition.panel_types): {tiff_path}")
+    if not panels:
+        print("Keine Platten zum Ausschießen")
+        return []
+
+    start = time.perf_counter()
+    spacing = settings["spacing_mm"]
+    sheet_length = max_sheet_length_mm(settings)
+    if sheet_length < settings["max_sheet_length_mm"]:
+        print(f"Bogenlänge wegen max_sheet_mb auf {sheet_length:.0f} mm begrenzt")
+    sheets, unplaced = pack_panels(panels, settings["sheet_width_mm"] - 2 * settings["margin_mm"] + spacing,
+                                   sheet_length - 2 * settings["margin_mm"] + spacing,
+                                   spacing, settings["bleed_mm"])
+    pack_seconds = time.perf_counter() - start
+    record_timing("imposition_pack", pack_seconds, panels=len(panels), sheets=len(sheets))
+    for panel in unplaced:
+        print(f"⚠️ Passt auf keinen Bogen: {panel['tiff_path']} ({panel['width']}x{panel['height']} mm)")
+
+    os.makedirs(IMPOSITION_DIR, exist_ok=True)
+    index = load_imposition_index()
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    sheet_paths = []
+    for number, placements in enumerate(sheets, 1):
+        sheet_key = f"bogen_{stamp}_{number:02d}"
+        sheet_path = os.path.join(IMPOSITION_DIR, f"{sheet_key}.tiff")
+        compose_start = time.perf_counter()
+        layout = compose_sheet(placements, sheet_path, settings)
+        panel_area = sum(panel["width_mm"] * panel["height_mm"] for panel in layout["panels"])
+        utilisation = panel_area / (layout["sheet_width_mm"] * layout["sheet_length_mm"])
+        record_timing("imposition_sheet", time.perf_counter() - compose_start, sheet=sheet_key,
+                      panels=len(placements), length_mm=layout["sheet_length_mm"],
+                      utilisation=round(utilisation, 3))
+        print(f"🧩 {sheet_key}: {len(placements)} Platten, {layout['sheet_width_mm']}x"
+              f"{layout['sheet_length_mm']:.0f} mm, Ausnutzung {utilisation:.0%}")
+
+        for panel in layout["panels"]:
+            index[panel["tiff_path"]] = sheet_key
+            if journal_get(panel["job_key"]):
+                journal_record(panel["job_key"], "imposed", error=None)
+        atomic_write_json(IMPOSITION_INDEX, index)
+        journal_record(sheet_key, "rendered", tiff_path=sheet_path, error=None)
+        queue_delivery(sheet_key, sheet_path, allow_imposition=False)
+        sheet_paths.append(sheet_path)
+
+    print(f"Ausschießen: {len(panels)} Platten auf {len(sheets)} Bogen ({pack_seconds * 1000:.0f} ms Packen)")
+    return sheet_paths
+
+# === Render-Server für schwache Scan-Stationen ===
+# Wie beim Session-Broker: unverschlüsseltes HTTP, außerhalb von 127.0.0.1 nur mit
+# render_service.token (Header X-Render-Token).
+
+RENDER_JOBS_DIR = os.path.join(BASE_DIR, "render_jobs")
+
+def render_order(extract_dir, order_number, zip_path, interactive=True):
+    """
+    Rendert die TIFF lokal oder - falls render_service.url gesetzt ist - auf dem
+    Render-Server. Die Heizungstyp-Bestätigung bleibt beim Bediener an der Station;
+    ist der Server nicht erreichbar, wird lokal gerendert.
+    """
+    if not get_config_section("render_service")["url"]:
+        return process_files_to_tiff(extract_dir, order_number, interactive=interactive)
+
+    dimensions = extract_dimensions_and_check_text(extract_dir, interactive=interactive)
+    if not dimensions:
+        return None
+
+    output_path = os.path.join(extract_dir, f"{order_number}.tiff")
+    if render_remote(zip_path, order_number, output_path):
+        return output_path
+
+    print("⚠️ Render-Server nicht verfügbar - rendere lokal")
+    return process_files_to_tiff(extract_dir, order_number, dimensions=dimensions)
+
+def _render_service_request(url, data=None, headers=None):
+    """Request an den Render-Server inkl. X-Render-Token"""
+    import urllib.request
+    headers = dict(headers or {})
+    token = get_config_section("render_service")["token"]
+    if token:
+        headers["X-Render-Token"] = token
+    return urllib.request.Request(url, data=data, headers=headers, method="POST" if data is not None else "GET")
+
+def render_remote(zip_path, order_number, output_path):
+    """
+    Schickt die Anpassungs-ZIP an den Render-Server, wartet auf das Ergebnis und
+    speichert die TIFF unter output_path.
 
+    Returns:
+        bool: True wenn die TIFF vom Server übernommen wurde
+    """
+    import urllib.request
+    from urllib.parse import quote
+
+    settings = get_config_section("render_service")
+    base_url = settings["url"].rstrip("/")
+    start = time.perf_counter()
+    try:
+        with open(zip_path, "rb") as f:
+            request = _render_service_request(
+                f"{base_url}/jobs?order={quote(order_number)}", data=f.read(),
+                headers={"Content-Type": "application/zip"})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            job_id = json.loads(response.read().decode("utf-8"))["job_id"]
+        print(f"Render-Job {job_id} für {order_number} an {base_url} übergeben")
+
+        deadline = time.time() + settings["timeout"]
+        while True:
+            with urllib.request.urlopen(_render_service_request(f"{base_url}/jobs/{job_id}"), timeout=10) as response:
+                status = json.loads(response.read().decode("utf-8"))
+            if status["status"] == "done":
+                break
+            if status["status"] == "failed":
+                print(f"❌ Render-Job fehlgeschlagen: {status.get('error')}")
+                return False
+            if time.time() > deadline:
+                print("❌ Render-Job Zeitüberschreitung")
+                return False
+            time.sleep(0.5)
+
+        # Ergebnis gestreamt in eine temporäre Datei laden und dann umbenennen
+        tmp_path = output_path + ".part"
+        with urllib.request.urlopen(_render_service_request(f"{base_url}/jobs/{job_id}/result"), timeout=60) as response, \
+                open(tmp_path, "wb") as out:
+            shutil.copyfileobj(response, out, 1024 * 1024)
+        os.replace(tmp_path, output_path)
+        record_timing("remote_render", time.perf_counter() - start, order=order_number,
+                      server_seconds=status.get("render_seconds"))
         return True
 
     except Exception as e:
-        print(f"Fehler bei der TIFF-Konvertierung: {e}")
-        safe_messagebox(messagebox.showerror, "Fehler", f"Konvertierung fehlgeschlagen: {str(e)}")
+        print(f"Render-Server-Fehler: {e}")
         return False
 
+def _render_worker_init():
+    """Initialisiert einen Render-Worker-Prozess (keine Dialoge, Bibliotheken vorladen)"""
+    set_headless_mode(True)
+    load_render_libs()
+
+def _render_job(job_dir, order_number):
+    """
+    Führt einen Render-Job im Worker-Prozess aus: ZIP entpacken und TIFF erzeugen.
+
+    Returns:
+        tuple: (tiff_path, render_seconds)
+    """
+    start = time.perf_counter()
+    extract_dir = os.path.join(job_dir, "files")
+    with zipfile.ZipFile(os.path.join(job_dir, "job.zip"), 'r') as zip_ref:
+        zip_ref.extractall(extract_dir)
+    tiff_path = process_files_to_tiff(extract_dir, order_number, interactive=False)
+    if not tiff_path or not os.path.exists(tiff_path):
+        raise Exception("TIFF-Datei konnte nicht erstellt werden (Heizungstyp unbekannt oder Renderfehler)")
+    return tiff_path, time.perf_counter() - start
+
+def create_render_server(host=None, port=None, workers=None):
+    """
+    Erstellt den Render-Server. API:
+
+        POST /jobs?order=<nr>     Body: Anpassungs-ZIP -> {"job_id"} (503 wenn Warteschlange voll)
+        GET  /jobs/<id>           Status: queued | running | done | failed
+        GET  /jobs/<id>/result    TIFF (gestreamt)
+        GET  /health              Worker, Warteschlange
+        GET  /metrics             Zähler und mittlere Renderzeit
+
+    Gerendert wird in einem Prozess-Pool (render_service.workers); optional wird
+    jede fertige TIFF zusätzlich nach render_service.shared_output_dir kopiert.
+    Uploads über render_service.max_upload_mb werden mit 413 abgelehnt; außerhalb
+    von Loopback ist render_service.token Pflicht.
+    """
+    import uuid
+    from concurrent.futures import ProcessPoolExecutor
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from urllib.parse import urlsplit, parse_qs
+
+    settings = get_config_section("render_service")
+    host = host or settings["host"]
+    check_service_token("Render-Server", host, settings["token"])
+    max_upload = int(settings["max_upload_mb"] * 1024 * 1024)
+    workers = workers or settings["workers"] or max(1, (os.cpu_count() or 2) // 2)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_render_worker_init)
+    os.makedirs(RENDER_JOBS_DIR, exist_ok=True)
+
+    jobs = {}
+    jobs_lock = threading.Lock()
+    metrics = {"jobs_total": 0, "jobs_done": 0, "jobs_failed": 0, "jobs_rejected": 0,
+               "render_seconds_total": 0.0, "bytes_in": 0, "bytes_out": 0}
+
+    def cleanup_old_jobs():
+        cutoff = time.time() - settings["result_ttl_minutes"] * 60
+        for job_id in [jid for jid, job in jobs.items() if job.get("finished", time.time()) < cutoff]:
+            shutil.rmtree(jobs[job_id]["dir"], ignore_errors=True)
+            del jobs[job_id]
+
+    def on_job_finished(job_id, future):
+        with jobs_lock:
+            job = jobs.get(job_id)
+            if job is None:
+                return
+            job["finished"] = time.time()
+            try:
+                tiff_path, render_seconds = future.result()
+                job.update(status="done", tiff_path=tiff_path, render_seconds=round(render_seconds, 3))
+                metrics["jobs_done"] += 1
+                metrics["render_seconds_total"] += render_seconds
+            except Exception as e:
+                job.update(status="failed", error=str(e))
+                metrics["jobs_failed"] += 1
+                return
+
+        if settings["shared_output_dir"]:
+            try:
+                target = os.path.join(settings["shared_output_dir"], f"{job['order_number']}.tiff")
+                shutil.copy2(tiff_path, target + ".part")
+                os.replace(target + ".part", target)
+                job["output"] = target
+            except Exception as e:
+                print(f"Warnung: TIFF konnte nicht in den gemeinsamen Ordner kopiert werden: {e}")
+        record_timing("render_job", render_seconds, order=job["order_number"], job_id=job_id)
+
+    class RenderHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status, data):
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self):
+            if not token_matches(settings["token"], self.headers.get("X-Render-Token")):
+                self._reply(403, {"error": "ungültiges Token"})
+                return False
+            return True
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            url = urlsplit(self.path)
+            if url.path != "/jobs":
+                self._reply(404, {"error": "unbekannter Pfad"})
+                return
+            order_number = parse_qs(url.query).get("order", ["auftrag"])[0]
+            if not re.match(r'^[\w.-]+$', order_number):
+                self._reply(400, {"error": "ungültige Bestellnummer"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = 0
+            if length <= 0:
+                self._reply(411, {"error": "Content-Length fehlt"})
+                return
+            if length > max_upload:
+                self.close_connection = True
+                self._reply(413, {"error": f"ZIP größer als {settings['max_upload_mb']} MB"})
+                return
+
+            with jobs_lock:
+                cleanup_old_jobs()
+                pending = sum(1 for job in jobs.values() if job["status"] == "queued")
+                if pending >= settings["max_queue"]:
+                    metrics["jobs_rejected"] += 1
+                    self._reply(503, {"error": "Warteschlange voll"})
+                    return
+
+            job_id = uuid.uuid4().hex
+            job_dir = os.path.join(RENDER_JOBS_DIR, job_id)
+            os.makedirs(job_dir)
+            with open(os.path.join(job_dir, "job.zip"), "wb") as f:
+                remaining = length
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            if remaining > 0:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                self._reply(400, {"error": "Upload unvollständig"})
+                return
+
+            with jobs_lock:
+                future = pool.submit(_render_job, job_dir, order_number)
+                jobs[job_id] = {"status": "queued", "order_number": order_number,
+                                "dir": job_dir, "submitted": time.time(), "future": future}
+                metrics["jobs_total"] += 1
+                metrics["bytes_in"] += length
+            # Callback erst nach dem Lock registrieren (läuft bei fertigem Future sofort)
+            future.add_done_callback(lambda f: on_job_finished(job_id, f))
+            self._reply(202, {"job_id": job_id})
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            path = urlsplit(self.path).path
+            if path == "/health":
+                with jobs_lock:
+                    pending = sum(1 for job in jobs.values() if job["status"] == "queued")
+                self._reply(200, {"status": "ok", "workers": workers, "pending": pending,
+                                  "max_queue": settings["max_queue"]})
+            elif path == "/metrics":
+                with jobs_lock:
+                    data = dict(metrics)
+                data["avg_render_seconds"] = round(data["render_seconds_total"] / data["jobs_done"], 3) if data["jobs_done"] else None
+                self._reply(200, data)
+            elif path.startswith("/jobs/"):
+                parts = path.strip("/").split("/")
+                with jobs_lock:
+                    job = dict(jobs.get(parts[1], {}))
+                if not job:
+                    self._reply(404, {"error": "unbekannter Job"})
+                elif len(parts) == 2:
+                    if job["status"] == "queued" and job.get("future") and job["future"].running():
+                        job["status"] = "running"
+                    self._reply(200, {key: job.get(key) for key in
+                                      ("status", "order_number", "error", "render_seconds", "output")})
+                elif len(parts) == 3 and parts[2] == "result":
+                    if job["status"] != "done":
+                        self._reply(409, {"error": f"Job ist {job['status']}"})
+                        return
+                    size = os.path.getsize(job["tiff_path"])
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/tiff")
+                    self.send_header("Content-Length", str(size))
+                    self.end_headers()
+                    with open(job["tiff_path"], "rb") as f:
+                        shutil.copyfileobj(f, self.wfile, 1024 * 1024)
+                    with jobs_lock:
+                        metrics["bytes_out"] += size
+                else:
+                    self._reply(404, {"error": "unbekannter Pfad"})
+            else:
+                self._reply(404, {"error": "unbekannter Pfad"})
+
+    server = ThreadingHTTPServer((host, port or settings["port"]), RenderHandler)
+    server.daemon_threads = True
+    server.pool = pool
+    return server
+
+def run_render_server(host=None, port=None, workers=None):
+    """Startet den Render-Server im Vordergrund"""
+    set_headless_mode(True)
+    try:
+        server = create_render_server(host, port, workers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"Render-Server läuft auf http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.pool.shutdown(wait=False, cancel_futures=True)
+
 # === Bestellung suchen und verarbeiten ===
 def search_order(order_number):
     driver = create_driver()
@@ -1573,13 +5259,12 @@ def search_order(order_number):
         print(f"=== Starte Suche nach Bestellung: {order_number} ===")
         
         # Cookies laden und prüfen
-        if not load_cookies(driver):
-            safe_messagebox(messagebox.showerror, "Fehler", "Keine gültigen Cookies gefunden. Bitte logge dich zuerst manuell ein.")
+        if not prepare_session(driver):
+            safe_messagebox("showerror", "Fehler", "Keine gültigen Cookies gefunden. Bitte logge dich zuerst manuell ein.")
             return
 
-        # Seite neu laden um Login zu aktivieren
-        driver.refresh()
-        time.sleep(3)
+        # Seller Central mit gesetzten Cookies öffnen
+        open_seller_central(driver)
         
         # Flexiblere Login-Prüfung
         current_url = driver.current_url
@@ -1587,107 +5272,17 @@ def search_order(order_number):
         
         # Wenn wir auf Login-Seite sind, Session ist abgelaufen
         if any(keyword in current_url.lower() for keyword in ["signin", "login", "auth"]):
-            safe_messagebox(messagebox.showerror, "Session abgelaufen", "Deine Session ist abgelaufen. Bitte logge dich erneut ein.")
+            safe_messagebox("showerror", "Session abgelaufen", "Deine Session ist abgelaufen. Bitte logge dich erneut ein.")
             return
 
         # Prüfen auf Account-Auswahlfenster (Deutschland auswählen)
-        try:
-            print("Prüfe auf Account-Auswahlfenster...")
-            # Warte auf Account-Auswahlfenster mit verschiedenen Selektoren
-            germany_selectors = [
-                'button.full-page-account-switcher-account-details span.full-page-account-switcher-account-label',
-                'button.full-page-account-switcher-account-details',
-                '[data-testid="account-switcher-account-details"]',
-                'button[class*="account-switcher"]'
-            ]
-            
-            germany_button = None
-            for selector in germany_selectors:
-                try:
-                    elements = WebDriverWait(driver, 5).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                    )
-                    
-                    for element in elements:
-                        if "Deutschland" in element.text or "Germany" in element.text:
-                            germany_button = element
-                            break
-                    
-                    if germany_button:
-                        break
-                        
-                except:
-                    continue
-            
-            if germany_button:
-                print("Deutschland Account gefunden, klicke darauf...")
-                germany_button.click()
-                time.sleep(2)
-                
-                
-            # Suche nach Bestätigungsbutton mit verschiedenen Selektoren (inkl. kat-button)
-            confirm_selectors = [
-                'kat-button[data-test="confirm-selection"]',
-                'kat-button.full-page-account-switcher-button',
-                'button.kat-button.full-page-account-switcher-button',
-                'button[class*="full-page-account-switcher-button"]',
-                'button[class*="account-switcher-button"]',
-                'button.kat-button'
-            ]
-
-            confirm_button = None
-            for selector in confirm_selectors:
-                try:
-                    confirm_button = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    if confirm_button:
-                        print(f"Bestätigungsbutton gefunden mit Selektor: {selector}")
-                        # Versuche JavaScript-Klick (robuster bei Custom Elements)
-                        driver.execute_script("arguments[0].click();", confirm_button)
-                        time.sleep(2)
-                        break
-                except Exception as e:
-                    print(f"Fehler mit Selektor {selector}: {e}")
-                    continue
-
-            if not confirm_button:
-                print("Bestätigungsbutton nicht gefunden, versuche trotzdem fortzufahren...")
-            else:
-                print("Bestätigungsbutton wurde erfolgreich geklickt.")
-
-        except Exception as e:
-            print(f"Account-Auswahl übersprungen: {str(e)}")
-            pass
-        
-        #Suchfeld schneller finden mit explizitem Wait
-        search_field = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input#sc-search-field"))
-        )
-        print("Suchfeld gefunden")
-        
-        # Suche durchführen
-        search_field.clear()
-        search_field.send_keys(order_number)
-        
-        # Suchbutton finden und klicken
-        search_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.sc-search-button.search-icon-container"))
-        )
-        search_button.click()
-        print("Suche durchgeführt")
+        select_germany_account(driver)
         
         try:
-            # Warte auf Suchergebnisse mit kürzerem Timeout für die "Nicht gefunden"-Prüfung
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.sc-no-results-message, span.a-expander-prompt"))
-            )
-            
-            # Prüfe ob "Keine Ergebnisse" Meldung vorhanden ist
-            no_results = driver.find_elements(By.CSS_SELECTOR, "div.sc-no-results-message")
-            if no_results:
-                safe_messagebox(messagebox.showwarning, "Nicht gefunden", f"Bestellung {order_number} wurde nicht gefunden. Bitte überprüfen Sie die Bestellnummer.")
-                driver.quit()
+            # Bestellung öffnen (Direkt-URL oder Suchfeld) und auf "Keine Ergebnisse" prüfen
+            if open_order_details(driver, order_number) == "not_found":
+                safe_messagebox("showwarning", "Nicht gefunden", f"Bestellung {order_number} wurde nicht gefunden. Bitte überprüfen Sie die Bestellnummer.")
+                quit_driver(driver)
                 return
                 
             # Wenn keine "Nicht gefunden" Meldung, dann normal fortfahren
@@ -1714,26 +5309,477 @@ def search_order(order_number):
             
         except Exception as e:
             # Falls Timeout beim Finden der Elemente
-            safe_messagebox(messagebox.showwarning, "Nicht gefunden", f"Bestellung {order_number} wurde nicht gefunden oder die Seite hat zu lange geladen. Bitte überprüfen Sie die Bestellnummer.")
+            safe_messagebox("showwarning", "Nicht gefunden", f"Bestellung {order_number} wurde nicht gefunden oder die Seite hat zu lange geladen. Bitte überprüfen Sie die Bestellnummer.")
             
     except Exception as e:
-        safe_messagebox(messagebox.showerror, "Fehler", f"Prozess fehlgeschlagen: {e}")
+        safe_messagebox("showerror", "Fehler", f"Prozess fehlgeschlagen: {e}")
         print(f"Fehler aufgetreten: {str(e)}")
     finally:
-        driver.quit()
+        quit_driver(driver)
+        flush_selector_stats()
+
+# === Lokaler Seller-Central-Stand-in (Benchmarks & Tests) ===
+
+STANDIN_SESSION_COOKIE = "session-id"
+STANDIN_ORDER_NUMBER = "123-1234567-1234567"
+
+def _standin_assets_html(count=12):
+    """Schwere Seitenbestandteile wie bei Seller Central: Bilder, Fonts, Tracker"""
+    html = "<style>@font-face { font-family: amzn; src: url('/assets/ember.woff2'); } body { font-family: amzn; }</style>\n"
+    for i in range(count):
+        html += f"<img src='/assets/banner_{i}.jpg' width='200'>\n"
+    html += "<video src='/assets/promo.mp4' autoplay muted></video>\n"
+    html += "<script src='/thirdparty/www.googletagmanager.com/gtm.js'></script>\n"
+    html += "<script src='/thirdparty/www.google-analytics.com/analytics.js'></script>\n"
+    return html
+
+def _standin_home_html():
+    return f"""<!DOCTYPE html><html><head><title>Seller Central Stand-in</title></head><body>
+<input id="sc-search-field" class="search-input search-input-active">
+<button class="sc-search-button search-icon-container"
+        onclick="location.href='/orders-v3/order/' + document.getElementById('sc-search-field').value">Suchen</button>
+{_standin_assets_html()}
+</body></html>"""
+
+def _standin_order_html(order_number, positions=2):
+    items = ""
+    for i in range(1, positions + 1):
+        items += f"""<div class="order-item">
+  <span class="a-expander-prompt">Position {i}</span>
+  <div class="a-expander-content"><a class="a-link-normal" href="/gestalt/fulfillment/index.html?orderId={order_number}&item={i}">Anpassungsinformationen</a></div>
+</div>\n"""
+    return f"""<!DOCTYPE html><html><head><title>Bestelldetails {order_number}</title></head><body>
+<h1>Bestellung <span data-test-id="order-id-value">{order_number}</span></h1>
+{items}
+{_standin_assets_html()}
+</body></html>"""
+
+def create_standin_server(host="127.0.0.1", port=0, asset_size=150_000):
+    """
+    Erstellt einen lokalen HTTP-Server, der die für uns relevanten Seller-Central-Seiten
+    nachbildet (Login-Redirect, Startseite mit Suchfeld, Bestelldetails mit Positionen)
+    inklusive schwerer Bilder, Fonts, Videos und Tracker-Skripte.
+    Ohne Cookie "session-id" wird auf /ap/signin umgeleitet.
+
+    Returns:
+        ThreadingHTTPServer mit Zählern server.requests und server.bytes_sent
+    """
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from http.cookies import SimpleCookie
+
+    class StandinHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            with self.server.stats_lock:
+                self.server.requests += 1
+                self.server.bytes_sent += len(body)
+
+        def _logged_in(self):
+            cookies = SimpleCookie(self.headers.get("Cookie", ""))
+            return STANDIN_SESSION_COOKIE in cookies
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path.startswith("/assets/") or path.startswith("/thirdparty/"):
+                content_types = {".jpg": "image/jpeg", ".woff2": "font/woff2", ".mp4": "video/mp4", ".js": "application/javascript"}
+                content_type = content_types.get(os.path.splitext(path)[1], "application/octet-stream")
+                size = 20_000 if path.endswith(".js") else asset_size
+                self._send(200, b"\0" * size, content_type)
+            elif path == "/ap/signin":
+                self._send(200, "<html><body><form id='signin'>Anmelden</form></body></html>")
+            elif not self._logged_in():
+                self._send(302, headers={"Location": "/ap/signin"})
+            elif path in ("/", "/home"):
+                # Wie Seller Central: Session-Cookie bei jedem Besuch verlängern
+                refreshed = f"{STANDIN_SESSION_COOKIE}=standin-{int(time.time())}; Path=/; Max-Age=43200"
+                self._send(200, _standin_home_html(), headers={"Set-Cookie": refreshed})
+            elif path.startswith("/orders-v3/order/"):
+                order_number = path.rsplit("/", 1)[-1]
+                if ORDER_NUMBER_PATTERN.match(order_number):
+                    self._send(200, _standin_order_html(order_number))
+                else:
+                    self._send(200, "<html><body><div class='sc-no-results-message'>Keine Ergebnisse</div></body></html>")
+            else:
+                self._send(404, "Not found")
+
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.requests = 0
+    server.bytes_sent = 0
+    server.stats_lock = threading.Lock()
+    return server
+
+def run_standin_server(host="127.0.0.1", port=8700):
+    """Startet den Stand-in im Vordergrund (für manuelle Tests)"""
+    server = create_standin_server(host, port)
+    print(f"Seller-Central-Stand-in läuft auf http://{host}:{server.server_address[1]}")
+    print(f"Anmelde-Cookie: {STANDIN_SESSION_COOKIE}=<beliebig>, Testbestellung: {STANDIN_ORDER_NUMBER}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def benchmark_browser_profiles(runs=3, profiles=("standard", "performance")):
+    """
+    Misst Ladezeit und übertragene Bytes der Bestelldetailseite je Browser-Profil
+    gegen den lokalen Stand-in. Jeder Lauf nutzt einen frischen Browser.
+
+    Returns:
+        dict: {profile: {"load_seconds": [...], "bytes": [...]}}
+    """
+    server = create_standin_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    order_url = f"{base_url}/orders-v3/order/{STANDIN_ORDER_NUMBER}"
+    results = {}
+
+    try:
+        for profile in profiles:
+            results[profile] = {"load_seconds": [], "bytes": []}
+            for run in range(1, runs + 1):
+                driver = create_driver(performance_profile=profile)
+                try:
+                    execute_cdp(driver, "Network.setCookie",
+                                {"name": STANDIN_SESSION_COOKIE, "value": "benchmark", "url": base_url})
+                    with server.stats_lock:
+                        server.bytes_sent = 0
+                    start = time.perf_counter()
+                    driver.get(order_url)
+                    WebDriverWait(driver, 30).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "span.a-expander-prompt"))
+                    )
+                    elapsed = time.perf_counter() - start
+                    with server.stats_lock:
+                        transferred = server.bytes_sent
+                finally:
+                    quit_driver(driver)
+
+                results[profile]["load_seconds"].append(elapsed)
+                results[profile]["bytes"].append(transferred)
+                record_timing("browser_profile_benchmark", elapsed, profile=profile, run=run, bytes=transferred)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("\n=== Browser-Profil-Benchmark (Stand-in) ===")
+    for profile, values in results.items():
+        avg_time = sum(values["load_seconds"]) / len(values["load_seconds"])
+        avg_bytes = sum(values["bytes"]) / len(values["bytes"])
+        print(f"{profile:<12} Ladezeit Ø {avg_time:.3f}s   übertragen Ø {avg_bytes / 1024:.0f} KB")
+    return results
+
+# === Startzeit-Messung ===
+
+def profile_imports():
+    """
+    Gibt einen Importzeit-Bericht aus: Laden dieses Moduls, der schweren
+    Subsysteme (einzeln gemessen) und - ohne PyInstaller - die teuersten
+    Einzelmodule laut "python -X importtime".
+    """
+    module_load = MODULE_LOAD_SECONDS
+    load_selenium()
+    load_render_libs()
+
+    print("\n=== Importzeit-Bericht ===")
+    print(f"{'Hauptmodul (ohne schwere Imports)':<40} {module_load * 1000:8.1f} ms")
+    for name, seconds in sorted(IMPORT_TIMINGS.items(), key=lambda item: -item[1]):
+        print(f"{name:<40} {seconds * 1000:8.1f} ms")
+    print()
+    record_timing("import_time", module_load, module="main")
+    for name, seconds in IMPORT_TIMINGS.items():
+        record_timing("import_time", seconds, module=name)
+
+    if getattr(sys, 'frozen', False):
+        return
+
+    # Detailansicht der teuersten Module (kumulativ) in einem frischen Interpreter
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import selenium.webdriver, webdriver_manager.chrome, cairosvg, PIL.Image, lxml.etree"],
+        capture_output=True, text=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(.+)", line)
+        if match:
+            entries.append((int(match.group(2)), match.group(3).rstrip()))
+    print("\nTeuerste Module (kumulativ, python -X importtime):")
+    for cumulative_us, name in sorted(entries, reverse=True)[:15]:
+        print(f"{name:<40} {cumulative_us / 1000:8.1f} ms")
+
+def benchmark_cold_start(runs=5):
+    """
+    Misst die Zeit vom Prozessstart bis zum ersten sichtbaren Fenster.
+    Funktioniert auch mit der PyInstaller-EXE (dort inkl. Entpacken).
+
+    Returns:
+        list: Gemessene Zeiten in Sekunden
+    """
+    import tempfile
+
+    if getattr(sys, 'frozen', False):
+        command = [sys.executable]
+    else:
+        command = [sys.executable, os.path.abspath(__file__)]
+
+    timings = []
+    for run in range(1, runs + 1):
+        fd, probe_path = tempfile.mkstemp(suffix=".probe")
+        os.close(fd)
+        os.remove(probe_path)
+        try:
+            start = time.time()
+            subprocess.run(command + ["--startup-probe", probe_path], timeout=120)
+            if not os.path.exists(probe_path):
+                print(f"Lauf {run}: kein Fenster gemeldet")
+                continue
+            with open(probe_path, 'r') as f:
+                first_window = float(f.read())
+        finally:
+            if os.path.exists(probe_path):
+                os.remove(probe_path)
+
+        elapsed = first_window - start
+        timings.append(elapsed)
+        record_timing("time_to_first_window", elapsed, run=run, frozen=getattr(sys, 'frozen', False))
+
+    if timings:
+        print(f"\nZeit bis zum ersten Fenster: Ø {sum(timings) / len(timings):.3f}s "
+              f"(min {min(timings):.3f}s, max {max(timings):.3f}s, {len(timings)} Läufe)")
+    return timings
+
+# === Bestätigungs-Regeln (auto_confirm) ===
+# Eindeutige Fälle werden ohne Rückfrage bestätigt, knappe Fälle landen als
+# "review" im Job-Journal (Prüfliste) statt einen Worker zu blockieren.
+
+_policy_state = threading.local()
+
+def reset_policy_counts():
+    """Setzt die Zähler des aktuellen Threads zurück (eine Bestellung pro Thread)"""
+    _policy_state.auto_approved = 0
+    _policy_state.escalated = 0
+    _policy_state.review_reason = None
+
+def policy_counts():
+    """Automatisch bestätigte und zur Prüfung gegebene Rückfragen des aktuellen Threads"""
+    return {"auto_approved": getattr(_policy_state, "auto_approved", 0),
+            "escalated": getattr(_policy_state, "escalated", 0)}
+
+def take_review_reason():
+    """Grund der letzten Eskalation (und zurücksetzen) - None wenn nicht eskaliert"""
+    reason = getattr(_policy_state, "review_reason", None)
+    _policy_state.review_reason = None
+    return reason
+
+def confirmation_policy(settings=None):
+    """
+    Erstellt den Handler für set_confirmation_handler aus dem Abschnitt auto_confirm:
+    - Positionen: bestätigt bis max_positions angepasste Positionen
+    - Heizungstyp: bestätigt, wenn die Abweichung höchstens
+      max_deviation_fraction * Toleranz beträgt
+    Alles dazwischen, jede Abweichung vom Produkt-Memo und jeder Preflight-Befund
+    wird eskaliert (Prüfliste);
+    unbekannte Rückfragen gehen an den Bediener.
+    """
+    settings = settings or get_config_section("auto_confirm")
+
+    def decide(approved, title, reason):
+        counter = "auto_approved" if approved else "escalated"
+        setattr(_policy_state, counter, getattr(_policy_state, counter, 0) + 1)
+        if approved:
+            print(f"✅ Automatisch bestätigt: {title} ({reason})")
+        else:
+            _policy_state.review_reason = reason
+            print(f"🔎 Zur Prüfung: {title} ({reason})")
+        return approved
+
+    def handler(title, message, context):
+        if getattr(_policy_state, "manual", False):
+            return None  # Prüfung durch den Bediener
+        kind = context.get("kind")
+        if kind == "positions":
+            count = context["customizable"]
+            return decide(count <= settings["max_positions"], title, f"{count} angepasste Position(en)")
+        if kind == "preflight":
+            return decide(False, title, "; ".join(context["problems"]))
+        if kind == "heating_type" and context.get("memo_mismatch"):
+            return decide(False, title, f"Produkt-Memo weicht ab: {context['memo_mismatch']}")
+        if kind == "heating_type":
+            limit = settings["max_deviation_fraction"] * context["tolerance"]
+            return decide(context["deviation"] <= limit, title,
+                          f"{context['heating_type']}, Abweichung {context['deviation']:.4f} / Grenze {limit:.4f}")
+        return None
+
+    return handler
+
+def journal_review_jobs():
+    """Einträge der Prüfliste (Bestellungen und Positionen)"""
+    return journal_jobs_in_stage("review")
+
+def resolve_review_job(job):
+    """
+    Bearbeitet einen Eintrag der Prüfliste mit Rückfragen an den Bediener:
+    Positionen aus der bereits geladenen ZIP, Bestellungen über den Browser.
+    """
+    _policy_state.manual = True
+    try:
+        if job["zip_path"] and os.path.exists(job["zip_path"]):
+            return process_downloaded_zip(job["job_key"], zip_path=job["zip_path"])
+        journal_record(job["job_key"], "reviewed")
+        search_order_multi_position(job["order_number"])
+        return True
+    finally:
+        _policy_state.manual = False
+
+# === Batch-Modus (Bestellnummern aus Datei oder stdin) ===
+
+def read_order_numbers(source=None):
+    """Liest Bestellnummern (eine pro Zeile, # = Kommentar) aus Datei oder stdin"""
+    if source in (None, "-"):
+        if sys.stdin is None:
+            # EXE ohne Konsole (--noconsole): es gibt kein stdin
+            raise ValueError("Ohne Konsole gibt es kein stdin - bitte eine Datei mit Bestellnummern angeben")
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    order_numbers = []
+    for line in lines:
+        order_number = line.split("#", 1)[0].strip()
+        if order_number and order_number not in order_numbers:
+            order_numbers.append(order_number)
+    return order_numbers
+
+def attach_log_file(command):
+    """
+    Leitet print-Ausgaben in logs/<command>_<zeit>.log um, wenn keine Konsole
+    vorhanden ist (EXE mit --noconsole: sys.stdout ist None).
+
+    Returns:
+        str: Pfad der Logdatei oder None
+    """
+    if sys.stdout is not None:
+        return None
+    log_dir = os.path.join(BASE_DIR, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{command}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+    sys.stdout = sys.stderr = open(log_path, "a", encoding="utf-8", buffering=1)
+    return log_path
+
+def run_batch(order_numbers, concurrency=1, report_path=None, max_positions=None):
+    """
+    Verarbeitet eine Liste von Bestellnummern ohne GUI. Jeder Worker hat einen
+    eigenen Browser und Download-Ordner; das Ergebnis wird als JSON-Bericht
+    (mit Zeiten pro Bestellung) geschrieben.
+
+    Returns:
+        dict: Bericht
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Im Batch gelten die auto_confirm-Regeln immer; knappe Fälle gehen auf die Prüfliste
+    settings = get_config_section("auto_confirm")
+    if max_positions is not None:
+        settings["max_positions"] = max_positions
+    set_headless_mode(True)
+    set_confirmation_handler(confirmation_policy(settings))
+    report_path = report_path or os.path.join(BASE_DIR, f"batch_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    worker_state = threading.local()
+    worker_counter = {"next": 0}
+    counter_lock = threading.Lock()
+
+    def run_one(order_number):
+        if not ORDER_NUMBER_PATTERN.match(order_number):
+            return {"order": order_number, "status": "invalid", "seconds": 0.0}
+        if not hasattr(worker_state, "download_dir"):
+            with counter_lock:
+                worker_counter["next"] += 1
+                worker_id = worker_counter["next"]
+            worker_state.download_dir = os.path.join(DOWNLOAD_DIR, "_batch", f"worker_{worker_id}")
+            os.makedirs(worker_state.download_dir, exist_ok=True)
+        try:
+            result = process_order(order_number, download_dir=worker_state.download_dir)
+        except Exception as e:
+            result = {"order": order_number, "status": "error", "error": str(e), "seconds": None}
+        print(f"[Batch] {order_number}: {result['status']} ({result.get('seconds')}s)")
+        return result
+
+    started = datetime.now()
+    start = time.perf_counter()
+    print(f"=== Batch: {len(order_numbers)} Bestellung(en), {concurrency} parallel ===")
+    try:
+        resume_pending_deliveries()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            results = list(pool.map(run_one, order_numbers))
+        wait_for_deliveries()
+    finally:
+        set_confirmation_handler(None)
+
+    summary = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    auto_approved = sum(result.get("auto_approved", 0) for result in results)
+    escalated = sum(result.get("escalated", 0) for result in results)
+    report = {
+        "started": started.isoformat(),
+        "finished": datetime.now().isoformat(),
+        "seconds": round(time.perf_counter() - start, 3),
+        "concurrency": concurrency,
+        "auto_confirm": settings,
+        "summary": summary,
+        "auto_approved": auto_approved,
+        "escalated": escalated,
+        "template_cache": template_cache_stats(),
+        "delivery": delivery_stats(),
+        "orders": results,
+    }
+    atomic_write_json(report_path, report)
+    record_timing("batch", report["seconds"], orders=len(order_numbers), concurrency=concurrency)
+    print(f"Batch abgeschlossen: {summary}")
+    print(f"Automatisch bestätigt: {auto_approved} | Zur Prüfung: {escalated}")
+    print(f"Bericht: {report_path}")
+    return report
 
 # === GUI ===
-def start_gui():
+def start_gui(startup_probe=None):
+    """
+    Startet das Hauptfenster.
+
+    Args:
+        startup_probe (str): Optionaler Dateipfad; sobald das Fenster sichtbar ist,
+            wird dort der Zeitstempel abgelegt und die GUI wieder geschlossen
+            (für benchmark-startup).
+    """
+    load_tk()
     window = tk.Tk()
     window.title("Amazon Seller Central - Bestellungssuche & Verarbeitung mit Heizungstyp-Erkennung")
-    window.geometry("500x400")
+    window.geometry("500x460")
     
     # Titel
     tk.Label(window, text="INFRAROTHEIZUNG DRUCKDATEI-GENERATOR", 
              font=("Arial", 14, "bold"), fg="red").pack(pady=(20, 5))
     
     tk.Label(window, text="Hinweis: Cookies bleiben gültig bis sie ablaufen", 
-             font=("Arial", 9), fg="gray").pack(pady=(5, 15))
+             font=("Arial", 9), fg="gray").pack(pady=(5, 0))
+
+    session_status_label = tk.Label(window, text="Session: wird geprüft...", 
+                                    font=("Arial", 9), fg="gray")
+    session_status_label.pack(pady=(0, 10))
     
     # Bestellnummer eingeben
     tk.Label(window, text="Bestellnummer eingeben:", font=("Arial", 12)).pack(pady=5)
@@ -1749,7 +5795,7 @@ def start_gui():
         if order_number:
             threading.Thread(target=search_order_multi_position, args=(order_number,), daemon=True).start()
         else:
-            safe_messagebox(messagebox.showwarning, "Hinweis", "Bitte eine Bestellnummer eingeben.")
+            safe_messagebox("showwarning", "Hinweis", "Bitte eine Bestellnummer eingeben.")
 
     def on_barcode_input(event):
         # Der Barcode-Scanner sendet die Daten + Enter
@@ -1778,13 +5824,18 @@ def start_gui():
               font=("Arial", 10), width=40).pack(pady=2)
     
     tk.Button(window, text="📊 Cookie-Status prüfen", 
-              command=check_cookie_status,
+              command=lambda: threading.Thread(target=check_cookie_status, daemon=True).start(),
               font=("Arial", 10), width=40).pack(pady=2)
     
     tk.Button(window, text="⚙️ Heizungstypen konfigurieren", 
               command=edit_heating_config,
               font=("Arial", 10), width=40).pack(pady=2)
 
+    review_button = tk.Button(window, text="🔎 Prüfliste", 
+                              command=show_review_queue,
+                              font=("Arial", 10), width=40)
+    review_button.pack(pady=2)
+
     # Info-Bereich
     info_frame = tk.Frame(window, bg="#f0f0f0", relief=tk.RIDGE, bd=1)
     info_frame.pack(fill=tk.X, padx=20, pady=15)
@@ -1801,15 +5852,157 @@ def start_gui():
     tk.Label(info_frame, text="• Konfigurierbare Heizungsgrößen", 
              font=("Arial", 8), bg="#f0f0f0").pack(anchor="w", padx=10, pady=(0, 5))
 
+    # Session-Status im Hintergrund prüfen, damit Ablauf vor dem nächsten Scan auffällt
+    def show_session_status(result):
+        if result["valid"]:
+            session_status_label.config(text=f"Session: ✅ gültig (geprüft {datetime.now().strftime('%H:%M')})", fg="green")
+        elif result["valid"] is False:
+            session_status_label.config(text=f"Session: ❌ abgelaufen – bitte neu einloggen ({result['reason']})", fg="red")
+        else:
+            session_status_label.config(text=f"Session: ⚠️ nicht prüfbar ({result['reason'][:40]})", fg="orange")
+
+    def alert_session_expired(result):
+        show_session_status(result)
+        messagebox.showwarning("Session abgelaufen",
+            "Die Seller-Central-Session ist abgelaufen.\n\n"
+            "Bitte jetzt neu einloggen, damit der nächste Scan nicht fehlschlägt.")
+
+    def run_session_probe():
+        result = probe_session(force=True)
+        window.after(0, lambda: show_session_status(result))
+
+    def schedule_session_probe():
+        threading.Thread(target=run_session_probe, daemon=True).start()
+        interval = get_config_section("session_probe")["background_interval_seconds"]
+        window.after(int(interval * 1000), schedule_session_probe)
+
+    # Anzahl offener Prüffälle im Button anzeigen
+    def refresh_review_count():
+        count = len(journal_review_jobs())
+        review_button.config(text=f"🔎 Prüfliste ({count})" if count else "🔎 Prüfliste")
+        window.after(5000, refresh_review_count)
+
+    # Nach einem Absturz heruntergeladene, aber nicht gerenderte Positionen anbieten
+    def offer_journal_resume():
+        pending = journal_resumable_jobs()
+        if pending and messagebox.askyesno("Unterbrochene Verarbeitung",
+                f"{len(pending)} Position(en) wurden heruntergeladen, aber nicht fertig verarbeitet.\n\n"
+                "Jetzt ohne erneuten Download fortsetzen?"):
+            threading.Thread(target=resume_downloaded_jobs, daemon=True).start()
+        threading.Thread(target=resume_pending_deliveries, daemon=True).start()
+
     # Hinweis
     tk.Label(window, text="Hinweis: Cookies sind ca. 12 Stunden gültig | Barcode-Scanner unterstützt", 
              font=("Arial", 8), fg="gray").pack(pady=(10, 5))
     
+    if startup_probe:
+        def report_first_window(event=None):
+            if getattr(window, "_probe_reported", False):
+                return
+            window._probe_reported = True
+            with open(startup_probe, 'w') as f:
+                f.write(str(time.time()))
+            window.after(0, window.destroy)
+        window.bind("<Map>", report_first_window)
+    else:
+        # Konfiguration und schwere Module erst laden, wenn das Fenster steht
+        window.after(200, lambda: threading.Thread(target=warm_up_heavy_modules, daemon=True).start())
+        window.after(500, schedule_session_probe)
+        window.after(1500, offer_journal_resume)
+        window.after(2000, refresh_review_count)
+        if get_config_section("auto_confirm")["enabled"]:
+            set_confirmation_handler(confirmation_policy())
+        window.after(1000, lambda: start_session_keepalive(
+            on_expired=lambda result: window.after(0, lambda: alert_session_expired(result)),
+            on_result=lambda result: window.after(0, lambda: show_session_status(result))
+        ))
+
     # Automatisch nach Barcode-Eingabe suchen
     window.mainloop()
 
 # === Programmstart ===
+def main(argv=None):
+    """Startet ohne Argumente die GUI, sonst das gewählte Kommando"""
+    parser = argparse.ArgumentParser(description="Amazon Seller Central - Druckdatei-Generator")
+    subparsers = parser.add_subparsers(dest="command")
+
+    standin_parser = subparsers.add_parser("standin-server", help="Lokalen Seller-Central-Stand-in starten")
+    standin_parser.add_argument("--host", default="127.0.0.1")
+    standin_parser.add_argument("--port", type=int, default=8700)
+
+    benchmark_parser = subparsers.add_parser("benchmark-browser", help="Browser-Profile gegen den Stand-in messen")
+    benchmark_parser.add_argument("--runs", type=int, default=3)
+
+    subparsers.add_parser("profile-imports", help="Importzeiten der schweren Module auflisten")
+
+    broker_parser = subparsers.add_parser("broker", help="Session-Broker für mehrere Stationen starten")
+    broker_parser.add_argument("--host")
+    broker_parser.add_argument("--port", type=int)
+
+    batch_parser = subparsers.add_parser("batch", help="Bestellnummern aus Datei oder stdin ohne GUI verarbeiten")
+    batch_parser.add_argument("source", nargs="?", default="-", help="Datei mit einer Bestellnummer pro Zeile (- = stdin)")
+    batch_parser.add_argument("--concurrency", type=int, default=1)
+    batch_parser.add_argument("--report", help="Pfad des JSON-Berichts")
+    batch_parser.add_argument("--max-positions", type=int,
+                              help="Überschreibt auto_confirm.max_positions")
+
+    watch_parser = subparsers.add_parser("watch", help="Hot-Folder überwachen und ZIPs ohne Browser rendern")
+    watch_parser.add_argument("--inbox")
+    watch_parser.add_argument("--workers", type=int)
+
+    impose_parser = subparsers.add_parser("impose", help="Kleine Platten auf Sammelbögen ausschießen")
+    impose_parser.add_argument("tiffs", nargs="*", help="TIFF-Dateien (ohne Angabe: fertige Platten aus dem Job-Journal)")
+
+    render_parser = subparsers.add_parser("render-server", help="Render-Server (SVG -> TIFF) starten")
+    render_parser.add_argument("--host")
+    render_parser.add_argument("--port", type=int)
+    render_parser.add_argument("--workers", type=int)
+
+    startup_parser = subparsers.add_parser("benchmark-startup", help="Zeit bis zum ersten Fenster messen (Kaltstart)")
+    startup_parser.add_argument("--runs", type=int, default=5)
+
+    parser.add_argument("--startup-probe", help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    if args.command:
+        attach_log_file(args.command)
+
+    if args.command == "standin-server":
+        run_standin_server(args.host, args.port)
+    elif args.command == "benchmark-browser":
+        benchmark_browser_profiles(runs=args.runs)
+    elif args.command == "profile-imports":
+        profile_imports()
+    elif args.command == "broker":
+        run_session_broker(args.host, args.port)
+    elif args.command == "batch":
+        try:
+            order_numbers = read_order_numbers(args.source)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(2)
+        report = run_batch(order_numbers, args.concurrency, args.report, args.max_positions)
+        if any(result["status"] not in ("done", "cached", "review")
+               or result.get("failed", 0) > result.get("review", 0) for result in report["orders"]):
+            sys.exit(1)
+    elif args.command == "watch":
+        watch_hot_folder(args.inbox, args.workers)
+    elif args.command == "impose":
+        run_imposition(args.tiffs or None)
+        wait_for_deliveries()
+    elif args.command == "render-server":
+        run_render_server(args.host, args.port, args.workers)
+    elif args.command == "benchmark-startup":
+        benchmark_cold_start(runs=args.runs)
+    else:
+        # Konfiguration wird nach dem Öffnen des Fensters im Hintergrund geladen
+        start_gui(startup_probe=args.startup_probe)
+
+# Ladezeit des Moduls selbst (ohne die verzögert geladenen Subsysteme)
+MODULE_LOAD_SECONDS = time.perf_counter() - _MODULE_LOAD_START
+
 if __name__ == "__main__":
-    # Erstelle Standard-Config beim ersten Start
-    load_config()
-    start_gui()
+    # Nötig für die Render-Worker-Prozesse in der PyInstaller-EXE
+    import multiprocessing
+    multiprocessing.freeze_support()
+    main()
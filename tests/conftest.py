@@ -0,0 +1,48 @@
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Amazon_seller_selenium as app_module
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Modul mit allen Datei-Pfaden in einem temporären Verzeichnis"""
+    download_dir = tmp_path / "amazon_order_downloads"
+    paths = {
+        "BASE_DIR": tmp_path,
+        "COOKIE_FILE": tmp_path / "amazon_cookies.pkl",
+        "SESSION_FILE": tmp_path / "amazon_session_info.json",
+        "DOWNLOAD_DIR": download_dir,
+        "PERFORMANCE_LOG": tmp_path / "performance_log.jsonl",
+        "SELECTOR_STATS_FILE": tmp_path / "selector_stats.json",
+        "PRODUCT_MEMO_FILE": tmp_path / "product_memo.json",
+        "JOB_JOURNAL_DB": tmp_path / "job_journal.sqlite3",
+        "JOURNAL_ZIP_DIR": download_dir / "_journal_zips",
+        "RESULT_CACHE_DIR": tmp_path / "tiff_cache",
+        "RESULT_CACHE_INDEX": tmp_path / "tiff_cache" / "index.json",
+        "IMPOSITION_DIR": tmp_path / "imposition",
+        "IMPOSITION_INDEX": tmp_path / "imposition" / "index.json",
+        "RENDER_JOBS_DIR": tmp_path / "render_jobs",
+    }
+    for name, path in paths.items():
+        monkeypatch.setattr(app_module, name, str(path))
+    app_module.set_headless_mode(True)
+    yield app_module
+    app_module.set_headless_mode(False)
+
+
+@pytest.fixture
+def render_libs(app, monkeypatch):
+    """PIL und lxml für Tests, die Bilder prüfen, aber nicht rastern (cairosvg optional)"""
+    from PIL import Image
+    from lxml import etree
+    monkeypatch.setattr(app, "Image", Image)
+    monkeypatch.setattr(app, "etree", etree)
+    if app.cairosvg is None:
+        monkeypatch.setattr(app, "cairosvg", types.SimpleNamespace())
+    return app
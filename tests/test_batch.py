@@ -0,0 +1,33 @@
+import io
+import os
+import sys
+
+import pytest
+
+
+def test_read_order_numbers_from_file(app, tmp_path):
+    source = tmp_path / "orders.txt"
+    source.write_text("303-1234567-1234567\n# Kommentar\n303-1234567-1234567\n028-7654321-7654321 # eilig\n")
+    assert app.read_order_numbers(str(source)) == ["303-1234567-1234567", "028-7654321-7654321"]
+
+
+def test_read_order_numbers_without_stdin(app, monkeypatch):
+    monkeypatch.setattr(sys, "stdin", None)
+    with pytest.raises(ValueError):
+        app.read_order_numbers("-")
+
+
+def test_read_order_numbers_from_stdin(app, monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("303-1234567-1234567\n"))
+    assert app.read_order_numbers("-") == ["303-1234567-1234567"]
+
+
+def test_log_file_without_console(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "stdout", None)
+    monkeypatch.setattr(sys, "stderr", None)
+    log_path = app.attach_log_file("batch")
+    print("Batch abgeschlossen")
+    sys.stdout.close()
+    assert os.path.dirname(log_path) == str(tmp_path / "logs")
+    with open(log_path, encoding="utf-8") as f:
+        assert "Batch abgeschlossen" in f.read()
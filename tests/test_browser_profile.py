@@ -0,0 +1,45 @@
+import os
+
+
+def settings():
+    return {"profile_dir": "chrome_profile", "max_profile_clones": 2}
+
+
+def make_warm(profile_dir):
+    os.makedirs(os.path.join(profile_dir, "Default"), exist_ok=True)
+    with open(os.path.join(profile_dir, "Default", "Cookies"), "w") as f:
+        f.write("sqlite")
+
+
+def test_main_profile_is_preferred(app, tmp_path):
+    make_warm(tmp_path / "chrome_profile")
+    profile_dir, state = app.acquire_browser_profile(settings())
+    assert profile_dir == str(tmp_path / "chrome_profile") and state == "warm"
+    app.release_profile_lock(profile_dir)
+
+
+def test_no_clone_while_main_profile_is_in_use(app, tmp_path):
+    main_profile = str(tmp_path / "chrome_profile")
+    make_warm(main_profile)
+    assert app.acquire_profile_lock(main_profile)  # läuft in einem anderen Worker
+
+    profile_dir, state = app.acquire_browser_profile(settings())
+    assert profile_dir.endswith("clone_1") and state == "cold"
+    assert not os.path.exists(os.path.join(profile_dir, "Default"))
+    app.release_profile_lock(profile_dir)
+    app.release_profile_lock(main_profile)
+
+
+def test_clone_is_not_trusted_as_warm(app, tmp_path):
+    main_profile = str(tmp_path / "chrome_profile")
+    make_warm(main_profile)
+    clone_dir = str(tmp_path / "chrome_profile_clones" / "clone_1")
+    os.makedirs(clone_dir)
+    assert app._clone_main_profile(main_profile, clone_dir)
+    assert os.path.exists(os.path.join(clone_dir, "Default", "Cookies"))
+
+    assert app.acquire_profile_lock(main_profile)
+    profile_dir, state = app.acquire_browser_profile(settings())
+    assert profile_dir == clone_dir and state == "clone"
+    app.release_profile_lock(profile_dir)
+    app.release_profile_lock(main_profile)
@@ -0,0 +1,52 @@
+import os
+
+
+def enable_delivery(app, tmp_path, destination):
+    config = app.load_config()
+    config["delivery"] = dict(config["delivery"], enabled=True, destinations=[str(destination)],
+                              chunk_mb=1, retry_delay=0)
+    app.save_config(config)
+
+
+def test_resumes_partial_copy(app, tmp_path):
+    source = tmp_path / "job.tiff"
+    data = os.urandom(3 * 1024 * 1024)
+    source.write_bytes(data)
+    destination = tmp_path / "rip"
+    destination.mkdir()
+    (destination / "job.tiff.part").write_bytes(data[:1024 * 1024])
+
+    copied, resumed = app._copy_resumable(str(source), str(destination / "job.tiff"),
+                                          app.file_sha256(str(source)), 256 * 1024)
+    assert resumed == 1024 * 1024
+    assert copied == 2 * 1024 * 1024
+    assert (destination / "job.tiff").read_bytes() == data
+    assert not (destination / "job.tiff.part").exists()
+
+
+def test_corrupt_part_is_retried_from_scratch(app, tmp_path):
+    enable_delivery(app, tmp_path, tmp_path / "rip")
+    source = tmp_path / "job.tiff"
+    source.write_bytes(os.urandom(100000))
+    (tmp_path / "rip").mkdir()
+    (tmp_path / "rip" / "job.tiff.part").write_bytes(b"kaputt")
+
+    assert app.deliver_tiff("job", str(source), str(tmp_path / "rip"))
+    assert (tmp_path / "rip" / "job.tiff").read_bytes() == source.read_bytes()
+
+
+def test_restored_order_is_delivered_once(app, tmp_path):
+    enable_delivery(app, tmp_path, tmp_path / "rip")
+    source = tmp_path / "123-1234567-1234567_pos1.tiff"
+    source.write_bytes(b"tiff-daten")
+
+    app.queue_restored_deliveries([str(source)])
+    app.wait_for_deliveries()
+    assert app.journal_get("123-1234567-1234567_pos1")["stage"] == "delivered"
+    delivered = tmp_path / "rip" / source.name
+    assert delivered.read_bytes() == b"tiff-daten"
+
+    delivered.unlink()  # vom RIP abgeholt
+    app.queue_restored_deliveries([str(source)])
+    app.wait_for_deliveries()
+    assert not delivered.exists()
@@ -0,0 +1,19 @@
+import zipfile
+
+
+def make_zip(path, content):
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        zip_ref.writestr("customization.json", content)
+    return str(path)
+
+
+def test_same_name_different_content_gets_own_key(app, tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    first = make_zip(tmp_path / "a" / "customization.zip", '{"order": 1}')
+    second = make_zip(tmp_path / "b" / "customization.zip", '{"order": 2}')
+
+    first_key = app._hot_folder_job_key(first)
+    assert first_key.startswith("customization_")
+    assert first_key != app._hot_folder_job_key(second)
+    assert first_key == app._hot_folder_job_key(first)
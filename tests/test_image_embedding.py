@@ -0,0 +1,31 @@
+import io
+
+
+def test_palette_png_is_reduced(render_libs, tmp_path):
+    from PIL import Image
+    app = render_libs
+    image_path = tmp_path / "logo.png"
+    Image.new("RGB", (800, 600), "red").convert("P", palette=Image.ADAPTIVE).save(image_path)
+
+    data, mime_type = app.load_image_for_embedding(str(image_path), (200, 150))
+    reduced = Image.open(io.BytesIO(data))
+    assert reduced.size == (200, 150)
+    assert mime_type == "image/jpeg"
+
+
+def test_palette_png_with_transparency_keeps_alpha(render_libs, tmp_path):
+    from PIL import Image
+    app = render_libs
+    image_path = tmp_path / "logo.png"
+    Image.new("RGBA", (800, 600), (255, 0, 0, 0)).convert("P").save(image_path, transparency=0)
+
+    data, mime_type = app.load_image_for_embedding(str(image_path), (200, 150))
+    assert mime_type == "image/png"
+    assert Image.open(io.BytesIO(data)).mode == "RGBA"
+
+
+def test_unreadable_image_embeds_original(render_libs, tmp_path):
+    app = render_libs
+    image_path = tmp_path / "kaputt.png"
+    image_path.write_bytes(b"keine Bilddaten")
+    assert app.load_image_for_embedding(str(image_path), (200, 150)) == (b"keine Bilddaten", "image/jpeg")
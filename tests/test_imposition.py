@@ -0,0 +1,60 @@
+def rendered_job(app, tmp_path, job_key, **fields):
+    tiff_path = tmp_path / f"{job_key}.tiff"
+    tiff_path.write_bytes(b"tiff")
+    app.journal_record(job_key, "rendered", tiff_path=str(tiff_path), error=None, **fields)
+    return str(tiff_path)
+
+
+def test_delivered_panels_are_not_imposed_again(app, tmp_path):
+    pending = rendered_job(app, tmp_path, "A_pos1")
+    rendered_job(app, tmp_path, "B_pos1")
+    app.journal_record("B_pos1", "delivered", error=None)
+    rendered_job(app, tmp_path, "C_pos1")
+    app.journal_record("C_pos1", "rendered", error=app.DELIVERY_PENDING)
+    rendered_job(app, tmp_path, "D_pos1")
+    app.journal_record("D_pos1", "imposed", error=None)
+
+    assert app.imposition_candidate_paths() == [pending]
+
+
+def test_sheet_length_is_capped_by_memory_limit(app):
+    settings = app.get_config_section("imposition")
+    settings.update(sheet_width_mm=1600, max_sheet_length_mm=3000, dpi=150, max_sheet_mb=400)
+    length = app.max_sheet_length_mm(settings)
+    assert length < 3000
+    width_px = 1600 * 150 / 25.4
+    assert width_px * (length * 150 / 25.4) * 3 <= 400 * 1024 * 1024 + 1
+
+
+def overlaps(a, b):
+    return not (a[0] >= b[0] + b[2] or b[0] >= a[0] + a[2] or a[1] >= b[1] + b[3] or b[1] >= a[1] + a[3])
+
+
+def test_maxrects_packs_without_overlap(app):
+    import random
+
+    rng = random.Random(1)
+    panels = [{"tiff_path": str(i), "width": rng.choice([500, 600, 380]), "height": rng.choice([380, 500])}
+              for i in range(300)]
+    sheets, unplaced = app.pack_panels(panels, 1590, 2990, 10, 3)
+    assert not unplaced
+    assert sum(len(sheet) for sheet in sheets) == len(panels)
+    for sheet in sheets:
+        rects = []
+        for panel, x, y, rotated in sheet:
+            width, height = (panel["height"], panel["width"]) if rotated else (panel["width"], panel["height"])
+            rect = (x, y, width + 16, height + 16)
+            assert rect[0] + rect[2] <= 1590 and rect[1] + rect[3] <= 2990
+            assert not any(overlaps(rect, other) for other in rects)
+            rects.append(rect)
+
+
+def test_maxrects_rotates_to_fit(app):
+    sheets, unplaced = app.pack_panels([{"tiff_path": "a", "width": 500, "height": 380}], 400, 600, 0, 0)
+    assert not unplaced
+    assert sheets[0][0][3] is True
+
+
+def test_oversized_panel_is_reported(app):
+    sheets, unplaced = app.pack_panels([{"tiff_path": "a", "width": 2000, "height": 2000}], 1590, 2990, 10, 3)
+    assert sheets == [] and len(unplaced) == 1
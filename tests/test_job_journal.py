@@ -0,0 +1,26 @@
+def test_completed_tiff_requires_current_render_settings(app, tmp_path):
+    tiff_path = tmp_path / "123-1234567-1234567_pos1.tiff"
+    tiff_path.write_bytes(b"tiff")
+    app.journal_record("123-1234567-1234567_pos1", "rendered", zip_sha256="abc", tiff_path=str(tiff_path),
+                       settings_fingerprint=app.render_settings_fingerprint())
+    assert app.journal_completed_tiff("123-1234567-1234567_pos1", "abc") == str(tiff_path)
+
+    config = app.load_config()
+    config["quality_settings"]["min_dpi"] = 300
+    app.save_config(config)
+    assert app.journal_completed_tiff("123-1234567-1234567_pos1", "abc") is None
+
+
+def test_completed_tiff_ignores_rows_without_fingerprint(app, tmp_path):
+    tiff_path = tmp_path / "old.tiff"
+    tiff_path.write_bytes(b"tiff")
+    app.journal_record("old", "rendered", tiff_path=str(tiff_path))
+    assert app.journal_completed_tiff("old") is None
+
+
+def test_completed_tiff_rejects_other_zip(app, tmp_path):
+    tiff_path = tmp_path / "job.tiff"
+    tiff_path.write_bytes(b"tiff")
+    app.journal_record("job", "rendered", zip_sha256="abc", tiff_path=str(tiff_path),
+                       settings_fingerprint=app.render_settings_fingerprint())
+    assert app.journal_completed_tiff("job", "def") is None
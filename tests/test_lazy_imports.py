@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_module_import_does_not_load_tkinter():
+    output = subprocess.check_output(
+        [sys.executable, "-c", "import sys, Amazon_seller_selenium; "
+                               "print(sorted(m for m in ('tkinter', 'selenium', 'PIL') if m in sys.modules))"],
+        cwd=REPO_DIR, text=True)
+    assert output.strip() == "[]"
+
+
+def test_headless_messages_do_not_need_tkinter(app, capsys):
+    app.safe_messagebox("showerror", "Fehler", "Keine SVG-Datei gefunden")
+    assert "[showerror] Fehler: Keine SVG-Datei gefunden" in capsys.readouterr().out
+    assert app.tk is None
@@ -0,0 +1,24 @@
+import pytest
+
+
+def test_without_lease_dir_uses_station_dir(app):
+    assert app.lease_download_dirs(None, "C:/downloads") == ("C:/downloads", "C:/downloads")
+    assert app.lease_download_dirs({"lease_id": "x", "download_dir": None}) == (None, None)
+
+
+def test_lease_dir_is_mapped_to_local_share(app, tmp_path):
+    share = tmp_path / "share"
+    share.mkdir()
+    config = app.load_config()
+    config["broker"] = dict(config["broker"], local_download_dir=str(share))
+    app.save_config(config)
+
+    lease = {"lease_id": "abc", "download_dir": "D:/rip_downloads"}
+    assert app.lease_download_dirs(lease, "ignored") == ("D:/rip_downloads", str(share))
+    assert list(share.iterdir()) == []
+
+
+def test_unreachable_lease_dir_fails_clearly(app, tmp_path):
+    lease = {"lease_id": "abc", "download_dir": str(tmp_path / "fehlt")}
+    with pytest.raises(ValueError, match="local_download_dir"):
+        app.lease_download_dirs(lease)
@@ -0,0 +1,28 @@
+import io
+import json
+import zipfile
+
+
+def make_order_zip(path, size):
+    from PIL import Image
+    image = io.BytesIO()
+    Image.new("RGB", size, "white").save(image, "JPEG")
+    data = {"customizationInfo": {"version3.0": {"surfaces": [{"areas": [
+        {"customizationType": "ImagePrinting", "Dimensions": {"width": 600, "height": 500}}]}]}}}
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        zip_ref.writestr("order.json", json.dumps(data))
+        zip_ref.writestr("foto.jpg", image.getvalue())
+    return str(path)
+
+
+def test_typical_4_3_photo_passes(render_libs, tmp_path):
+    app = render_libs
+    zip_path = make_order_zip(tmp_path / "order.zip", (4800, 3600))
+    assert app.preflight_check(zip_path, "123-1234567-1234567", interactive=False)
+
+
+def test_low_resolution_goes_to_review_without_operator(render_libs, tmp_path):
+    app = render_libs
+    zip_path = make_order_zip(tmp_path / "order.zip", (1200, 900))
+    assert not app.preflight_check(zip_path, "123-1234567-1234567", interactive=False)
+    assert app.take_review_reason().startswith("Preflight:")
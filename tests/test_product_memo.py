@@ -0,0 +1,30 @@
+def test_identifier_from_top_level(app):
+    data = {"asin": "B0ABC12345", "sku": "HEIZ-130", "customizationData": {"children": []}}
+    assert app.find_product_identifier(data) == "asin:B0ABC12345"
+
+
+def test_identifier_ignores_nested_values(app):
+    data = {"sku": "HEIZ-130",
+            "customizationData": {"children": [{"asin": "B0ZUBEHOER1", "templateId": "fremd"}]}}
+    assert app.find_product_identifier(data) == "sku:HEIZ-130"
+
+
+def test_identifier_from_customization_info(app):
+    data = {"customizationInfo": {"templateId": "T-42", "version3.0": {"surfaces": []}}}
+    assert app.find_product_identifier(data) == "template:T-42"
+    assert app.find_product_identifier({"customizationData": {"children": [{"sku": "x"}]}}) is None
+
+
+def test_memo_round_trip(app):
+    dimensions = {"width": 500, "height": 380, "ratio": 500 / 380, "heating_type": "130W Standard"}
+    template = {"template_hash": "abc", "slot": {"width": "500"}}
+    app.remember_product("asin:B0ABC12345", dimensions, template)
+
+    memo_dimensions, mismatch = app.lookup_product_memo("asin:B0ABC12345", dict(dimensions), template)
+    assert mismatch is None
+    assert memo_dimensions["heating_type"] == "130W Standard"
+    assert "slot" not in app._load_product_memo()["asin:B0ABC12345"]
+
+    memo_dimensions, mismatch = app.lookup_product_memo("asin:B0ABC12345", dict(dimensions),
+                                                        dict(template, template_hash="neu"))
+    assert memo_dimensions is None and mismatch
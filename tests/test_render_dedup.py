@@ -0,0 +1,23 @@
+def test_dedup_only_inside_an_order_scope(app, tmp_path):
+    tiff_path = tmp_path / "customization.tiff"
+    tiff_path.write_bytes(b"tiff")
+
+    # Hot-Folder/Render-Server: kein Scope, nichts wird gemerkt
+    app.register_shared_render("customization", "key", str(tiff_path))
+    assert app.find_shared_render("customization", "key") is None
+    assert "customization" not in app._render_dedup
+
+    app.begin_render_dedup("123-1234567-1234567")
+    app.register_shared_render("123-1234567-1234567_pos1", "key", str(tiff_path))
+    assert app.has_shared_render("123-1234567-1234567_pos2", "key")
+    assert app.find_shared_render("123-1234567-1234567_pos2", "key") == str(tiff_path)
+    assert app.pop_render_dedup_stats("123-1234567-1234567") == 1
+    assert app.find_shared_render("123-1234567-1234567_pos3", "key") is None
+
+
+def test_dedup_table_is_bounded(app):
+    for number in range(app.RENDER_DEDUP_MAX_ORDERS + 10):
+        app.begin_render_dedup(f"order-{number}")
+    assert len(app._render_dedup) == app.RENDER_DEDUP_MAX_ORDERS
+    assert "order-0" not in app._render_dedup
+    app._render_dedup.clear()
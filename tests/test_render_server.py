@@ -0,0 +1,47 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+
+@pytest.fixture
+def render_server(app):
+    config = app.load_config()
+    config["render_service"] = dict(config["render_service"], token="geheim", max_upload_mb=0.01)
+    app.save_config(config)
+    server = app.create_render_server(host="127.0.0.1", port=0, workers=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    server.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def status_of(request):
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_render_server_refuses_open_network_bind(app):
+    with pytest.raises(ValueError):
+        app.create_render_server(host="0.0.0.0", port=0, workers=1)
+
+
+def test_render_server_requires_token(app, render_server):
+    assert status_of(urllib.request.Request(f"{render_server}/health")) == 403
+    assert status_of(urllib.request.Request(f"{render_server}/health",
+                                            headers={"X-Render-Token": "falsch"})) == 403
+    assert status_of(app._render_service_request(f"{render_server}/health")) == 200
+
+
+def test_render_server_rejects_oversized_upload(app, render_server):
+    request = app._render_service_request(f"{render_server}/jobs?order=123", data=b"x" * 20000,
+                                          headers={"Content-Type": "application/zip"})
+    assert status_of(request) == 413
+    with urllib.request.urlopen(app._render_service_request(f"{render_server}/metrics"), timeout=5) as response:
+        assert json.loads(response.read())["jobs_total"] == 0
@@ -0,0 +1,64 @@
+import os
+
+
+def configure(app, **result_cache):
+    config = app.load_config()
+    config["result_cache"] = dict(config["result_cache"], **result_cache)
+    app.save_config(config)
+
+
+def test_cache_key_follows_content_and_settings(app):
+    key = app.result_cache_key(None, "a" * 64)
+    assert key == app.result_cache_key(None, "a" * 64)
+    assert key != app.result_cache_key(None, "b" * 64)
+
+    config = app.load_config()
+    config["quality_settings"] = dict(app.get_config_section("quality_settings"), changed=True)
+    app.save_config(config)
+    assert app.result_cache_key(None, "a" * 64) != key
+
+
+def test_disabled_cache_has_no_key(app):
+    configure(app, enabled=False)
+    assert app.result_cache_key(None, "a" * 64) is None
+
+
+def test_store_and_restore_order(app, tmp_path):
+    tiffs = []
+    for position in (1, 2):
+        tiff = tmp_path / f"render_{position}.tiff"
+        tiff.write_bytes(os.urandom(1000))
+        tiffs.append(tiff)
+        app.store_cached_result(app.result_cache_key(None, str(position) * 64), str(tiff),
+                                f"123-1234567-1234567_pos{position}")
+    app.remember_order_positions("123-1234567-1234567",
+                                 ["123-1234567-1234567_pos1", "123-1234567-1234567_pos2"])
+
+    restored = app.restore_cached_order("123-1234567-1234567")
+    assert [open(path, "rb").read() for path in restored] == [tiff.read_bytes() for tiff in tiffs]
+    assert app.restore_cached_order("999-1234567-1234567") is None
+
+
+def test_eviction_drops_least_recently_used(app, tmp_path):
+    configure(app, max_size_mb=1)
+    tiff = tmp_path / "render.tiff"
+    tiff.write_bytes(os.urandom(600 * 1024))
+    old_key, new_key = app.result_cache_key(None, "1" * 64), app.result_cache_key(None, "2" * 64)
+    app.store_cached_result(old_key, str(tiff), "alt_pos1")
+    app.store_cached_result(new_key, str(tiff), "neu_pos1")
+
+    assert app.restore_cached_result(old_key, "alt_pos1") is None
+    assert app.restore_cached_result(new_key, "neu_pos1")
+
+
+def test_restore_order_misses_after_settings_change(app, tmp_path):
+    tiff = tmp_path / "render.tiff"
+    tiff.write_bytes(os.urandom(1000))
+    app.store_cached_result(app.result_cache_key(None, "1" * 64), str(tiff), "123-1234567-1234567_pos1")
+    app.remember_order_positions("123-1234567-1234567", ["123-1234567-1234567_pos1"])
+    assert app.restore_cached_order("123-1234567-1234567")
+
+    config = app.load_config()
+    config["heating_panels"] = dict(config.get("heating_panels", {}), neu={"width": 600, "height": 500})
+    app.save_config(config)
+    assert app.restore_cached_order("123-1234567-1234567") is None
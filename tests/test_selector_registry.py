@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def registry(app, monkeypatch):
+    monkeypatch.setattr(app, "_selector_stats", None)
+    monkeypatch.setattr(app, "_selector_stats_dirty", False)
+    return app
+
+
+def test_orders_by_last_success_then_hits(registry):
+    app = registry
+    selectors = ["#a", "#b", "#c", "#d"]
+    assert app.get_ordered_selectors("button", selectors) == selectors
+
+    for _ in range(3):
+        app.record_selector_result("button", "#c", True)
+    app.record_selector_result("button", "#b", True)
+    app.record_selector_result("button", "#a", False)
+    assert app.get_ordered_selectors("button", selectors) == ["#b", "#c", "#a", "#d"]
+
+
+def test_results_persist(registry, monkeypatch):
+    app = registry
+    app.record_selector_result("button", "#b", True)
+    app.record_selector_result("button", "#a", False)
+    app.flush_selector_stats()
+
+    with open(app.SELECTOR_STATS_FILE, encoding="utf-8") as f:
+        stats = json.load(f)
+    assert stats["button"]["last_success"] == "#b"
+    assert stats["button"]["selectors"]["#a"]["misses"] == 1
+
+    monkeypatch.setattr(app, "_selector_stats", None)
+    assert app.get_ordered_selectors("button", ["#a", "#b"]) == ["#b", "#a"]
+
+
+def test_known_winner_gets_full_timeout_and_others_probe(registry, monkeypatch):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+
+    app = registry
+    waits = []
+    present = {"#neu"}
+
+    class RecordingWait:
+        def __init__(self, driver, timeout):
+            self.driver = driver
+            waits.append(timeout)
+
+        def until(self, method):
+            result = method(self.driver)
+            if not result:
+                raise TimeoutException()
+            return result
+
+    monkeypatch.setattr(app, "WebDriverWait", RecordingWait)
+    monkeypatch.setattr(app, "By", By)
+    condition = lambda locator: (lambda driver: locator[1] if locator[1] in present else False)
+
+    # Ohne Historie: volles Timeout für jeden Selektor
+    assert app.find_with_selector_registry(None, "button", ["#alt", "#neu"], condition=condition,
+                                           timeout=5, probe_timeout=0.5) == ("#neu", "#neu")
+    assert waits == [5, 5]
+
+    # Der Gewinner verschwindet: er bekommt das volle Timeout, der Rest nur die Probe
+    waits.clear()
+    present = {"#alt"}
+    assert app.find_with_selector_registry(None, "button", ["#alt", "#neu", "#drei"], condition=condition,
+                                           timeout=5, probe_timeout=0.5) == ("#alt", "#alt")
+    assert waits == [5, 0.5]
+    assert app.get_ordered_selectors("button", ["#neu", "#alt"]) == ["#alt", "#neu"]
@@ -0,0 +1,28 @@
+import pytest
+
+
+def test_loopback_hosts(app):
+    assert app.is_loopback_host("127.0.0.1")
+    assert app.is_loopback_host("localhost")
+    assert app.is_loopback_host("::1")
+    assert not app.is_loopback_host("0.0.0.0")
+    assert not app.is_loopback_host("192.168.1.20")
+
+
+def test_network_host_requires_token(app):
+    app.check_service_token("Test", "127.0.0.1", "")
+    app.check_service_token("Test", "0.0.0.0", "geheim")
+    with pytest.raises(ValueError):
+        app.check_service_token("Test", "0.0.0.0", "")
+
+
+def test_token_matches(app):
+    assert app.token_matches("", None)
+    assert app.token_matches("geheim", "geheim")
+    assert not app.token_matches("geheim", "falsch")
+    assert not app.token_matches("geheim", None)
+
+
+def test_broker_refuses_open_network_bind(app):
+    with pytest.raises(ValueError):
+        app.create_session_broker(host="0.0.0.0", port=0)
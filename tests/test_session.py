@@ -0,0 +1,63 @@
+import json
+import os
+import pickle
+
+
+def store_cookies(app, cookies):
+    with open(app.COOKIE_FILE, "wb") as f:
+        pickle.dump(cookies, f)
+
+
+def cookie(name, value, domain=".amazon.de"):
+    return {"name": name, "value": value, "domain": domain, "path": "/"}
+
+
+def test_merge_set_cookies_updates_and_deletes(app):
+    cookies = [cookie("session-id", "alt"), cookie("x-main", "weg")]
+    merged, changes = app.merge_set_cookies(cookies, [
+        ("sellercentral.amazon.de", "session-id=neu; Domain=.amazon.de; Path=/"),
+        ("sellercentral.amazon.de", "x-main=; Domain=.amazon.de; Path=/; Max-Age=0"),
+    ])
+    assert changes == 2
+    assert {c["name"]: c["value"] for c in merged} == {"session-id": "neu"}
+
+
+def test_keepalive_does_not_overwrite_fresh_login(app, monkeypatch):
+    store_cookies(app, [cookie("session-id", "alt")])
+    with open(app.SESSION_FILE, "w") as f:
+        json.dump({"timestamp": "2026-01-01T08:00:00", "login_time": "2026-01-01T08:00:00"}, f)
+
+    def request_during_login(url, cookies, timeout=5):
+        # manual_login speichert neue Cookies, während der Keep-Alive läuft
+        store_cookies(app, [cookie("session-id", "frisch")])
+        os.utime(app.COOKIE_FILE, (1, 1))
+        return 200, url, [("sellercentral.amazon.de", "session-id=erneuert; Domain=.amazon.de; Path=/")]
+
+    monkeypatch.setattr(app, "http_get_with_cookies", request_during_login)
+    app.session_keepalive_once()
+    assert app.load_stored_cookies()[0]["value"] == "frisch"
+
+
+def test_keepalive_keeps_login_time(app, monkeypatch):
+    store_cookies(app, [cookie("session-id", "alt")])
+    with open(app.SESSION_FILE, "w") as f:
+        json.dump({"timestamp": "2026-01-01T08:00:00", "login_time": "2026-01-01T08:00:00"}, f)
+    monkeypatch.setattr(app, "http_get_with_cookies", lambda url, cookies, timeout=5: (
+        200, url, [("sellercentral.amazon.de", "session-id=erneuert; Domain=.amazon.de; Path=/")]))
+
+    result = app.session_keepalive_once()
+    assert result["updated_cookies"] == 1
+    assert app.load_stored_cookies()[0]["value"] == "erneuert"
+    session_info = app.load_session_info()
+    assert session_info["login_time"] == "2026-01-01T08:00:00"
+    assert session_info["timestamp"] != "2026-01-01T08:00:00"
+
+
+def test_keepalive_keeps_legacy_login_timestamp(app, monkeypatch):
+    store_cookies(app, [cookie("session-id", "alt")])
+    with open(app.SESSION_FILE, "w") as f:
+        json.dump({"timestamp": "2026-01-01T08:00:00"}, f)
+    monkeypatch.setattr(app, "http_get_with_cookies", lambda url, cookies, timeout=5: (200, url, []))
+
+    app.session_keepalive_once()
+    assert app.load_session_info()["login_time"] == "2026-01-01T08:00:00"
@@ -0,0 +1,55 @@
+import pickle
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def slow_probe(app, monkeypatch):
+    with open(app.COOKIE_FILE, "wb") as f:
+        pickle.dump([{"name": "session-id", "value": "x", "domain": ".amazon.de", "path": "/"}], f)
+    monkeypatch.setattr(app, "_session_probe_cache",
+                        {"result": None, "checked_at": 0.0, "pending": None, "generation": 0})
+    started, release, calls = threading.Event(), threading.Event(), []
+
+    def slow_request(url, cookies, timeout=5):
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        return 200, url, []
+
+    monkeypatch.setattr(app, "http_get_with_cookies", slow_request)
+    return started, release, calls
+
+
+def test_concurrent_probes_share_one_request(app, slow_probe):
+    started, release, calls = slow_probe
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(app.probe_session())) for _ in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.2)  # die anderen Prüfungen warten jetzt auf die laufende
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert [result["valid"] for result in results] == [True, True, True]
+
+
+def test_lock_is_free_during_request(app, slow_probe):
+    started, release, calls = slow_probe
+    thread = threading.Thread(target=app.probe_session)
+    thread.start()
+    started.wait(5)
+
+    # Neuer Login während der Anfrage: blockiert nicht und wird nicht überschrieben
+    assert app._session_probe_lock.acquire(timeout=1)
+    app._session_probe_lock.release()
+    app._store_probe_result(False, "neu eingeloggt")
+    release.set()
+    thread.join(5)
+    assert app.probe_session()["reason"] == "neu eingeloggt"
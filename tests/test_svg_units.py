@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("500", 500.0),
+    ("500px", 500.0),
+    ("72pt", 96.0),
+    ("25.4mm", 96.0),
+    ("2.54cm", 96.0),
+    ("1in", 96.0),
+    (" 1.5e2 ", 150.0),
+])
+def test_absolute_units(app, value, expected):
+    assert app._svg_length(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", [None, "", "100%", "10em", "auto"])
+def test_unknown_lengths(app, value):
+    assert app._svg_length(value) is None
+
+
+def test_no_preview_window_without_gui(app):
+    assert not app.preview_window_available()
+    assert app.open_preview_window("vorschau.png", "Vorschau") is None